@@ -0,0 +1,181 @@
+"""
+Information-set Monte Carlo tree search (ISMCTS) for AI seats
+Every iteration redeals the cards the AI can't see (a determinization), walks one
+shared tree through the decisions legal in that deal, plays the rest of the game
+out at random and credits the winner. Challenges and blocks from other players
+are sampled rather than searched. decide() is plain data in, plain data out so it
+can run in a worker process.
+"""
+
+from CoupGame import (CoupGame, Decision, PROMPT_ACTION, PROMPT_TARGET, PROMPT_CHALLENGE,
+                      PROMPT_BLOCK, PROMPT_CHALLENGE_BLOCK, PROMPT_LOSE_CARD, PROMPT_EXCHANGE,
+                      PROMPT_GAME_OVER)
+from CoupState import CoupState
+from itertools import combinations
+import math
+import random
+import time
+
+EXPLORATION = 0.7       # UCB exploration constant
+CHALLENGE_RATE = 0.1    # chance each other responder challenges in a playout
+BLOCK_RATE = 0.2        # chance each other responder blocks in a playout
+MAX_PLAYOUT = 300       # decisions before a playout is scored as nobody winning
+
+
+class _Node:
+    __slots__ = ('owner', 'children', 'visits', 'wins', 'avail')
+
+    def __init__(self, owner):
+        self.owner = owner  # seat that chose the decision leading here
+        self.children = {}  # Decision -> _Node
+        self.visits = 0
+        self.wins = 0
+        self.avail = 1      # iterations where this decision was legal
+
+    def ucb(self):
+        return self.wins / self.visits + EXPLORATION * math.sqrt(math.log(self.avail) / self.visits)
+
+
+def legalDecisions(game, prompt=None):
+    """Every Decision that answers the prompt, passing (seat None) first for challenges/blocks"""
+    prompt = prompt or game.prompt
+    kind = prompt.kind
+    if kind in (PROMPT_ACTION, PROMPT_TARGET, PROMPT_LOSE_CARD):
+        return [Decision(kind, prompt.seat, option) for option in prompt.options]
+    if kind == PROMPT_EXCHANGE:
+        keep = game.seats[prompt.seat].numCards
+        decisions = {}
+        for indices in combinations(range(len(prompt.options)), keep):
+            # keeping the same cards from different slots is the same choice
+            kept = tuple(sorted(prompt.options[i] for i in indices))
+            decisions.setdefault(kept, Decision(kind, prompt.seat, indices))
+        return list(decisions.values())
+    if kind == PROMPT_BLOCK:
+        return [Decision(kind, None, None)] + [Decision(kind, seat, card)
+                                               for seat in prompt.seats for card in prompt.options]
+    if kind in (PROMPT_CHALLENGE, PROMPT_CHALLENGE_BLOCK):
+        return [Decision(kind, None, None)] + [Decision(kind, seat, None) for seat in prompt.seats]
+    return []
+
+
+def playoutDecision(game, prompt, rng, exclude=-1):
+    """Random Decision for a playout. Responders other than exclude challenge/block now and then."""
+    kind = prompt.kind
+    if kind == PROMPT_CHALLENGE or kind == PROMPT_CHALLENGE_BLOCK or kind == PROMPT_BLOCK:
+        rate = BLOCK_RATE if kind == PROMPT_BLOCK else CHALLENGE_RATE
+        for seat in prompt.seats:
+            if seat != exclude and rng.random() < rate:
+                return Decision(kind, seat, rng.choice(prompt.options) if kind == PROMPT_BLOCK else None)
+        return Decision(kind, None, None)
+    if kind == PROMPT_EXCHANGE:
+        keep = game.seats[prompt.seat].numCards
+        return Decision(kind, prompt.seat, tuple(sorted(rng.sample(range(len(prompt.options)), keep))))
+    return Decision(kind, prompt.seat, rng.choice(prompt.options))
+
+
+def determinize(game, viewer, rng):
+    """Copy of game with every card viewer can't see (other hands and the deck) redealt at random"""
+    sample = game.clone(rng.getrandbits(64))
+    others = [p for p in sample.seats if p.isAlive and p.seat != viewer]
+    hidden = [card for p in others for card in p.cards if card != -2]
+    for card, count in enumerate(sample.deck.counts()):
+        hidden.extend([card] * count)
+    rng.shuffle(hidden)
+    i = 0
+    for p in others:
+        for slot in range(2):
+            if p.cards[slot] != -2:
+                p.cards[slot] = hidden[i]
+                i += 1
+    counts = [0, 0, 0, 0, 0]
+    for card in hidden[i:]:
+        counts[card] += 1
+    sample.deck.setCounts(counts)
+    return sample
+
+
+def _choices(game, prompt, viewer):
+    """(seat choosing, its Decisions) at a tree node, or (None, None) for a sampled response"""
+    if len(prompt.seats) == 1 and prompt.kind not in (PROMPT_CHALLENGE, PROMPT_BLOCK, PROMPT_CHALLENGE_BLOCK):
+        return prompt.seat, legalDecisions(game, prompt)
+    if viewer in prompt.seats:
+        mine = [d for d in legalDecisions(game, prompt) if d.seat is None or d.seat == viewer]
+        return viewer, mine
+    return None, None
+
+
+def _apply(game, prompt, decision, viewer, rng):
+    if decision.seat is None and viewer in prompt.seats:
+        # we pass, the others may still respond
+        decision = playoutDecision(game, prompt, rng, exclude=viewer)
+    game.submit(decision)
+
+
+def _iterate(root, game, viewer, rng):
+    node = root
+    path = []
+    # selection and expansion
+    while game.prompt.kind != PROMPT_GAME_OVER:
+        prompt = game.prompt
+        owner, options = _choices(game, prompt, viewer)
+        if owner is None:
+            game.submit(playoutDecision(game, prompt, rng))
+            continue
+        untried = []
+        for decision in options:
+            child = node.children.get(decision)
+            if child is None:
+                untried.append(decision)
+            else:
+                child.avail += 1
+        if untried:
+            decision = rng.choice(untried)
+            child = node.children[decision] = _Node(owner)
+            node = child
+            _apply(game, prompt, decision, viewer, rng)
+            path.append(node)
+            break
+        decision = max(options, key=lambda d: node.children[d].ucb())
+        node = node.children[decision]
+        _apply(game, prompt, decision, viewer, rng)
+        path.append(node)
+
+    # playout
+    steps = 0
+    while game.prompt.kind != PROMPT_GAME_OVER and steps < MAX_PLAYOUT:
+        game.submit(playoutDecision(game, game.prompt, rng))
+        steps += 1
+    winner = game.prompt.seat if game.prompt.kind == PROMPT_GAME_OVER else -1
+
+    for node in path:
+        node.visits += 1
+        if node.owner == winner:
+            node.wins += 1
+
+
+def search(game, seat, budget=1.0, seed=None, maxIterations=None):
+    """Decision for seat at game's pending prompt after about budget seconds of ISMCTS.
+    Returns (decision, iterations)."""
+    rng = random.Random(seed)
+    prompt = game.prompt
+    owner, options = _choices(game, prompt, seat)
+    if owner != seat:
+        raise ValueError(f"Seat {seat} has nothing to decide at {prompt}")
+    if len(options) == 1:
+        return options[0], 0
+
+    root = _Node(None)
+    deadline = time.perf_counter() + budget
+    iterations = 0
+    # at least one iteration, so root has children to choose from however small the budget
+    while iterations == 0 or (time.perf_counter() < deadline and (maxIterations is None or iterations < maxIterations)):
+        _iterate(root, determinize(game, seat, rng), seat, rng)
+        iterations += 1
+    decision = max(root.children, key=lambda d: root.children[d].visits)
+    return decision, iterations
+
+
+def decide(stateBytes, seat, budget=1.0, seed=None):
+    """Worker entry point: packed CoupState bytes in, Decision out"""
+    game = CoupGame.fromState(CoupState.fromBytes(stateBytes))
+    return search(game, seat, budget, seed)[0]
@@ -0,0 +1,223 @@
+"""
+Engine benchmarks
+Micro-benchmarks time single engine calls, macro-benchmarks play whole seeded
+random games at 2-6 players. Results can be saved as JSON and compared against
+an earlier run, so every engine change can be measured.
+
+    python CoupBenchmark.py --save baseline.json
+    python CoupBenchmark.py --compare baseline.json    # exit code 1 on regressions
+"""
+
+from CoupDeck import CoupDeck
+from CoupGame import CoupGame, splitSeed
+from CoupPlayer import CoupPlayer
+from CoupTournament import RandomStrategy, playGame
+import argparse
+import json
+import platform
+import sys
+import time
+import timeit
+
+MACRO_GAMES = 200  # games per macro-benchmark run
+
+
+def _game(players):
+    game = CoupGame(1)
+    for seat in range(players):
+        game.addPlayer(f"Player {seat + 1}")
+    game.start()
+    return game
+
+
+# ============================================================================
+# MICRO - each returns a zero-argument callable doing one operation
+# ============================================================================
+
+def benchDeckDrawAdd():
+    deck = CoupDeck()
+
+    def run():
+        deck.add(deck.draw())
+    return run
+
+
+def benchDeckShuffle():
+    return CoupDeck().shuffle
+
+
+def benchDeal():
+    game = _game(6)
+    full = [3, 3, 3, 3, 3]
+
+    def run():
+        game.deck.setCounts(full)
+        game.deal()
+    return run
+
+
+def benchResolveChallengeHeld():
+    game = _game(2)
+    challenger, claimant = game.seats
+    claimant.cards = [0, 1]
+    counts = game.deck.counts()
+
+    def run():
+        game.resolveChallenge(challenger, claimant, 0)
+        # the revealed Duke was swapped for a fresh card; undo it for the next call
+        game.deck.setCounts(counts)
+        claimant.cards[0] = 0
+    return run
+
+
+def benchResolveChallengeBluff():
+    game = _game(2)
+    challenger, claimant = game.seats
+    claimant.cards = [1, 2]
+
+    def run():
+        game.resolveChallenge(challenger, claimant, 0)
+    return run
+
+
+def benchLoseCard():
+    game = _game(2)
+    player = game.seats[0]
+    card = player.cards[0]
+
+    def run():
+        game.loseCard(player, 0)
+        # restore so every call loses the same card
+        player.cards[0] = card
+        player.numCards = 2
+        game.cardsRemoved[card] -= 1
+    return run
+
+
+def benchNoSteal():
+    game = _game(6)
+    for player in game.alive:
+        player.coins = 0
+    return game.noSteal
+
+
+def benchGetActions():
+    player = CoupPlayer("Player 1", 0)
+    player.coins = 5
+    return player.getActions
+
+
+def benchStateRoundTrip():
+    game = _game(6)
+
+    def run():
+        CoupGame.fromState(game.state())
+    return run
+
+
+MICRO = {
+    'deck.draw+add': benchDeckDrawAdd,
+    'deck.shuffle': benchDeckShuffle,
+    'game.deal (6 players)': benchDeal,
+    'game.resolveChallenge (held)': benchResolveChallengeHeld,  # includes undoing the swap
+    'game.resolveChallenge (bluff)': benchResolveChallengeBluff,
+    'game.loseCard': benchLoseCard,  # includes restoring the card
+    'game.noSteal (6 players)': benchNoSteal,
+    'player.getActions': benchGetActions,
+    'state+fromState (6 players)': benchStateRoundTrip,
+}
+
+
+def timeMicro(factory, repeat):
+    """Best ns per call over repeat runs"""
+    timer = timeit.Timer(factory())
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number * 1e9
+
+
+# ============================================================================
+# MACRO - whole random games
+# ============================================================================
+
+def timeGames(players, repeat):
+    """Best ms per game over repeat runs of the same MACRO_GAMES seeded games"""
+    strategies = [RandomStrategy()] * players
+    seeds = splitSeed(players, MACRO_GAMES)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for seed in seeds:
+            playGame(strategies, seed)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / MACRO_GAMES * 1e3
+
+
+def runAll(repeat, only=None):
+    results = {}
+    for name, factory in MICRO.items():
+        if only and only not in name:
+            continue
+        results[name] = {'ns': timeMicro(factory, repeat)}
+        print(f"{name:<32} {results[name]['ns']:>10.0f} ns", flush=True)
+    for players in range(2, 7):
+        name = f"random game ({players} players)"
+        if only and only not in name:
+            continue
+        ms = timeGames(players, repeat)
+        results[name] = {'ns': ms * 1e6}
+        print(f"{name:<32} {ms:>10.3f} ms  ({1e3 / ms:,.0f} games/s)", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print the change against baseline; returns the names that got slower than threshold"""
+    slower = []
+    print(f"\n{'benchmark':<32} {'baseline':>12} {'now':>12} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, now = baseline[name]['ns'], result['ns']
+        change = now / before - 1
+        flag = ''
+        if change > threshold:
+            flag = '  SLOWER'
+            slower.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f"{name:<32} {before:>12.0f} {now:>12.0f} {change:>+8.1%}{flag}")
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coup engine benchmarks")
+    parser.add_argument('--repeat', type=int, default=5, help="runs per benchmark, best is kept")
+    parser.add_argument('--only', default=None, help="only run benchmarks whose name contains this")
+    parser.add_argument('--save', default=None, help="write results to this JSON file")
+    parser.add_argument('--compare', default=None, help="baseline JSON file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10, help="slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    results = runAll(args.repeat, args.only)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results,
+            }, f, indent=2)
+        print(f"\nSaved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        slower = compare(results, baseline, args.threshold)
+        if slower:
+            print(f"\n{len(slower)} regression{'s' if len(slower) != 1 else ''} over {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,20 +1,56 @@
 import random
 
 class CoupDeck:
-    def __init__(self):
-        self.deck = [0,1,2,3,4]*3
-        random.shuffle(self.deck)
+    """The court deck as a count of each card (0-4). Order never matters in Coup,
+    so instead of shuffling a list we draw each card weighted by how many are left."""
+    __slots__ = ('cardCounts', 'size', 'rng')
+
+    def __init__(self, rng=None):
+        self.cardCounts = [3, 3, 3, 3, 3]
+        self.size = 15
+        # random.Random owned by the game, so draws are reproducible from its seed
+        self.rng = rng or random.Random()
+
+    def counts(self):
+        """How many of each card (0-4) are in the deck"""
+        return list(self.cardCounts)
+
+    def setCounts(self, counts):
+        self.cardCounts = list(counts)
+        self.size = sum(counts)
 
     def shuffle(self):
-        random.shuffle(self.deck)
+        # Every draw is already uniformly random, nothing to do
+        pass
 
     def draw(self):
-        return self.deck.pop()
+        pick = self.rng.randrange(self.size)
+        counts = self.cardCounts
+        card = 0
+        while pick >= counts[card]:
+            pick -= counts[card]
+            card += 1
+        counts[card] -= 1
+        self.size -= 1
+        return card
+
+    def draw_many(self, n):
+        return [self.draw() for _ in range(n)]
 
     def add(self, card1, card2 = -1):
         """Add card(s) back to deck. card2 is optional, -1 means don't add second card."""
         if card1 >= 0:  # Only add valid cards (0-4)
-            self.deck.append(card1)
+            self.cardCounts[card1] += 1
+            self.size += 1
         if card2 >= 0:  # Only add if card2 is a valid card (0-4), not -1
-            self.deck.append(card2)
-        random.shuffle(self.deck)
\ No newline at end of file
+            self.cardCounts[card2] += 1
+            self.size += 1
+
+    def add_many(self, cards):
+        for card in cards:
+            if card >= 0:
+                self.cardCounts[card] += 1
+                self.size += 1
+
+    def __len__(self):
+        return self.size
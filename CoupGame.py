@@ -1,8 +1,76 @@
 from CoupDeck import CoupDeck
 from CoupPlayer import CoupPlayer
+from CoupState import CoupState, NO_PROMPT
+from collections import namedtuple
+import hashlib
 import math
+import random
+
+# Prompt kinds - what the engine is waiting on
+PROMPT_ACTION = 0           # seat picks an action from options
+PROMPT_TARGET = 1           # seat picks a target seat from options
+PROMPT_CHALLENGE = 2        # seats may challenge seat's claim of card (action claim)
+PROMPT_BLOCK = 3            # seats may block the action with one of options (cards)
+PROMPT_CHALLENGE_BLOCK = 4  # seats may challenge seat's claim of card (block claim)
+PROMPT_LOSE_CARD = 5        # seat picks a card slot from options to lose
+PROMPT_EXCHANGE = 6         # seat picks which of options (cards) to keep
+PROMPT_GAME_OVER = 7        # seat is the winner
+
+# Event kinds - what happened between prompts (for display/logging)
+EVENT_ACTION = 0            # seat declared value (action) against other (target seat or -1)
+EVENT_CHALLENGE_WON = 1     # seat challenged other, who was bluffing value (card)
+EVENT_CHALLENGE_FAILED = 2  # seat challenged other, who had value (card)
+EVENT_BLOCK = 3             # seat blocked other's action claiming value (card)
+EVENT_CARD_LOST = 4         # seat lost value (card) from slot other
+EVENT_ELIMINATED = 5        # seat is out
+EVENT_EXCHANGE = 6          # seat exchanged, keeping value cards
+EVENT_GAME_OVER = 7         # seat won
+EVENT_RESOLVED = 8          # seat's value (action) went through against other (target seat or -1)
+
+# kind: PROMPT_*, seat: who the prompt is about, seats: who may answer,
+# options: legal values, card: the claimed card for challenge prompts
+Prompt = namedtuple('Prompt', ['kind', 'seat', 'seats', 'options', 'card'])
+# kind: PROMPT_* being answered, seat: who answers (None = everyone passed), value: the choice
+Decision = namedtuple('Decision', ['kind', 'seat', 'value'])
+Event = namedtuple('Event', ['kind', 'seat', 'value', 'other'])
+
+# Decision kind recorded in history when a player leaves (not a prompt)
+CONCEDE = 8
+
+# Where the turn continues once a pending card loss is resolved
+AFTER_END_TURN = 0
+AFTER_BLOCK = 1
+AFTER_EXECUTE = 2
+
+
+def splitSeed(seed, count, start=0):
+    """Derive count independent 64-bit seeds from seed, e.g. one per worker process.
+    start skips ahead, so splitSeed(s, 10, 5) == splitSeed(s, 15)[5:]"""
+    return [_deriveSeed(seed, i) for i in range(start, start + count)]
+
+def _deriveSeed(seed, key):
+    digest = hashlib.blake2b(f"{seed}:{key}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def _holdChance(hand, unseen, copies):
+    # 1 - P(none of the copies among hand cards drawn from the unseen ones)
+    if hand > unseen or copies > unseen:
+        return 0.0
+    return 1 - math.comb(unseen - copies, hand) / math.comb(unseen, hand)
+
+# HOLD_ODDS[hand size][unseen cards][unseen copies of the role]: chance a hand dealt
+# from the cards a viewer cannot see holds at least one copy. Built once at import.
+HOLD_ODDS = tuple(tuple(tuple(_holdChance(hand, unseen, copies) for copies in range(4))
+                        for unseen in range(16))
+                  for hand in range(3))
+
 
 class CoupGame:
+    __slots__ = ('playerCount', 'currentPlayer', 'alive', 'dead', 'seats', 'cardsRemoved', 'deck',
+                 'prompt', 'events', 'actor', 'action', 'target', 'blocker', 'blockCard', 'afterLoss',
+                 'seed', 'rng', 'history', 'log', 'byKey')
+
     actionToString = {0: 'Tax',
                         1: 'Assassinate',
                         2: 'Exchange',
@@ -11,24 +79,163 @@ class CoupGame:
                         6: 'Foreign Aid',
                         7: 'Coup'}
 
-    def __init__(self):
+    # Cards that may block each action
+    blockCards = {1: (4,), 3: (3, 2), 6: (0,)}
+
+    def __init__(self, seed=None):
+        if seed is None:
+            seed = random.getrandbits(64)
+        # Every random draw in the game comes from this seed, so seed + history replays the game
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.history = []
+        # Optional CoupLog.GameLog, given each decision with the events it caused
+        self.log = None
         self.playerCount = 0
         self.currentPlayer = 0
-        # Lists of names
+        # Lists of CoupPlayer objects
         self.alive = []
         self.dead = []
+        # Every player in join order, indexed by seat
+        self.seats = []
+        # Living players by the key they joined with (e.g. a Discord user id)
+        self.byKey = {}
         self.cardsRemoved = [0,0,0,0,0]
-        self.deck = CoupDeck()
-
-    def addPlayer(self, name):
+        self.deck = CoupDeck(self.rng)
+        self.prompt = None
+        self.events = []
+        # Turn state (seats, -1 when unset)
+        self.actor = -1
+        self.action = -1
+        self.target = -1
+        self.blocker = -1
+        self.blockCard = -1
+        # AFTER_* step to take once a pending card loss is resolved
+        self.afterLoss = AFTER_END_TURN
+
+    def addPlayer(self, name, key=None):
+        """Seat a player. key, if given, finds them in byKey while they're alive."""
+        player = CoupPlayer(name, len(self.seats), key)
         self.playerCount += 1
-        self.alive.append(CoupPlayer(name))
+        self.alive.append(player)
+        self.seats.append(player)
+        if key is not None:
+            self.byKey[key] = player
+        return player
 
     def deal(self):
         for i in range(self.playerCount):
             self.alive[i].cards[0] = self.deck.draw()
             self.alive[i].cards[1] = self.deck.draw()
 
+    def start(self):
+        """Deal the cards and return the first prompt"""
+        self.deal()
+        self._beginTurn()
+        return self.prompt
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    def state(self):
+        """Packed CoupState of the whole game (names aside)"""
+        drawn = (-1, -1)
+        if self.prompt is not None and self.prompt.kind == PROMPT_EXCHANGE:
+            drawn = self.prompt.options[-2:]
+        return CoupState.pack(self, drawn)
+
+    @classmethod
+    def fromState(cls, state, names=None, seed=None):
+        """Rebuild a game from a CoupState. names are by seat, defaulting to Player 1..n"""
+        header, seats, deck, removed = state.unpack()
+        game = cls(seed)
+        for seat, (coins, cards) in enumerate(seats):
+            game.addPlayer(names[seat] if names else f"Player {seat + 1}")
+            player = game.seats[seat]
+            player.coins = coins
+            if header['promptKind'] != NO_PROMPT:
+                player.cards = cards
+                player.numCards = 2 - cards.count(-2)
+                player.isAlive = player.numCards > 0
+        game.alive = [p for p in game.seats if p.isAlive]
+        game.dead = [p for p in game.seats if not p.isAlive]
+        game.playerCount = len(game.alive)
+        game.currentPlayer = header['currentPlayer']
+        game.deck.setCounts(deck)
+        game.cardsRemoved = removed
+        game.actor = header['actor']
+        game.action = header['action']
+        game.target = header['target']
+        game.blocker = header['blocker']
+        game.blockCard = header['blockCard']
+        game.afterLoss = header['afterLoss']
+        game._restorePrompt(header['promptKind'], header['promptSeat'], (header['drawn0'], header['drawn1']))
+        return game
+
+    def clone(self, seed=None):
+        """Copy of the game. Its RNG is seeded from ours without drawing from it, so
+        cloning never changes how this game plays out."""
+        if seed is None:
+            seed = _deriveSeed(self.seed, len(self.history))
+        return CoupGame.fromState(self.state(), [p.name for p in self.seats], seed)
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def record(self):
+        """Everything needed to replay the game (JSON serialisable)"""
+        return {
+            'seed': self.seed,
+            'names': [p.name for p in self.seats],
+            'decisions': [[d.kind, d.seat, list(d.value) if isinstance(d.value, tuple) else d.value]
+                          for d in self.history],
+        }
+
+    @classmethod
+    def replay(cls, record, upTo=None):
+        """Play a record() back through the engine, optionally stopping after upTo decisions"""
+        game = cls(record['seed'])
+        for name in record['names']:
+            game.addPlayer(name)
+        game.start()
+        game.apply(record['decisions'] if upTo is None else record['decisions'][:upTo])
+        return game
+
+    def apply(self, decisions):
+        """Submit decisions (as in history or record()) in order, concessions included"""
+        for kind, seat, value in decisions:
+            if kind == CONCEDE:
+                self.concede(seat)
+            else:
+                if isinstance(value, list):
+                    value = tuple(value)
+                self.submit(Decision(kind, seat, value))
+
+    def _restorePrompt(self, kind, seat, drawn):
+        """Rebuild the pending prompt from the turn state"""
+        if kind == NO_PROMPT:
+            self.prompt = None
+        elif kind == PROMPT_ACTION:
+            self._beginTurn()
+        elif kind == PROMPT_TARGET:
+            self._prompt(kind, self.actor, (self.actor,), self.targets(self.action))
+        elif kind == PROMPT_CHALLENGE:
+            self._prompt(kind, self.actor, self._others(self.actor), (), self.actionToCard(self.action))
+        elif kind == PROMPT_BLOCK:
+            self._prompt(kind, self.actor, self._blockers(), self.blockCards[self.action])
+        elif kind == PROMPT_CHALLENGE_BLOCK:
+            self._prompt(kind, self.blocker, self._others(self.blocker), (), self.blockCard)
+        elif kind == PROMPT_LOSE_CARD:
+            player = self.seats[seat]
+            self._prompt(kind, seat, (seat,), tuple(i for i in range(2) if player.cards[i] != -2))
+        elif kind == PROMPT_EXCHANGE:
+            hand = [card for card in self.seats[seat].cards if card != -2]
+            self._prompt(kind, seat, (seat,), tuple(hand) + tuple(drawn))
+        else:
+            self._prompt(kind, seat, (), ())
+
     def takeTurn(self, action):
         player = self.alive[self.currentPlayer]
         # assass must spend
@@ -37,42 +244,279 @@ class CoupGame:
         if action == 7:
             player.coins -= 7
 
-    def temp(self, action, target):
+    # ------------------------------------------------------------------
+    # Decisions
+    # ------------------------------------------------------------------
+
+    def submit(self, decision):
+        """Apply a Decision to the pending prompt and return the next prompt"""
+        prompt = self.prompt
+        kind, seat, value = decision
+        if prompt is None or kind != prompt.kind:
+            raise ValueError(f"Decision {decision} does not answer prompt {prompt}")
+        if seat is not None and seat not in prompt.seats:
+            raise ValueError(f"Seat {seat} cannot answer prompt {prompt}")
+        firstEvent = len(self.events)
+
+        if kind == PROMPT_ACTION:
+            self.chooseAction(value)
+        elif kind == PROMPT_TARGET:
+            self.chooseTarget(value)
+        elif kind == PROMPT_CHALLENGE or kind == PROMPT_CHALLENGE_BLOCK:
+            self.respondChallenge(seat)
+        elif kind == PROMPT_BLOCK:
+            self.respondBlock(seat, value)
+        elif kind == PROMPT_LOSE_CARD:
+            self.chooseLoss(value)
+        elif kind == PROMPT_EXCHANGE:
+            self.chooseExchange(value)
+        else:
+            raise ValueError("Game is over, nothing to decide")
+        self.history.append(decision)
+        if self.log is not None:
+            self.log.write(decision, self.events[firstEvent:])
+        return self.prompt
+
+    def defaultDecision(self, prompt=None):
+        """Decision used when nobody answers in time"""
+        prompt = prompt or self.prompt
+        kind = prompt.kind
+        if kind == PROMPT_ACTION:
+            return Decision(kind, prompt.seat, 5 if 5 in prompt.options else prompt.options[0])
+        if kind == PROMPT_EXCHANGE:
+            keep = self.seats[prompt.seat].numCards
+            return Decision(kind, prompt.seat, tuple(range(keep)))
+        if kind in (PROMPT_TARGET, PROMPT_LOSE_CARD):
+            return Decision(kind, prompt.seat, prompt.options[0])
+        # nobody challenged / blocked
+        return Decision(kind, None, None)
+
+    def chooseAction(self, action):
+        if action not in self.prompt.options:
+            raise ValueError(f"Illegal action {action}")
+        self.action = action
+        if action == 1 or action == 3 or action == 7:
+            self._prompt(PROMPT_TARGET, self.actor, (self.actor,), self.targets(action))
+        else:
+            self._declared()
+
+    def chooseTarget(self, target):
+        if target not in self.prompt.options:
+            raise ValueError(f"Illegal target {target}")
+        self.target = target
+        self.takeTurn(self.action)
+        self._declared()
+
+    def respondChallenge(self, challenger):
+        """challenger is a seat, or None if everyone passed"""
+        blocking = self.prompt.kind == PROMPT_CHALLENGE_BLOCK
+        if challenger is None:
+            if blocking:
+                # block stands
+                self._endTurn()
+            else:
+                self._blockStep()
+            return
+
+        claimant = self.prompt.seat
+        card = self.prompt.card
+        hadCard = self.resolveChallenge(self.seats[challenger], self.seats[claimant], card)
+        if hadCard:
+            self.events.append(Event(EVENT_CHALLENGE_FAILED, challenger, card, claimant))
+            # challenger loses, the claim stands
+            self._loseInfluence(challenger, AFTER_END_TURN if blocking else AFTER_BLOCK)
+        else:
+            self.events.append(Event(EVENT_CHALLENGE_WON, challenger, card, claimant))
+            # claimant loses, the claim falls
+            self._loseInfluence(claimant, AFTER_EXECUTE if blocking else AFTER_END_TURN)
+
+    def respondBlock(self, blocker, card):
+        """blocker is a seat, or None if everyone passed"""
+        if blocker is None:
+            self._execute()
+            return
+        if card not in self.prompt.options:
+            raise ValueError(f"Card {card} cannot block this action")
+        self.blocker = blocker
+        self.blockCard = card
+        self.events.append(Event(EVENT_BLOCK, blocker, card, self.actor))
+        others = self._others(blocker)
+        self._prompt(PROMPT_CHALLENGE_BLOCK, blocker, others, (), card)
+
+    def chooseLoss(self, slot):
+        if slot not in self.prompt.options:
+            raise ValueError(f"Illegal card slot {slot}")
+        self._loseSlot(self.prompt.seat, slot)
+
+    def chooseExchange(self, keep):
+        player = self.seats[self.actor]
+        options = self.prompt.options
+        keep = tuple(keep)
+        if len(keep) != player.numCards or len(set(keep)) != len(keep) or \
+                any(i < 0 or i >= len(options) for i in keep):
+            raise ValueError(f"Must keep {player.numCards} of the offered cards")
+        self.deck.add_many([card for i, card in enumerate(options) if i not in keep])
+        chosen = [options[i] for i in keep]
+        player.cards = chosen + [-2] * (2 - len(chosen))
+        self.events.append(Event(EVENT_EXCHANGE, self.actor, len(chosen), -1))
+        self._endTurn()
+
+    def concede(self, seat):
+        """Eliminate seat immediately (player left). Aborts the turn if they were involved."""
+        player = self.seats[seat]
+        if self.prompt is None or not player.isAlive or self.isOver():
+            return self.prompt
+        self.history.append(Decision(CONCEDE, seat, None))
+        firstEvent = len(self.events)
+        involved = seat in (self.actor, self.target, self.blocker) or \
+            (self.prompt is not None and self.prompt.seat == seat)
+        if involved and self.prompt.kind == PROMPT_EXCHANGE:
+            # put the two drawn cards back
+            self.deck.add_many(self.prompt.options[-2:])
+        while player.isAlive:
+            slot = 0 if player.cards[0] != -2 else 1
+            self._removeCard(player, slot)
+        if len(self.alive) <= 1:
+            self._finish()
+        elif involved:
+            self._endTurn()
+        elif self.prompt.kind == PROMPT_ACTION or self.prompt.kind == PROMPT_TARGET:
+            # nothing is committed yet, offer the choices again without them
+            self._beginTurn()
+        elif seat in self.prompt.seats:
+            seats = tuple(s for s in self.prompt.seats if s != seat)
+            self.prompt = self.prompt._replace(seats=seats)
+        if self.log is not None:
+            self.log.write(self.history[-1], self.events[firstEvent:])
+        return self.prompt
+
+    # ------------------------------------------------------------------
+    # Turn flow
+    # ------------------------------------------------------------------
+
+    def _prompt(self, kind, seat, seats, options, card=-1):
+        self.prompt = Prompt(kind, seat, seats, options, card)
+
+    def _others(self, seat):
+        return tuple(p.seat for p in self.alive if p.seat != seat)
+
+    def _beginTurn(self):
         player = self.alive[self.currentPlayer]
-        # challenge
-        challenger = self.challenge(action, player)
-        if challenger:
-            actionWentThrough = self.resolveChallenge(challenger, player, action)
-
-        # block
-        if actionWentThrough:
-            card, blocker = self.getBlocker(action, target)
-            if card != -1:
-                actionWentThrough = False
-                # challenge block
-                challenger = self.challenge(card, blocker)
-                if challenger:
-                    actionWentThrough = not self.resolveChallenge(challenger, blocker, card)
-
-        # execute
-        if actionWentThrough:
-            if action == 0:
-                self.tax(player)
-            elif action == 1:
-                self.assass(player, target)
-            elif action == 2:
-                self.exchange(player)
-            elif action == 3:
+        self.actor = player.seat
+        self.action = -1
+        self.target = -1
+        self.blocker = -1
+        self.blockCard = -1
+        self.afterLoss = AFTER_END_TURN
+        posActs = player.getActions()
+        if 3 in posActs and self.noSteal():
+            posActs.remove(3)
+        self._prompt(PROMPT_ACTION, self.actor, (self.actor,), tuple(posActs))
+
+    def _declared(self):
+        self.events.append(Event(EVENT_ACTION, self.actor, self.action, self.target))
+        if self.action < 4:
+            card = self.actionToCard(self.action)
+            self._prompt(PROMPT_CHALLENGE, self.actor, self._others(self.actor), (), card)
+        else:
+            self._blockStep()
+
+    def _blockStep(self):
+        action = self.action
+        if action not in self.blockCards:
+            self._execute()
+            return
+        if action != 6 and not self.seats[self.target].isAlive:
+            # target didn't survive the challenge, nothing left to block
+            self._endTurn()
+            return
+        self._prompt(PROMPT_BLOCK, self.actor, self._blockers(), self.blockCards[action])
+
+    def _blockers(self):
+        # anyone may block Foreign Aid, only the target Assassinate and Steal
+        if self.action == 6:
+            return self._others(self.actor)
+        return (self.target,)
+
+    def _execute(self):
+        action = self.action
+        player = self.seats[self.actor]
+        self.events.append(Event(EVENT_RESOLVED, self.actor, action, self.target))
+        if action == 0:
+            self.tax(player)
+        elif action == 5:
+            self.income(player)
+        elif action == 6:
+            self.foreignAid(player)
+        elif action == 3:
+            target = self.seats[self.target]
+            if target.isAlive:
                 self.steal(player, target)
-            elif action == 5:
-                self.income(player)
-            elif action == 6:
-                self.foreignAid(player)
-            else:
-                self.coup(player, target)
+        elif action == 2:
+            self.exchange(player)
+            return
+        elif action == 1 or action == 7:
+            if self.seats[self.target].isAlive:
+                self._loseInfluence(self.target, AFTER_END_TURN)
+                return
+        self._endTurn()
+
+    def _loseInfluence(self, seat, after):
+        player = self.seats[seat]
+        self.afterLoss = after
+        if not player.isAlive:
+            self._continue()
+            return
+        slots = tuple(i for i in range(2) if player.cards[i] != -2)
+        if len(slots) == 1:
+            # nothing to choose
+            self._loseSlot(seat, slots[0])
+            return
+        self._prompt(PROMPT_LOSE_CARD, seat, (seat,), slots)
+
+    def _loseSlot(self, seat, slot):
+        self._removeCard(self.seats[seat], slot)
+        if len(self.alive) <= 1:
+            self._finish()
+        else:
+            self._continue()
+
+    def _continue(self):
+        after = self.afterLoss
+        self.afterLoss = AFTER_END_TURN
+        if after == AFTER_BLOCK:
+            self._blockStep()
+        elif after == AFTER_EXECUTE:
+            self._execute()
+        else:
+            self._endTurn()
+
+    def _removeCard(self, player, slot):
+        card = player.cards[slot]
+        self.loseCard(player, slot)
+        self.events.append(Event(EVENT_CARD_LOST, player.seat, card, slot))
+        if not player.isAlive:
+            self.events.append(Event(EVENT_ELIMINATED, player.seat, -1, -1))
 
+    def _endTurn(self):
+        if len(self.alive) <= 1:
+            self._finish()
+            return
         self.currentPlayer += 1
         self.currentPlayer %= self.playerCount
+        self._beginTurn()
+
+    def _finish(self):
+        winner = self.alive[0].seat if self.alive else -1
+        self.events.append(Event(EVENT_GAME_OVER, winner, -1, -1))
+        self._prompt(PROMPT_GAME_OVER, winner, (), ())
+
+    def isOver(self):
+        return self.prompt is not None and self.prompt.kind == PROMPT_GAME_OVER
+
+    # ------------------------------------------------------------------
+    # Rules
+    # ------------------------------------------------------------------
 
     def tax(self, player):
         player.coins += 3
@@ -88,66 +532,16 @@ class CoupGame:
         target.coins -= min(2, target.coins)
 
     def exchange(self, player):
-        newHand = []
-        toChoose = []
-        for card in player.cards:
-            if card == -2:
-                newHand.append(card)
-            else:
-                toChoose.append(card)
-        toChoose.append(self.deck.draw())
-        toChoose.append(self.deck.draw())
-        # Ask player which of the cards in toChoose they want
-        # Choose 2 - len(newHand) of them
-        # newHand.append(choice) for each choice
-        player.cards = newHand
-
-        # player mentioned so that x assassinated y could be displayed
-    def assass(self, player, target):
-        self.loseCard(target)
-
-    # player mentioned so that x couped y could be displayed
-    def coup(self, player, target):
-        self.loseCard(target)    
-        
-
-    # getBlocker requires player input
-    def getBlocker(action, target):
-        # returns card, blocker
-        # card is integer
-        # blocker is a player object
-        if action == 1:
-            # Ask target if they want to block with contessa (card 4)
-            pass
-        elif action == 3:
-            # Give all players a chance to block with captain (card 3) or ambassador (card 2)
-            pass
-        elif action == 6:
-            # Give all players a chance to block with duke (card 0)
-            pass
-
-        return -1, None
-
-    # challenge method requires player input
-    def challenge(self, action, target):
-        if action > 4:
-            return None
-        ind = self.alive.index(target)
-        # Start timer
-        # send this message to each player:
-        for i in range(self.playerCount):
-            if i != ind:
-                numLeft = 3 - self.cardsRemoved[action]
-                totalLeft = 15 - sum(self.cardsRemoved) - self.alive[i].numCards - target.numCards
-                for card in self.alive[i]:
-                    if card == action:
-                        numLeft -= 1
-                prob = 1 - math.comb(totalLeft, numLeft) / math.comb(totalLeft + target.numCards, numLeft)
-                # tell alive[i]
-                pass
-        # If someone clicks challenge in that time, that player object
-        # Otherwise return None
-        return None
+        # Draw 2 and ask the player which numCards of their cards + the drawn ones to keep
+        toChoose = [card for card in player.cards if card != -2]
+        toChoose.extend(self.deck.draw_many(2))
+        self._prompt(PROMPT_EXCHANGE, player.seat, (player.seat,), tuple(toChoose))
+
+    # returns the seats that can be targeted by action
+    def targets(self, action):
+        captain = action == 3
+        return tuple(p.seat for i, p in enumerate(self.alive)
+                     if i != self.currentPlayer and (not captain or p.coins > 0))
 
     def actionToCard(self, action):
         """Maps action number to card index.
@@ -175,7 +569,7 @@ class CoupGame:
         if required_card == -1:
             # Invalid action, shouldn't happen
             return False
-        
+
         # Check if challenged player has the required card (only check non-dead cards, ignore -2)
         valid_cards = [c for c in personChallenged.cards if c != -2]
         if required_card in valid_cards:
@@ -183,17 +577,27 @@ class CoupGame:
             # Replace the card at its position (preserve array structure)
             card_index = personChallenged.cards.index(required_card)
             personChallenged.cards[card_index] = self.deck.draw()  # Replace with new card
-            self.deck.add(required_card)  # Return the revealed card to deck (shuffles automatically)
+            self.deck.add(required_card)  # Return the revealed card to deck
             return True  # Challenged player wins (has the card)
         else:
             # They don't have the card - challenger wins, challenged loses
             return False  # Challenged player loses (doesn't have the card)
 
+    def holdOdds(self, viewer, claimant, card):
+        """Chance (0-1) that claimant really has card, from what viewer can see: their own
+        hand and the lost cards. Everything else (deck and other hands) is equally likely."""
+        hand = self.seats[viewer].cards
+        copies = 3 - self.cardsRemoved[card] - hand.count(card)
+        unseen = 15 - sum(self.cardsRemoved) - self.seats[viewer].numCards
+        return HOLD_ODDS[self.seats[claimant].numCards][unseen][copies]
+
     def loseCard(self, player, card):
         lostCard = player.lose_card(card)
         self.cardsRemoved[lostCard] += 1
         if not player.isAlive:
             self.playerCount -= 1
+            if player.key is not None:
+                del self.byKey[player.key]
             ind = self.alive.index(player)
             self.dead.append(self.alive.pop(ind))
             if ind <= self.currentPlayer:
@@ -206,39 +610,3 @@ class CoupGame:
             if (i != self.currentPlayer and self.alive[i].coins > 0):
                 return False
         return True
-
-    # getChosenAct requires player input
-    def getChosenAct(actions, player):
-        # Ask player which action they want to take
-        # Return an integer corresponding to the action
-        pass
-
-    # returns a player object
-    def getTarget(self, action):
-        if action == 1 or action == 7:
-            return self.askForTarget()
-        if action == 3:
-            return self.askForTarget(captain=True)
-        return None
-
-    def displayTargets(self, listOfPlayers):
-        pass
-
-    def displayAction(self, action, target):
-        pass
-
-    # returns a player object, requires input
-    def askForTarget(self, captain = False):
-        possibleTargets = []
-        for i in range(self.playerCount):
-            if (i != self.currentPlayer) and (not captain or self.alive[i].coins > 0):
-                possibleTargets.append(i)
-        self.displayTargets(possibleTargets)
-        # Placeholder
-        return None
-
-
-
-            
-
-
@@ -0,0 +1,183 @@
+"""
+Append-only binary game logs
+A log is a 16-byte header (magic, version, player count, seed) followed by
+4-byte records (kind, seat, value, other), one per decision and one per engine
+event, in the order they happened. Decisions replay the game exactly through
+CoupGame.replay; events can be scanned without replaying anything.
+
+    python CoupLog.py game_logs/             # summary of every log in a folder
+    python CoupLog.py --replay game.coup     # replay one and print the result
+"""
+
+from CoupGame import CoupGame, Decision, Event, PROMPT_EXCHANGE, EVENT_ACTION, \
+    EVENT_CHALLENGE_WON, EVENT_CHALLENGE_FAILED, EVENT_BLOCK, EVENT_GAME_OVER
+import argparse
+import os
+import struct
+import time
+
+MAGIC = b'COUP'
+VERSION = 1
+HEADER = struct.Struct('<4sBBHQ')   # magic, version, players, reserved, seed
+RECORD = struct.Struct('<Bbbb')     # kind, seat, value, other
+EVENT_BASE = 16                     # record kind = EVENT_BASE + EVENT_*; below it, the PROMPT_* decided (or CONCEDE)
+BATCH_BYTES = 4096                  # buffered before each write
+
+
+def encodeDecision(decision):
+    """(kind, seat, value, other) record fields for a Decision; decisions() reverses it"""
+    kind, seat, value = decision
+    other = -1
+    if value is None:
+        value = -1
+    elif kind == PROMPT_EXCHANGE:
+        # kept slots in order: first in value, second (if any) in other
+        value, other = value[0], value[1] if len(value) > 1 else -1
+    return kind, -1 if seat is None else seat, value, other
+
+
+class GameLog:
+    """Writes one game's log. Attach with game.log = GameLog(path, game) before start()."""
+    __slots__ = ('file', 'buffer', 'batch')
+
+    def __init__(self, path, game, batch=BATCH_BYTES):
+        self.file = open(path, 'ab')
+        self.buffer = bytearray(HEADER.pack(MAGIC, VERSION, len(game.seats), 0, game.seed))
+        self.batch = batch
+
+    def write(self, decision, events):
+        """Called by CoupGame with each decision and the events it caused"""
+        buffer = self.buffer
+        buffer += RECORD.pack(*encodeDecision(decision))
+        for event in events:
+            buffer += RECORD.pack(EVENT_BASE + event.kind, event.seat, event.value, event.other)
+        if len(buffer) >= self.batch:
+            self.flush()
+
+    def flush(self):
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.file.flush()
+            self.buffer.clear()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+# ============================================================================
+# READING
+# ============================================================================
+
+def readLog(path):
+    """Returns (header dict, list of (kind, seat, value, other) records)"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, players, _, seed = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} Coup log")
+    # a crash can leave half a record at the end
+    end = len(data) - (len(data) - HEADER.size) % RECORD.size
+    records = list(RECORD.iter_unpack(memoryview(data)[HEADER.size:end]))
+    return {'version': version, 'players': players, 'seed': seed}, records
+
+
+def decisions(records):
+    """The Decisions in a log, in order"""
+    result = []
+    for kind, seat, value, other in records:
+        if kind >= EVENT_BASE:
+            continue
+        if kind == PROMPT_EXCHANGE:
+            value = (value,) if other < 0 else (value, other)
+        elif value < 0:
+            value = None
+        result.append(Decision(kind, None if seat < 0 else seat, value))
+    return result
+
+
+def events(records):
+    """The engine Events in a log, in order"""
+    return [Event(kind - EVENT_BASE, seat, value, other)
+            for kind, seat, value, other in records if kind >= EVENT_BASE]
+
+
+def replayLog(path, upTo=None):
+    """Rebuild the game a log recorded (players are named Player 1..n)"""
+    header, records = readLog(path)
+    return CoupGame.replay({
+        'seed': header['seed'],
+        'names': [f"Player {seat + 1}" for seat in range(header['players'])],
+        'decisions': decisions(records),
+    }, upTo)
+
+
+def logPaths(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.coup'):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+def summarize(paths):
+    """Scan logs without replaying: winners, actions, challenges"""
+    games = finished = 0
+    wins = {}
+    actions = {}
+    challenges = [0, 0]  # won, failed
+    blocks = 0
+    start = time.perf_counter()
+    for path in logPaths(paths):
+        header, records = readLog(path)
+        games += 1
+        for kind, seat, value, other in records:
+            if kind < EVENT_BASE:
+                continue
+            kind -= EVENT_BASE
+            if kind == EVENT_ACTION:
+                actions[value] = actions.get(value, 0) + 1
+            elif kind == EVENT_CHALLENGE_WON:
+                challenges[0] += 1
+            elif kind == EVENT_CHALLENGE_FAILED:
+                challenges[1] += 1
+            elif kind == EVENT_BLOCK:
+                blocks += 1
+            elif kind == EVENT_GAME_OVER:
+                finished += 1
+                wins[seat] = wins.get(seat, 0) + 1
+    elapsed = time.perf_counter() - start
+
+    print(f"{games} logs ({finished} finished) in {elapsed:.2f}s = {games / max(elapsed, 1e-9):,.0f} logs/s")
+    for seat in sorted(wins):
+        print(f"  seat {seat + 1} won {wins[seat] / max(finished, 1):.1%}")
+    for action in sorted(actions):
+        print(f"  {CoupGame.actionToString[action]:<12} {actions[action]}")
+    total = sum(challenges)
+    if total:
+        print(f"  challenges: {total}, {challenges[0] / total:.1%} caught a bluff")
+    print(f"  blocks: {blocks}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read Coup game logs")
+    parser.add_argument('paths', nargs='+', help="log files or folders of .coup logs")
+    parser.add_argument('--replay', action='store_true', help="replay each log and print how it ended")
+    args = parser.parse_args()
+
+    if args.replay:
+        for path in logPaths(args.paths):
+            game = replayLog(path)
+            if game.isOver():
+                print(f"{path}: Player {game.prompt.seat + 1} won")
+            else:
+                print(f"{path}: unfinished, waiting on prompt {game.prompt.kind} for seat {game.prompt.seat}")
+    else:
+        summarize(args.paths)
+
+
+if __name__ == '__main__':
+    main()
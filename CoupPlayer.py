@@ -1,6 +1,12 @@
 class CoupPlayer:
-    def __init__(self, name):
+    __slots__ = ('name', 'seat', 'key', 'coins', 'cards', 'numCards', 'isAlive')
+
+    def __init__(self, name, seat=-1, key=None):
         self.name = name
+        # position in join order, stable for the whole game
+        self.seat = seat
+        # caller's id for the player (the bot uses the Discord user id)
+        self.key = key
         self.coins = 2
         self.cards = [-2, -2]
         self.numCards = 2
@@ -0,0 +1,395 @@
+"""
+Batched self-play for Coup
+Holds N games as arrays and steps every game one full turn at a time, so
+thousands of games cost about as much Python as one. Used offline to tune
+timeouts and AI seats - the bot itself does not need numpy.
+
+    python CoupSimulator.py --games 100000 --players 4
+"""
+
+import argparse
+import time
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+MAX_PLAYERS = 6
+DEAD = -2
+# Same deck as CoupDeck: 3 of each of the 5 cards
+CARD_COUNTS = [3, 3, 3, 3, 3]
+
+# Action numbers match CoupGame (4 is unused)
+TAX, ASSASSINATE, EXCHANGE, STEAL, INCOME, FOREIGN_AID, COUP = 0, 1, 2, 3, 5, 6, 7
+NUM_ACTIONS = 8
+# Cards that may block each action
+BLOCK_CARDS = {ASSASSINATE: (4,), STEAL: (3, 2), FOREIGN_AID: (0,)}
+
+
+# ============================================================================
+# POLICIES - one per seat, each call decides a whole batch of games
+# ============================================================================
+
+class Policy:
+    """Random legal play. Override any method to plug in a strategy.
+
+    Every method receives the simulator, the indices of the games being
+    decided and the seat deciding, and returns one answer per game.
+    """
+
+    def __init__(self, challenge_rate=0.1, block_rate=0.2):
+        self.challenge_rate = challenge_rate
+        self.block_rate = block_rate
+
+    def action(self, sim, games, seat, legal):
+        """legal: bool [n, 8] -> action per game"""
+        return _random_choice(sim.rng, legal)
+
+    def target(self, sim, games, seat, action, legal):
+        """legal: bool [n, 6] -> target seat per game"""
+        return _random_choice(sim.rng, legal)
+
+    def challenge(self, sim, games, seat, claimant, card):
+        """-> bool per game, True to challenge claimant's claim of card"""
+        return sim.rng.random(len(games)) < self.challenge_rate
+
+    def block(self, sim, games, seat, action):
+        """-> blocking card per game (see BLOCK_CARDS), -1 to let it through"""
+        cards = np.full(len(games), -1, dtype=np.int8)
+        wants = sim.rng.random(len(games)) < self.block_rate
+        for act, options in BLOCK_CARDS.items():
+            rows = wants & (action == act)
+            cards[rows] = sim.rng.choice(options, size=int(rows.sum()))
+        return cards
+
+    def lose(self, sim, games, seat):
+        """-> card slot (0 or 1) to give up per game"""
+        live = sim.cards[games, seat] != DEAD
+        return _random_choice(sim.rng, live)
+
+    def keep(self, sim, games, seat, pool, count):
+        """pool: [n, 4] hand + 2 drawn cards (DEAD for lost slots), count: cards to keep
+        -> [n, 2] indices into pool, second column ignored when count is 1"""
+        keys = sim.rng.random(pool.shape)
+        keys[pool == DEAD] = 2.0
+        return np.argsort(keys, axis=1)[:, :2]
+
+
+class IncomePolicy(Policy):
+    """Never claims anything: Income until it can Coup"""
+
+    def __init__(self):
+        super().__init__(challenge_rate=0.0, block_rate=0.0)
+
+    def action(self, sim, games, seat, legal):
+        return np.where(legal[:, COUP], COUP, INCOME).astype(np.int8)
+
+
+def _random_choice(rng, mask):
+    """Index of a uniformly random True entry in each row of mask"""
+    keys = rng.random(mask.shape)
+    keys[~mask] = -1.0
+    return keys.argmax(axis=1).astype(np.int8)
+
+
+# ============================================================================
+# SIMULATOR
+# ============================================================================
+
+class BatchSimulator:
+    """N games of Coup stepped in lockstep, one turn per step()"""
+
+    def __init__(self, games, players=2, policies=None, seed=None):
+        if np is None:
+            raise ImportError("BatchSimulator needs numpy: pip install -r requirements-dev.txt")
+        self.rng = np.random.default_rng(seed)
+        self.n = games
+        self.players = np.broadcast_to(np.asarray(players, dtype=np.int8), (games,)).copy()
+        if policies is None:
+            policies = Policy()
+        if isinstance(policies, Policy):
+            policies = [policies] * MAX_PLAYERS
+        self.policies = list(policies)
+
+        seated = np.arange(MAX_PLAYERS)[None, :] < self.players[:, None]
+        self.coins = np.where(seated, 2, 0).astype(np.int16)
+        # Two card slots per player, DEAD once lost (as in CoupPlayer.cards)
+        self.cards = np.full((games, MAX_PLAYERS, 2), DEAD, dtype=np.int8)
+        # Cards left in the deck, by card
+        self.deck = np.tile(np.array(CARD_COUNTS, dtype=np.int16), (games, 1))
+        self.cardsRemoved = np.zeros((games, 5), dtype=np.int16)
+        self.current = np.zeros(games, dtype=np.int8)
+        self.winner = np.full(games, -1, dtype=np.int8)
+        self.turns = np.zeros(games, dtype=np.int32)
+        self.deal()
+
+    # ------------------------------------------------------------------
+    # Deck
+    # ------------------------------------------------------------------
+
+    def draw(self, games):
+        """Draw one card per game, weighted by what is left in each deck"""
+        counts = self.deck[games]
+        u = self.rng.random(len(games)) * counts.sum(axis=1)
+        cards = (np.cumsum(counts, axis=1) <= u[:, None]).sum(axis=1)
+        self.deck[games, cards] -= 1
+        return cards.astype(np.int8)
+
+    def add(self, games, cards):
+        """Put one card per game back (games must be unique)"""
+        self.deck[games, cards] += 1
+
+    def deal(self):
+        for seat in range(MAX_PLAYERS):
+            games = np.flatnonzero(self.players > seat)
+            for slot in range(2):
+                self.cards[games, seat, slot] = self.draw(games)
+
+    # ------------------------------------------------------------------
+    # State queries
+    # ------------------------------------------------------------------
+
+    def alive(self, games):
+        return (self.cards[games] != DEAD).any(axis=2)
+
+    def numCards(self, games):
+        return (self.cards[games] != DEAD).sum(axis=2)
+
+    def done(self):
+        return bool((self.winner >= 0).all())
+
+    # ------------------------------------------------------------------
+    # Turn
+    # ------------------------------------------------------------------
+
+    def step(self):
+        """Play one turn in every unfinished game. Returns False once all are over."""
+        g = np.flatnonzero(self.winner < 0)
+        if len(g) == 0:
+            return False
+        rows = np.arange(len(g))
+        cur = self.current[g].astype(np.intp)
+        coins = self.coins[g, cur]
+        alive = self.alive(g)
+        others = alive.copy()
+        others[rows, cur] = False
+
+        # Action
+        legal = np.zeros((len(g), NUM_ACTIONS), dtype=bool)
+        legal[:, [TAX, EXCHANGE, INCOME, FOREIGN_AID]] = True
+        legal[:, STEAL] = (others & (self.coins[g] > 0)).any(axis=1)
+        legal[:, ASSASSINATE] = coins >= 3
+        legal[:, COUP] = coins >= 7
+        forced = coins >= 10
+        legal[forced] = False
+        legal[forced, COUP] = True
+        action = self._bySeat(cur, lambda p, m, s: p.action(self, g[m], s, legal[m]), np.int8)
+
+        # Target (and pay for it)
+        targeted = np.isin(action, (ASSASSINATE, STEAL, COUP))
+        tlegal = others.copy()
+        tlegal[action == STEAL] &= self.coins[g[action == STEAL]] > 0
+        target = np.full(len(g), -1, dtype=np.intp)
+        target[targeted] = self._bySeat(
+            cur[targeted],
+            lambda p, m, s: p.target(self, g[targeted][m], s, action[targeted][m], tlegal[targeted][m]),
+            np.intp)
+        self.coins[g, cur] -= np.where(action == ASSASSINATE, 3, 0) + np.where(action == COUP, 7, 0)
+
+        # Challenge the claim (Tax, Assassinate, Exchange and Steal claim the card of the same number)
+        proceed = np.ones(len(g), dtype=bool)
+        claimed = action < 4
+        proceed[claimed] = self._challenge(g[claimed], cur[claimed], action[claimed])
+
+        # Block, and challenge the block
+        blockable = proceed & np.isin(action, tuple(BLOCK_CARDS))
+        if blockable.any():
+            b = np.flatnonzero(blockable)
+            blocker, card = self._block(g[b], cur[b], action[b], target[b])
+            blocked = blocker >= 0
+            if blocked.any():
+                bb = b[blocked]
+                stands = self._challenge(g[bb], blocker[blocked], card[blocked])
+                proceed[bb] = ~stands
+
+        # Execute
+        self._execute(g[proceed], cur[proceed], action[proceed], target[proceed])
+
+        # Next player or winner
+        alive = self.alive(g)
+        left = alive.sum(axis=1)
+        over = left <= 1
+        self.winner[g[over]] = alive[over].argmax(axis=1)
+        order = (cur[:, None] + np.arange(1, MAX_PLAYERS + 1)[None, :]) % MAX_PLAYERS
+        nxt = np.take_along_axis(alive, order, axis=1).argmax(axis=1)
+        self.current[g] = order[rows, nxt]
+        self.turns[g] += 1
+        return True
+
+    def run(self, max_turns=500):
+        """Step until every game has a winner (or max_turns). Returns the winners."""
+        for _ in range(max_turns):
+            if not self.step():
+                break
+        return self.winner
+
+    # ------------------------------------------------------------------
+    # Phases
+    # ------------------------------------------------------------------
+
+    def _bySeat(self, seats, call, dtype):
+        """Ask each seat's policy about the games where that seat decides"""
+        out = np.empty(len(seats), dtype=dtype)
+        for seat in range(MAX_PLAYERS):
+            m = seats == seat
+            if m.any():
+                out[m] = call(self.policies[seat], m, seat)
+        return out
+
+    def _firstAfter(self, willing, seats):
+        """First seat after seats (in turn order) with willing set, -1 if none"""
+        order = (seats[:, None] + np.arange(1, MAX_PLAYERS)[None, :]) % MAX_PLAYERS
+        ordered = np.take_along_axis(willing, order, axis=1)
+        first = order[np.arange(len(seats)), ordered.argmax(axis=1)]
+        return np.where(ordered.any(axis=1), first, -1)
+
+    def _challenge(self, games, claimant, card):
+        """Offer everyone else a challenge. Returns True where the claim stands."""
+        stands = np.ones(len(games), dtype=bool)
+        if len(games) == 0:
+            return stands
+        alive = self.alive(games)
+        willing = np.zeros(alive.shape, dtype=bool)
+        for seat in range(MAX_PLAYERS):
+            m = alive[:, seat] & (claimant != seat)
+            if m.any():
+                willing[m, seat] = self.policies[seat].challenge(self, games[m], seat, claimant[m], card[m])
+        challenger = self._firstAfter(willing, claimant)
+        c = challenger >= 0
+        if not c.any():
+            return stands
+
+        games, claimant, card, challenger = games[c], claimant[c], card[c], challenger[c]
+        hand = self.cards[games, claimant]
+        match = hand == card[:, None]
+        has = match.any(axis=1)
+        if has.any():
+            # Reveal, shuffle it back, draw a replacement
+            h = games[has]
+            slot = match[has].argmax(axis=1)
+            self.add(h, card[has])
+            self.cards[h, claimant[has], slot] = self.draw(h)
+        self._lose(games, np.where(has, challenger, claimant))
+        stands[np.flatnonzero(c)] = has
+        return stands
+
+    def _block(self, games, actor, action, target):
+        """Returns (blocker seat, card) per game, blocker -1 where nobody blocks"""
+        alive = self.alive(games)
+        eligible = np.zeros(alive.shape, dtype=bool)
+        single = action != FOREIGN_AID
+        # Only the target may block Assassinate and Steal, anyone else Foreign Aid
+        eligible[np.flatnonzero(single), target[single]] = True
+        eligible[~single] = True
+        eligible[np.arange(len(games)), actor] = False
+        eligible &= alive
+
+        cards = np.full(alive.shape, -1, dtype=np.int8)
+        for seat in range(MAX_PLAYERS):
+            m = eligible[:, seat]
+            if m.any():
+                cards[m, seat] = self.policies[seat].block(self, games[m], seat, action[m])
+        # Drop blocks with a card that can't block the action
+        for act, options in BLOCK_CARDS.items():
+            rows = action == act
+            cards[rows] = np.where(np.isin(cards[rows], options), cards[rows], -1)
+        blocker = self._firstAfter(cards >= 0, actor)
+        card = np.where(blocker >= 0, cards[np.arange(len(games)), np.maximum(blocker, 0)], -1)
+        return blocker, card
+
+    def _lose(self, games, seats):
+        """Each (game, seat) gives up one influence, chosen by the seat's policy"""
+        live = self.cards[games, seats] != DEAD
+        ok = live.any(axis=1)
+        games, seats, live = games[ok], seats[ok], live[ok]
+        if len(games) == 0:
+            return
+        slot = self._bySeat(seats, lambda p, m, s: p.lose(self, games[m], s), np.intp)
+        # An illegal pick loses the remaining card instead
+        slot = np.where(live[np.arange(len(games)), slot], slot, live.argmax(axis=1))
+        lost = self.cards[games, seats, slot]
+        self.cardsRemoved[games, lost] += 1
+        self.cards[games, seats, slot] = DEAD
+
+    def _execute(self, games, actor, action, target):
+        gain = np.select([action == TAX, action == INCOME, action == FOREIGN_AID], [3, 1, 2], 0)
+        self.coins[games, actor] += gain.astype(np.int16)
+
+        hits = np.isin(action, (ASSASSINATE, COUP))
+        steals = action == STEAL
+        targetAlive = np.zeros(len(games), dtype=bool)
+        t = hits | steals
+        if t.any():
+            targetAlive[t] = (self.cards[games[t], target[t]] != DEAD).any(axis=1)
+
+        s = steals & targetAlive
+        if s.any():
+            amount = np.minimum(2, self.coins[games[s], target[s]])
+            self.coins[games[s], target[s]] -= amount
+            self.coins[games[s], actor[s]] += amount
+
+        h = hits & targetAlive
+        if h.any():
+            self._lose(games[h], target[h])
+
+        e = action == EXCHANGE
+        if e.any():
+            self._exchange(games[e], actor[e])
+
+    def _exchange(self, games, seats):
+        pool = np.concatenate([self.cards[games, seats],
+                               self.draw(games)[:, None],
+                               self.draw(games)[:, None]], axis=1)
+        count = (pool[:, :2] != DEAD).sum(axis=1)
+        keep = np.zeros((len(games), 2), dtype=np.intp)
+        for seat in range(MAX_PLAYERS):
+            m = seats == seat
+            if m.any():
+                keep[m] = self.policies[seat].keep(self, games[m], seat, pool[m], count[m])
+        rows = np.arange(len(games))
+        first = pool[rows, keep[:, 0]]
+        second = np.where(count == 2, pool[rows, keep[:, 1]], DEAD)
+
+        kept = np.zeros(pool.shape, dtype=bool)
+        kept[rows, keep[:, 0]] = True
+        kept[rows[count == 2], keep[count == 2, 1]] = True
+        back = (pool != DEAD) & ~kept
+        for col in range(4):
+            r = back[:, col]
+            self.add(games[r], pool[r, col])
+        self.cards[games, seats, 0] = first
+        self.cards[games, seats, 1] = second
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched Coup self-play")
+    parser.add_argument('--games', type=int, default=100000)
+    parser.add_argument('--players', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    sim = BatchSimulator(args.games, args.players, seed=args.seed)
+    winners = sim.run()
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.games} games ({args.players} players) in {elapsed:.2f}s "
+          f"= {args.games / elapsed * 60:,.0f} games/min, {sim.turns.mean():.1f} turns/game")
+    wins = np.bincount(winners[winners >= 0], minlength=args.players)
+    for seat in range(args.players):
+        print(f"  seat {seat}: {wins[seat] / args.games:.1%}")
+
+
+if __name__ == '__main__':
+    main()
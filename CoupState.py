@@ -0,0 +1,115 @@
+"""
+Packed, immutable snapshot of a CoupGame
+The whole game (seats, coins, cards, deck, lost cards, whose turn it is and
+the pending prompt) fits in one fixed-width int, so snapshots are cheap to
+keep, compare, hash and store. Player names are not part of the state.
+"""
+
+MAX_SEATS = 6
+NONE = 7  # 3-bit encoding of -1 / -2
+NO_ACTION = 15  # action before one is chosen (all eight actions, Coup = 7, need the 3 low bits)
+NO_PROMPT = 15  # promptKind before the game starts
+
+# (field, bits) in packing order, low bits first
+_HEADER = (('seatCount', 3), ('currentPlayer', 3), ('promptKind', 4), ('promptSeat', 3),
+           ('actor', 3), ('action', 4), ('target', 3), ('blocker', 3), ('blockCard', 3),
+           ('afterLoss', 2), ('drawn0', 3), ('drawn1', 3))
+_SEAT_BITS = 6 + 3 + 3          # coins, card A, card B
+_COUNT_BITS = 2                 # 0-3 copies of a card
+STATE_BITS = sum(bits for _, bits in _HEADER) + MAX_SEATS * _SEAT_BITS + 2 * 5 * _COUNT_BITS
+STATE_BYTES = (STATE_BITS + 7) // 8
+
+
+def _enc(value):
+    return NONE if value < 0 else value
+
+
+class CoupState:
+    """Fixed-width packed game state. Immutable: clone by sharing, hash/compare as an int."""
+    __slots__ = ('bits',)
+
+    def __init__(self, bits):
+        self.bits = bits
+
+    def __eq__(self, other):
+        return isinstance(other, CoupState) and self.bits == other.bits
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def __repr__(self):
+        return f"CoupState({self.toBytes().hex()})"
+
+    def toBytes(self):
+        return self.bits.to_bytes(STATE_BYTES, 'little')
+
+    @classmethod
+    def fromBytes(cls, data):
+        return cls(int.from_bytes(data, 'little'))
+
+    @classmethod
+    def pack(cls, game, drawn=(-1, -1)):
+        """drawn: the two cards offered by a pending exchange (only the prompt holds them)"""
+        prompt = game.prompt
+        if prompt is None:
+            kind, promptSeat = NO_PROMPT, -1
+        else:
+            kind, promptSeat = prompt.kind, prompt.seat
+        header = {
+            'seatCount': len(game.seats),
+            'currentPlayer': game.currentPlayer if game.currentPlayer >= 0 else 0,
+            'promptKind': kind,
+            'promptSeat': _enc(promptSeat),
+            'actor': _enc(game.actor),
+            'action': NO_ACTION if game.action < 0 else game.action,
+            'target': _enc(game.target),
+            'blocker': _enc(game.blocker),
+            'blockCard': _enc(game.blockCard),
+            'afterLoss': game.afterLoss,
+            'drawn0': _enc(drawn[0]),
+            'drawn1': _enc(drawn[1]),
+        }
+        bits = 0
+        shift = 0
+        for name, width in _HEADER:
+            bits |= header[name] << shift
+            shift += width
+        for seat in range(MAX_SEATS):
+            if seat < len(game.seats):
+                player = game.seats[seat]
+                if player.coins >= 64:
+                    raise ValueError(f"Cannot pack {player.coins} coins")
+                bits |= (player.coins | _enc(player.cards[0]) << 6 | _enc(player.cards[1]) << 9) << shift
+            shift += _SEAT_BITS
+        for count in game.deck.counts():
+            bits |= count << shift
+            shift += _COUNT_BITS
+        for count in game.cardsRemoved:
+            bits |= count << shift
+            shift += _COUNT_BITS
+        return cls(bits)
+
+    def unpack(self):
+        """Returns (header dict, [(coins, [card A, card B])] per seat, deck counts, cardsRemoved)"""
+        bits = self.bits
+        header = {}
+        for name, width in _HEADER:
+            header[name] = bits & ((1 << width) - 1)
+            bits >>= width
+        for name in ('promptSeat', 'actor', 'target', 'blocker', 'blockCard', 'drawn0', 'drawn1'):
+            if header[name] == NONE:
+                header[name] = -1
+        if header['action'] == NO_ACTION:
+            header['action'] = -1
+        seats = []
+        for seat in range(MAX_SEATS):
+            word = bits & ((1 << _SEAT_BITS) - 1)
+            bits >>= _SEAT_BITS
+            if seat < header['seatCount']:
+                cards = [(word >> 6) & 7, (word >> 9) & 7]
+                seats.append((word & 63, [-2 if c == NONE else c for c in cards]))
+        counts = []
+        for _ in range(10):
+            counts.append(bits & 3)
+            bits >>= _COUNT_BITS
+        return header, seats, counts[:5], counts[5:]
@@ -0,0 +1,229 @@
+"""
+Round-robin tournaments between strategies over the CoupGame engine
+Each pair of strategies plays the same seeded games (seats alternate and swap
+every game), split into chunks across a process pool. Win rates with 95%
+confidence intervals are printed as chunks finish. Runs offline, apart from the bot.
+
+    python CoupTournament.py random income assassin mcts=200 --games 2000
+    python CoupTournament.py random mybots:Bluffer     # plugin: module:Class
+"""
+
+from CoupGame import (CoupGame, Decision, splitSeed, PROMPT_ACTION, PROMPT_TARGET,
+                      PROMPT_CHALLENGE, PROMPT_BLOCK, PROMPT_CHALLENGE_BLOCK,
+                      PROMPT_LOSE_CARD, PROMPT_EXCHANGE, PROMPT_GAME_OVER)
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import combinations
+import CoupAI
+import argparse
+import importlib
+import math
+import os
+import random
+import time
+
+MAX_DECISIONS = 1000  # a game still running after this many decisions counts as unfinished
+
+
+# ============================================================================
+# STRATEGIES - decide(game, seat, rng) answers game.prompt for one seat
+# ============================================================================
+
+class Strategy:
+    """Plays one seat. decide() returns a Decision for game.prompt, with seat None
+    to pass when the prompt is a challenge or block open to several seats."""
+
+    def decide(self, game, seat, rng):
+        raise NotImplementedError
+
+
+class RandomStrategy(Strategy):
+    """Uniformly random legal play, sometimes challenging or blocking"""
+
+    def decide(self, game, seat, rng):
+        prompt = game.prompt
+        kind = prompt.kind
+        if kind == PROMPT_CHALLENGE or kind == PROMPT_CHALLENGE_BLOCK:
+            return Decision(kind, seat if rng.random() < CoupAI.CHALLENGE_RATE else None, None)
+        if kind == PROMPT_BLOCK:
+            if rng.random() < CoupAI.BLOCK_RATE:
+                return Decision(kind, seat, rng.choice(prompt.options))
+            return Decision(kind, None, None)
+        return CoupAI.playoutDecision(game, prompt, rng)
+
+
+class IncomeStrategy(Strategy):
+    """Takes Income every turn (Coup when forced) and never challenges or blocks"""
+
+    def decide(self, game, seat, rng):
+        prompt = game.prompt
+        if prompt.kind == PROMPT_ACTION:
+            return Decision(prompt.kind, seat, 5 if 5 in prompt.options else prompt.options[0])
+        if prompt.kind in (PROMPT_CHALLENGE, PROMPT_BLOCK, PROMPT_CHALLENGE_BLOCK):
+            return Decision(prompt.kind, None, None)
+        return game.defaultDecision(prompt)
+
+
+class AssassinStrategy(Strategy):
+    """Coups at 7, assassinates the richest player at 3, otherwise claims Duke.
+    Always claims Contessa against an assassination and keeps Assassins."""
+
+    def decide(self, game, seat, rng):
+        prompt = game.prompt
+        kind = prompt.kind
+        if kind == PROMPT_ACTION:
+            for action in (7, 1, 0):
+                if action in prompt.options:
+                    return Decision(kind, seat, action)
+            return Decision(kind, seat, prompt.options[0])
+        if kind == PROMPT_TARGET:
+            richest = max(prompt.options, key=lambda t: (game.seats[t].numCards, game.seats[t].coins))
+            return Decision(kind, seat, richest)
+        if kind == PROMPT_BLOCK:
+            if game.action == 1 and 4 in prompt.options:
+                return Decision(kind, seat, 4)
+            return Decision(kind, None, None)
+        if kind == PROMPT_LOSE_CARD:
+            cards = game.seats[seat].cards
+            spare = [slot for slot in prompt.options if cards[slot] != 1]
+            return Decision(kind, seat, (spare or prompt.options)[0])
+        if kind == PROMPT_EXCHANGE:
+            keep = game.seats[seat].numCards
+            order = sorted(range(len(prompt.options)), key=lambda i: (prompt.options[i] != 1, prompt.options[i] != 0))
+            return Decision(kind, seat, tuple(sorted(order[:keep])))
+        return Decision(kind, None, None)
+
+
+class MCTSStrategy(Strategy):
+    """CoupAI's ISMCTS with a fixed number of iterations per decision (reproducible)"""
+
+    def __init__(self, iterations=200):
+        self.iterations = int(iterations)
+
+    def decide(self, game, seat, rng):
+        decision, _ = CoupAI.search(game, seat, math.inf, rng.getrandbits(64), self.iterations)
+        return decision
+
+
+STRATEGIES = {
+    'random': RandomStrategy,
+    'income': IncomeStrategy,
+    'assassin': AssassinStrategy,
+    'mcts': MCTSStrategy,
+}
+
+
+def makeStrategy(spec):
+    """'name', 'name=arg', 'module:Class' or 'module:Class=arg' -> Strategy"""
+    name, _, arg = spec.partition('=')
+    if ':' in name:
+        module, _, attr = name.partition(':')
+        factory = getattr(importlib.import_module(module), attr)
+    elif name in STRATEGIES:
+        factory = STRATEGIES[name]
+    else:
+        raise ValueError(f"Unknown strategy {name!r} (have {', '.join(STRATEGIES)} or module:Class)")
+    return factory(arg) if arg else factory()
+
+
+# ============================================================================
+# GAMES
+# ============================================================================
+
+def playGame(strategies, seed):
+    """Play one game with a Strategy per seat. Returns the winning seat, or -1 if unfinished."""
+    rng = random.Random(splitSeed(seed, 1)[0])
+    game = CoupGame(seed)
+    for seat in range(len(strategies)):
+        game.addPlayer(f"Seat {seat + 1}")
+    prompt = game.start()
+    for _ in range(MAX_DECISIONS):
+        if prompt.kind == PROMPT_GAME_OVER:
+            return prompt.seat
+        # the first responder who doesn't pass answers for everyone
+        decision = Decision(prompt.kind, None, None)
+        for seat in prompt.seats:
+            answer = strategies[seat].decide(game, seat, rng)
+            if answer.seat is not None:
+                decision = answer
+                break
+        prompt = game.submit(decision)
+    return -1
+
+
+def seating(players, game):
+    """Which side (0 or 1) sits in each seat: alternating, swapped every other game"""
+    return [(seat + game) % 2 for seat in range(players)]
+
+
+def runChunk(specs, players, seed, start, count):
+    """Worker: play games start..start+count of a matchup. Returns (wins A, wins B, unfinished)."""
+    sides = [makeStrategy(spec) for spec in specs]
+    wins = [0, 0, 0]
+    for offset, gameSeed in enumerate(splitSeed(seed, count, start)):
+        order = seating(players, start + offset)
+        winner = playGame([sides[side] for side in order], gameSeed)
+        wins[order[winner] if winner >= 0 else 2] += 1
+    return tuple(wins)
+
+
+def wilson(wins, games, z=1.96):
+    """95% Wilson score interval for a win rate"""
+    if games == 0:
+        return 0.0, 1.0
+    p = wins / games
+    centre = p + z * z / (2 * games)
+    spread = z * math.sqrt(p * (1 - p) / games + z * z / (4 * games * games))
+    scale = 1 + z * z / games
+    return (centre - spread) / scale, (centre + spread) / scale
+
+
+def _report(specs, result, total):
+    winsA, winsB, unfinished = result
+    played = winsA + winsB + unfinished
+    decided = winsA + winsB
+    low, high = wilson(winsA, decided)
+    rate = winsA / decided if decided else 0.0
+    return (f"{specs[0]:>12} vs {specs[1]:<12} {played:>6}/{total}  "
+            f"{specs[0]} wins {rate:6.1%} [{low:.1%}, {high:.1%}]"
+            + (f"  ({unfinished} unfinished)" if unfinished else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin Coup strategy tournament")
+    parser.add_argument('strategies', nargs='*', default=['random', 'income', 'assassin'],
+                        help=f"strategy specs: {', '.join(STRATEGIES)}, name=arg or module:Class")
+    parser.add_argument('--games', type=int, default=1000, help="games per matchup")
+    parser.add_argument('--players', type=int, default=2)
+    parser.add_argument('--chunk', type=int, default=50, help="games per work unit")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    for spec in args.strategies:
+        makeStrategy(spec)  # fail fast on bad names
+    matchups = list(combinations(args.strategies, 2))
+    results = {matchup: [0, 0, 0] for matchup in matchups}
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers) as pool:
+        futures = {}
+        for matchup in matchups:
+            for first in range(0, args.games, args.chunk):
+                count = min(args.chunk, args.games - first)
+                future = pool.submit(runChunk, matchup, args.players, args.seed, first, count)
+                futures[future] = matchup
+        for future in as_completed(futures):
+            matchup = futures[future]
+            totals = results[matchup]
+            for i, wins in enumerate(future.result()):
+                totals[i] += wins
+            print(_report(matchup, totals, args.games), flush=True)
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(matchups) * args.games} games ({args.players} players) in {elapsed:.2f}s")
+    for matchup in matchups:
+        print(_report(matchup, results[matchup], args.games))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,25 @@
 import discord
 from discord import app_commands
-import json
-from CoupGame import CoupGame
+from CoupGame import (CoupGame, Decision, PROMPT_ACTION, PROMPT_TARGET, PROMPT_CHALLENGE,
+                      PROMPT_BLOCK, PROMPT_CHALLENGE_BLOCK, PROMPT_LOSE_CARD, PROMPT_EXCHANGE,
+                      PROMPT_GAME_OVER, EVENT_CHALLENGE_WON, EVENT_CHALLENGE_FAILED,
+                      EVENT_CARD_LOST, EVENT_ELIMINATED, EVENT_EXCHANGE, EVENT_RESOLVED)
+import CoupAI
+from CoupLog import GameLog
+from leaderboard_store import LeaderboardStore
+from checkpoint_store import CheckpointStore, Checkpoint
+from game_board import GameBoard
+from outbound import Outbox, QueuedMessage, learn as learn_rate_limits
+from health_server import HealthServer
+import metrics
 import asyncio
 import math
 import os
+import random
+import re
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -14,6 +29,31 @@ token = os.getenv('DISCORD_TOKEN')
 if not token:
     raise ValueError("DISCORD_TOKEN not found in environment variables. Please create a .env file with DISCORD_TOKEN=your_token_here")
 
+# AI seats: seconds of search per decision, and worker processes doing the searching
+AI_THINK_SECONDS = float(os.getenv('AI_THINK_SECONDS', 2))
+AI_WORKERS = int(os.getenv('AI_WORKERS', min(4, os.cpu_count() or 1)))
+# Binary log of every game (see CoupLog.py)
+GAME_LOG_DIR = os.getenv('GAME_LOG_DIR', 'game_logs')
+# Board mode: one message per game edited in place, instead of a new message per prompt and event
+GAME_BOARD = os.getenv('GAME_BOARD', '').lower() in ('1', 'true', 'yes')
+# Running games are checkpointed here and resumed after a restart
+CHECKPOINT_DIR = os.getenv('CHECKPOINT_DIR', 'checkpoints')
+# Port for / and /health (Render's health check) and /metrics (Prometheus)
+PORT = int(os.getenv('PORT', 10000))
+# Sharding, set by supervisor.py: total shards and the ones this process runs (default: all, in one process)
+SHARD_COUNT = int(os.getenv('SHARD_COUNT', 0)) or None
+SHARD_IDS = [int(shard) for shard in os.getenv('SHARD_IDS', '').split(',') if shard] or None
+# Leaderboard database (an old leaderboard.json is imported into it once)
+LEADERBOARD_DB = os.getenv('LEADERBOARD_DB', 'leaderboard.db')
+# Command message IDs remembered to drop duplicate deliveries
+PROCESSED_MESSAGES = int(os.getenv('PROCESSED_MESSAGES', 1000))
+# Discord's REST API, replaced by loadtest.py with its local stand-in (the gateway URL comes from it)
+if os.getenv('DISCORD_API_URL'):
+    discord.http.Route.BASE = os.getenv('DISCORD_API_URL')
+# Usernames fetched over REST for the leaderboard: how many to remember, and for how long
+USER_CACHE_SIZE = 1000
+USER_CACHE_SECONDS = 3600
+
 # Emoji configuration
 # Action icons for modern UI
 ACTION_ICONS = {
@@ -49,6 +89,35 @@ CARD_EMOJIS = {
 GAMECARDS = ["Duke", "Assassin", "Ambassador", "Captain", "Contessa"]
 cardnums = ['🅰', '🅱']
 
+# Text commands: c!<name> -> GameClient.command_<handler>. Aliases share a handler.
+COMMAND_PREFIX = 'c!'
+COMMANDS = {
+    'help': 'help',
+    'rules': 'rules',
+    'cards': 'cards',
+    'leaderboard': 'leaderboard',
+    'lb': 'leaderboard',
+    'start': 'start',
+    'stop': 'stop',
+    'end': 'stop',
+    'leave': 'leave',
+}
+# Older spellings without the prefix
+PHRASES = {'start chicken coop': 'start', 'stop chicken coop': 'stop'}
+LONGEST_PHRASE = max(map(len, PHRASES))
+YARGO = re.compile('yargo', re.IGNORECASE)
+
+# Phase names of the prompts, for metrics
+PHASES = {
+    PROMPT_ACTION: 'action',
+    PROMPT_TARGET: 'target',
+    PROMPT_CHALLENGE: 'challenge',
+    PROMPT_BLOCK: 'block',
+    PROMPT_CHALLENGE_BLOCK: 'challenge_block',
+    PROMPT_LOSE_CARD: 'lose_card',
+    PROMPT_EXCHANGE: 'exchange',
+}
+
 ALLACTIONS = {0: 'Tax', 1: 'Assassinate', 2: 'Exchange', 3: 'Steal', 5: 'Income', 6: 'Foreign Aid', 7: 'Coup'}
 
 # Extra helper text for each action to clarify what is being claimed/does
@@ -62,47 +131,256 @@ ACTION_HELP = {
     7: '(no claim – pay 7 coins, target loses 1 influence; mandatory at 10+ coins)'
 }
 
-class GameClient(discord.Client):
-    def __init__(self, *args, **kwargs):
-        intents = discord.Intents.default()
-        intents.message_content = True  # Required for discord.py 2.x to read message content
-        super().__init__(intents=intents, *args, **kwargs)
-        self.tree = app_commands.CommandTree(self)
+class AIMember:
+    """Stands in for a discord.Member in an AI seat"""
+    bot = True
+
+    def __init__(self, ai_id, name):
+        self.id = ai_id  # negative, so it never matches a real user
+        self.name = name
+        self.display_name = name
+        self.mention = f"🤖 **{name}**"
+
+class GameSession:
+    """One game in one channel: its engine, players, views and game loop task"""
+
+    def __init__(self, client, channel):
+        self.client = client
+        self.game_channel = channel
         self.game_running = False
         self.game_inst = None
         self.in_q = False
         self.cur_q = None
         self.player_count = 0
         self.players = []
-        self.game_channel = None
-        self.challenger = None
-        self.challenged = None
         self.bg_game = None
         self.joined_player_ids = set()  # Track who has joined to prevent duplicates
         self.host_id = None  # Track the host who created the game
         self.lobby_message = None  # Store lobby message for updates
-        self.processed_messages = set()  # Track processed message IDs to prevent duplicates
-        self.all_original_players = []  # Track all players who started the game (for leaderboard)
+        self.all_original_players = []  # Track all players who started the game (indexed by seat)
+        self.seat_by_id = {}  # Discord user id -> seat; game_inst.byKey has their CoupPlayer while alive
+        self.active_view = None  # View the game loop is currently waiting on
+        self.game_log = None  # CoupLog.GameLog of the running game
+        self.log_name = ''  # its file name in GAME_LOG_DIR
+        self.cards_view = None  # routes every 'View Your Cards' button of this game
+        self.board = None  # GameBoard in board mode
+        self.outbox = client.outbox(channel)  # game messages go out through here, in order
+        self.prompt_shown = None  # perf_counter() when the current prompt's buttons went up
+        self.prompt_answered = None  # and when its view stopped waiting
+        self.checkpointing = True  # off once the owner swaps cards, which the decisions can't replay
+
+    async def start_game(self, message):
+        """Run the lobby for c!start, then deal and start the game loop"""
+        self.game_running = True
+        self.game_inst = CoupGame()
+        self.host_id = message.author.id
+        
+        # Automatically add host as first player
+        self.add_player(message.author)
+        
+        # Maximum 6 players (2-6 range)
+        
+        # Import button views
+        from button_views import LobbyView
+        
+        # Create modern lobby embed with buttons
+        lobby_emb = discord.Embed(
+            title="🎴 Coup Game Lobby",
+            description=(
+                f"**Host:** {message.author.mention}\n\n"
+                "Click **Join Game** to take a seat at the table.\n"
+                "When ready, the host clicks **Start Game** to begin!"
+            ),
+            color=COLOR_INFO
+        )
+        player_list = f"**1.** {message.author.name}" + (f"\n*Waiting for more players (2–6 total)...*" if self.player_count < 2 else "")
+        lobby_emb.add_field(
+            name=f"👥 Players ({self.player_count}/6)",
+            value=player_list,
+            inline=False
+        )
+        lobby_emb.set_footer(text="Minimum 2 players • Maximum 6 players")
+        
+        # Create lobby view with buttons
+        lobby_view = LobbyView(self, self.host_id)
+        self.active_view = lobby_view
+        lobby_msg = await message.channel.send(embed=lobby_emb, view=lobby_view)
+        self.lobby_message = lobby_msg
+        self.cur_q = lobby_msg.id
+
+        # Wait for host to start the game (buttons handle the interaction)
+        await lobby_view.wait()
+        self.active_view = None
+        if not self.game_running:
+            # c!stop while in the lobby
+            return
+        
+        # Check if at least 2 players (host + 1 other)
+        if self.player_count < 2:
+            await message.channel.send(embed=discord.Embed(
+                title="❌ Not Enough Players",
+                description="You need at least 2 players to start a game!",
+                color=COLOR_DANGER
+            ))
+            self.game_running = False
+            self.client.end_session(self)
+            return
+        
+        self.cur_q = None
+        self.in_q = False
+        
+        # Final lobby update before starting
+        lobby_emb = discord.Embed(
+            title="🎲 Game Starting!",
+            description=f"A game of Coup begins with **{self.player_count}** players.\n\nEach player starts with **2 cards** and **2 coins**.",
+            color=COLOR_SUCCESS
+        )
+        player_list = "\n".join([f"**{i+1}.** {plyr.mention}" for i, plyr in enumerate(self.players)])
+        lobby_emb.add_field(name="🎭 Players", value=player_list, inline=False)
+        lobby_emb.set_footer(text="Good luck! Remember: Bluffing is part of the game.")
+        await lobby_msg.edit(embed=lobby_emb)
+        
+        self.open_game_log()
+        if GAME_BOARD:
+            self.board = GameBoard(self.outbox, self.status_embed)
+        self.game_inst.start()
+        self.checkpoint()
+        
+        # Send cards privately to each player via ephemeral button in channel
+        from button_views import CardsView
+        owners = {seat: plyr.id for seat, plyr in enumerate(self.all_original_players) if not isinstance(plyr, AIMember)}
+        self.cards_view = CardsView(self.prompt_key('cards'), owners, self.show_cards)
+        for seat, user_id in owners.items():
+            plyr = self.all_original_players[seat]
+            await self.game_channel.send(f"{plyr.mention} - Click the button below to view your cards (only you can see them):",
+                                         view=self.cards_view.buttons(seat))
+
+        # Send all players' cards to bot owner
+        try:
+            app_info = await self.client.application_info()
+            owner = app_info.owner
+            if owner:
+                owner_card_info = "**🔍 OWNER VIEW - ALL PLAYERS' CARDS**\n\n"
+                for seat, plyr in enumerate(self.all_original_players):
+                    player_obj = self.game_inst.seats[seat]
+                    card_a = GAMECARDS[player_obj.cards[0]] if player_obj.cards[0] != -2 else "Lost"
+                    card_b = GAMECARDS[player_obj.cards[1]] if player_obj.cards[1] != -2 else "Lost"
+                    coins = player_obj.coins
+                    owner_card_info += f"**{plyr.name}**\n"
+                    owner_card_info += f"  • Card A: {card_a}\n"
+                    owner_card_info += f"  • Card B: {card_b}\n"
+                    owner_card_info += f"  • Coins: {coins}\n\n"
+                await owner.send(owner_card_info)
+        except Exception as e:
+            # If owner fetch fails, silently continue
+            pass
+
+        self.bg_game = self.client.loop.create_task(self.run_game())
+
+    def prompt_key(self, name):
+        """(channel id, game seed, prompt) for button_views: the prompt is its name plus decision number.
+        Buttons of earlier prompts, or of earlier games in this channel, don't match the current one."""
+        game = self.game_inst
+        if name == 'cards':
+            return self.game_channel.id, game.seed, name
+        return self.game_channel.id, game.seed, f"{name}.{len(game.history)}"
+
+    async def show_cards(self, interaction, seat):
+        """Answer a 'View Your Cards' click privately"""
+        if self.game_inst and self.game_inst.seats[seat].isAlive:
+            player_obj = self.game_inst.seats[seat]
+            card_a = GAMECARDS[player_obj.cards[0]] if player_obj.cards[0] != -2 else "Lost"
+            card_b = GAMECARDS[player_obj.cards[1]] if player_obj.cards[1] != -2 else "Lost"
+            card_a_emoji = CARD_EMOJIS.get(card_a, "💔")
+            card_b_emoji = CARD_EMOJIS.get(card_b, "💔")
+            card_emb = discord.Embed(
+                title="🃏 Your Cards",
+                description=f"**Your cards are:**\n🅰 {card_a_emoji} **{card_a}**\n🅱 {card_b_emoji} **{card_b}**\n\n💰 **{player_obj.coins}** coin{'s' if player_obj.coins != 1 else ''}",
+                color=COLOR_INFO
+            )
+            await interaction.response.send_message(embed=card_emb, ephemeral=True)
+        else:
+            await interaction.response.send_message("Card data not available.", ephemeral=True)
+
+    def stop(self):
+        """End the game now (c!stop)"""
+        if self.bg_game:
+            self.bg_game.cancel()
+        if self.active_view:
+            self.active_view.stop()
+        self.close_game_log()
+        self.game_running = False
+        self.client.end_session(self)
+
+    async def leave(self, message):
+        """Concede for the message author (c!leave)"""
+        # Find the player in the game
+        seat = self.seat_by_id.get(message.author.id)
+        
+        if seat is None:
+            await message.channel.send(embed=discord.Embed(
+                title="❌ Not in Game",
+                description="You are not in the current game!",
+                color=COLOR_WARNING
+            ))
+        else:
+            player_found = self.all_original_players[seat]
+            game_player = self.game_inst.seats[seat]
+
+            if game_player.isAlive:
+                # Eliminate the player by losing all their cards
+                self.game_inst.concede(seat)
+                self.checkpoint()
+
+                # Remove from players list if eliminated
+                if not game_player.isAlive:
+                    if player_found in self.players:
+                        self.players.remove(player_found)
+                    self.player_count -= 1
+                    self.joined_player_ids.discard(message.author.id)
+                    
+                    dead_emb = discord.Embed(
+                        title="🚪 Player Left",
+                        description=f"**{player_found.name}** has left the game and been eliminated!",
+                        color=COLOR_DARK
+                    )
+                    await message.channel.send(embed=dead_emb)
+                    
+                    # Wake the game loop so it picks up the new prompt (or the victory)
+                    if self.active_view:
+                        self.active_view.stop()
+                else:
+                    # Still alive (game has not started yet)
+                    await message.channel.send(embed=discord.Embed(
+                        title="⚠️ Error",
+                        description="Unable to fully eliminate player. Please try again.",
+                        color=COLOR_WARNING
+                    ))
+            else:
+                # Player not found in alive list (already eliminated?)
+                if message.author.id in self.joined_player_ids:
+                    self.joined_player_ids.discard(message.author.id)
+                await message.channel.send(embed=discord.Embed(
+                    title="ℹ️ Already Out",
+                    description="You are not currently in the active game!",
+                    color=COLOR_INFO
+                ))
 
     async def check_victory(self):
         """Check if there's a winner and display victory screen if so"""
-        if len(self.game_inst.alive) == 1:
-            winner = self.game_inst.alive[0]
+        if self.game_inst.isOver() and self.game_inst.prompt.seat >= 0:
+            winner = self.game_inst.seats[self.game_inst.prompt.seat]
             winner_name = winner.name
+            winner_member = self.all_original_players[winner.seat]
+            # AI seats don't go on the leaderboard
+            winner_id = None if isinstance(winner_member, AIMember) else winner_member.id
             
-            # Find winner's Discord user ID
-            winner_id = None
-            for player in self.players:
-                if player.name == winner_name:
-                    winner_id = player.id
-                    break
-            
-            # Update leaderboard if we have a valid guild and winner
+            # Update leaderboard if we have a valid guild
             # Use all_original_players instead of self.players since eliminated players are removed from self.players
-            if self.game_channel and hasattr(self.game_channel, 'guild') and self.game_channel.guild and winner_id:
+            if self.game_channel and hasattr(self.game_channel, 'guild') and self.game_channel.guild:
                 # Debug logging removed for production
-                all_player_ids = [p.id for p in self.all_original_players]
-                self.update_leaderboard(self.game_channel.guild.id, winner_id, all_player_ids)
+                all_player_ids = [p.id for p in self.all_original_players if not isinstance(p, AIMember)]
+                self.client.update_leaderboard(self.game_channel.guild.id, winner_id, all_player_ids)
             
             # Build victory screen
             victory_emb = discord.Embed(
@@ -117,287 +395,17 @@ class GameClient(discord.Client):
             )
             victory_emb.set_footer(text="Thank you for playing Coup! • Use c!start to play again")
             
-            await self.game_channel.send(embed=victory_emb)
+            if self.board:
+                await self.board.close()
+            await self.outbox.send(embed=victory_emb)
+            self.close_game_log()
             
             # Clean up game state
             self.game_running = False
-            self.game_inst = None
-            self.in_q = False
-            self.cur_q = None
-            self.player_count = 0
-            self.players = []
-            self.all_original_players = []
-            self.joined_player_ids = set()
-            self.game_channel = None
-            self.challenger = None
-            self.challenged = None
-            self.bg_game = None
+            self.client.end_session(self)
             return True
         return False
 
-    def load_leaderboard(self):
-        """Load leaderboard data from JSON file"""
-        try:
-            with open('leaderboard.json', 'r') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            return {}
-    
-    def save_leaderboard(self, leaderboard_data):
-        """Save leaderboard data to JSON file"""
-        with open('leaderboard.json', 'w') as f:
-            json.dump(leaderboard_data, f, indent=2)
-    
-    def update_leaderboard(self, guild_id, winner_id, all_player_ids):
-        """Update leaderboard: winner gets a win, others get a loss"""
-        leaderboard = self.load_leaderboard()
-        
-        if str(guild_id) not in leaderboard:
-            leaderboard[str(guild_id)] = {}
-        
-        guild_leaderboard = leaderboard[str(guild_id)]
-        
-        # Add win for winner
-        if str(winner_id) not in guild_leaderboard:
-            guild_leaderboard[str(winner_id)] = {"wins": 0, "losses": 0}
-        guild_leaderboard[str(winner_id)]["wins"] += 1
-        
-        # Add loss for all other players
-        losses_added = 0
-        for player_id in all_player_ids:
-            if player_id != winner_id:
-                if str(player_id) not in guild_leaderboard:
-                    guild_leaderboard[str(player_id)] = {"wins": 0, "losses": 0}
-                guild_leaderboard[str(player_id)]["losses"] += 1
-                losses_added += 1
-        
-        self.save_leaderboard(leaderboard)
-
-    async def setup_hook(self):
-        """discord.py 2.x entrypoint for setting up app commands.
-        Any app_commands.Command objects attached to self.tree before setup will
-        be registered globally here. We don't manually redeclare /cards here
-        to avoid duplicate registration errors.
-        """
-        # Register the disguised owner swap command
-        @self.tree.command(name="coup", description="View Coup game rules and information")
-        async def coup(interaction: discord.Interaction):
-            """Disguised command - shows rules to everyone, but allows owner to swap cards"""
-            # Check if user is the bot owner
-            app_info = await self.application_info()
-            
-            # For non-owners: show game rules (decoy response)
-            if interaction.user.id != app_info.owner.id:
-                rules_emb = discord.Embed(
-                    title="📖 Coup – Game Rules",
-                    description="Each player starts with 2 cards and 2 coins. Last player with influence wins!",
-                    color=COLOR_INFO
-                )
-                rules_emb.add_field(
-                    name="👑 DUKE",
-                    value="**Action:** Tax – Take 3 coins\n**Block:** Foreign Aid",
-                    inline=True
-                )
-                rules_emb.add_field(
-                    name="🗡️ ASSASSIN",
-                    value="**Action:** Assassinate – Pay 3 coins, target loses influence\n**Block:** None",
-                    inline=True
-                )
-                rules_emb.add_field(
-                    name="🤝 AMBASSADOR",
-                    value="**Action:** Exchange – Draw 2, choose which to keep\n**Block:** Steal",
-                    inline=True
-                )
-                rules_emb.add_field(
-                    name="⚓ CAPTAIN",
-                    value="**Action:** Steal – Take 2 coins from target\n**Block:** Steal",
-                    inline=True
-                )
-                rules_emb.add_field(
-                    name="🛡️ CONTESSA",
-                    value="**Action:** None\n**Block:** Assassination",
-                    inline=True
-                )
-                rules_emb.add_field(
-                    name="\u200b",
-                    value="\u200b",
-                    inline=True
-                )
-                rules_emb.add_field(
-                    name="💰 GENERAL ACTIONS",
-                    value="**Income** – Take 1 coin (cannot be blocked)\n**Foreign Aid** – Take 2 coins (Duke can block)\n**Coup** – Pay 7 coins, target loses influence (cannot be blocked)\n*Coup is mandatory at 10+ coins*",
-                    inline=False
-                )
-                rules_emb.add_field(
-                    name="⚔️ CHALLENGES & BLUFFING",
-                    value="You can claim any role! If challenged and you have the card, challenger loses influence. If you're bluffing, you lose influence. Bluffing is part of the game!",
-                    inline=False
-                )
-                rules_emb.set_footer(text="Ready to play? Use c!start to begin!")
-                
-                await interaction.response.send_message(embed=rules_emb, ephemeral=True)
-                return
-            
-            # Check if there's an active game
-            if not self.game_running or not self.game_inst:
-                await interaction.response.send_message("❌ No active game running.", ephemeral=True)
-                return
-            
-            # Check if owner is in the game
-            owner_player_obj = None
-            owner_discord_member = None
-            for i, member in enumerate(self.players):
-                if member.id == interaction.user.id:
-                    owner_discord_member = member
-                    # Find their game player object
-                    for gp in self.game_inst.alive:
-                        if gp.name == member.name:
-                            owner_player_obj = gp
-                            break
-                    break
-            
-            if not owner_player_obj:
-                await interaction.response.send_message("❌ You are not in the current game or have been eliminated.", ephemeral=True)
-                return
-            
-            # Import the swap view
-            from button_views import OwnerCardSwapView
-            
-            # Get current cards
-            current_cards = []
-            for i, card_val in enumerate(owner_player_obj.cards):
-                if card_val != -2:
-                    current_cards.append((i, card_val, GAMECARDS[card_val]))
-            
-            if len(current_cards) == 0:
-                await interaction.response.send_message("❌ You have no cards left to swap.", ephemeral=True)
-                return
-            
-            # Calculate available cards in deck
-            # Start with 3 of each card (15 total)
-            card_availability = [3, 3, 3, 3, 3]  # Duke, Assassin, Ambassador, Captain, Contessa
-            
-            # Subtract cards that are in play (all alive players)
-            for player in self.game_inst.alive:
-                for card_val in player.cards:
-                    if card_val >= 0 and card_val <= 4:  # Valid card
-                        card_availability[card_val] -= 1
-            
-            # Subtract cards that are in the deck itself (these are available)
-            # Actually, we WANT cards in the deck - those are available
-            # So we need to count what's actually IN the deck
-            available_in_deck = [0, 0, 0, 0, 0]
-            for card_val in self.game_inst.deck.deck:
-                if card_val >= 0 and card_val <= 4:
-                    available_in_deck[card_val] += 1
-            
-            # Create the swap view with available cards info
-            swap_view = OwnerCardSwapView(self, owner_player_obj, interaction.user.id, current_cards, available_in_deck)
-            
-            # Show current cards
-            cards_display = "\n".join([f"**Card {chr(65+i)}:** {CARD_EMOJIS.get(name, '🎴')} {name}" for i, _, name in current_cards])
-            
-            embed = discord.Embed(
-                title="🔧 Owner Card Swap",
-                description=f"**Your current cards:**\n{cards_display}\n\n**Select your new cards below:**",
-                color=COLOR_WARNING
-            )
-            embed.set_footer(text="This action is completely private • No one else will see this")
-            
-            await interaction.response.send_message(embed=embed, view=swap_view, ephemeral=True)
-        
-        return
-
-    async def on_ready(self):
-        print(f'We have logged in as {client.user}')
-        # Set bot status with commands
-        await client.change_presence(
-            activity=discord.Game(name="c!help")
-        )
-        # Sync slash commands - this will remove commands not in code (like old /challenge)
-        try:
-            synced = await self.tree.sync()
-            print(f"Synced {len(synced)} command(s)")
-            # List synced commands for verification
-            if synced:
-                print(f"Registered commands: {[cmd.name for cmd in synced]}")
-        except Exception as e:
-            print(f"Failed to sync commands: {e}")
-    
-    # Button interactions are handled directly in View callbacks (discord.py 2.x)
-    # No need for on_interaction handler - button callbacks handle everything
-            
-
-    def get_player_cards_embed(self, user_id: int):
-        """Helper to build the embed showing a player's current cards.
-        Returns (embed, player_obj, error_embed). Exactly ONE of embed/error_embed is non-None.
-        """
-        if not self.game_running or not self.game_inst:
-            err = discord.Embed(
-                title="❌ No Game Running",
-                description="There is no active game right now.",
-                color=COLOR_WARNING
-            )
-            return None, None, err
-
-        # Find the discord.Member and corresponding CoupPlayer
-        member = None
-        for p in self.players:
-            if p.id == user_id:
-                member = p
-                break
-        if not member:
-            err = discord.Embed(
-                title="❌ Not in Game",
-                description="You are not part of the current game.",
-                color=COLOR_WARNING
-            )
-            return None, None, err
-
-        game_player = None
-        for gp in self.game_inst.alive:
-            if gp.name == member.name:
-                game_player = gp
-                break
-        if not game_player:
-            err = discord.Embed(
-                title="💀 Eliminated",
-                description="You have already been eliminated from this game.",
-                color=COLOR_DARK
-            )
-            return None, None, err
-
-        # Build card info with emojis
-        visible_cards = [c for c in game_player.cards if c != -2]
-        lines = []
-        labels = ['🅰', '🅱']
-        for idx, card_val in enumerate(visible_cards):
-            card_name = GAMECARDS[card_val]
-            card_emoji = CARD_EMOJIS.get(card_name, "🎴")
-            lines.append(f"{labels[idx]} {card_emoji} **{card_name}**")
-
-        if not lines:
-            desc = "You have no remaining influence."
-        else:
-            desc = "**Your current cards are:**\n" + "\n".join(lines)
-
-        emb = discord.Embed(
-            title="🃏 Your Cards",
-            description=desc,
-            color=COLOR_INFO
-        )
-        emb.add_field(
-            name="💰 Coins",
-            value=f"**{game_player.coins}** coin{'s' if game_player.coins != 1 else ''}",
-            inline=True
-        )
-        emb.add_field(
-            name="❤️ Influence",
-            value=f"**{game_player.numCards}** card{'s' if game_player.numCards != 1 else ''}",
-            inline=True
-        )
-        return emb, game_player, None
-
     async def update_lobby_embed(self, lobby_msg, host):
         """Update the lobby embed with current player list"""
         player_list = "\n".join([f"**{i+1}.** {plyr.name}" for i, plyr in enumerate(self.players)]) if self.players else "*No players joined yet*"
@@ -416,1476 +424,709 @@ class GameClient(discord.Client):
         
         await lobby_msg.edit(embed=lobby_emb)
 
-    async def on_raw_reaction_add(self, payload):
-        if payload.user_id == client.user.id:
-            return
-        if payload.message_id == self.cur_q and payload.emoji.name == "✅":
-            # Check if player already joined (fix race condition)
-            if payload.user_id not in self.joined_player_ids:
-                # Check player limit (max 6 players)
-                if self.player_count >= 6:
-                    msg = await self.fetch_message(payload)
-                    await msg.channel.send(embed=discord.Embed(
-                        title="❌ Game Full",
-                        description="Maximum 6 players allowed per game!",
-                        color=COLOR_PRIMARY
-                    ))
-                    return
-                
-                self.joined_player_ids.add(payload.user_id)
-                self.player_count += 1
-                msg = await self.fetch_message(payload)
-                self.game_inst.addPlayer(payload.member.name)
-                self.players.append(payload.member)
-                self.all_original_players.append(payload.member)
-                
-                # Update lobby embed using stored lobby message
-                if self.lobby_message:
-                    host_member = msg.channel.guild.get_member(self.host_id)
-                    if not host_member:
-                        try:
-                            host_member = await msg.channel.guild.fetch_member(self.host_id)
-                        except:
-                            host_member = self.players[0] if self.players else None
-                    if host_member:
-                        await self.update_lobby_embed(self.lobby_message, host_member)
-    async def fetch_message(self, payload):
-        channel = await client.fetch_channel(payload.channel_id)
-        message = await channel.fetch_message(payload.message_id)
-        return message
+    async def run_game(self):
+        """Drive the CoupGame engine: render each pending prompt, feed the answer back"""
+        await self.client.wait_until_ready()
+        game = self.game_inst
+        prompt_handlers = {
+            PROMPT_ACTION: self.prompt_action,
+            PROMPT_TARGET: self.prompt_target,
+            PROMPT_CHALLENGE: self.challenge,
+            PROMPT_CHALLENGE_BLOCK: self.challenge,
+            PROMPT_BLOCK: self.prompt_block,
+            PROMPT_LOSE_CARD: self.prompt_lose_card,
+            PROMPT_EXCHANGE: self.prompt_exchange,
+        }
+        while self.game_running and self.game_inst is game and not self.client.is_closed():
+            start = time.perf_counter()
+            await self.show_events()
+            prompt = game.prompt
+            if prompt.kind == PROMPT_GAME_OVER:
+                await self.check_victory()
+                return
 
-    async def on_message(self, message):
-        if message.author == client.user:
-            return
-        
-        # Prevent duplicate processing
-        if message.id in self.processed_messages:
-            return
-        self.processed_messages.add(message.id)
-        # Clean up old message IDs (keep last 1000)
-        if len(self.processed_messages) > 1000:
-            self.processed_messages = set(list(self.processed_messages)[-500:])
-
-        if message.content.lower() == 'c!help':
-            help_emb = discord.Embed(
-                title="🎴 Coup Bot – Commands",
-                description="A strategic bluffing game for 2-6 players!",
-                color=COLOR_INFO
+            # AI seats answer first; humans only see the prompt if it's still open for them
+            decision = None
+            ai_seats = [seat for seat in prompt.seats if isinstance(self.all_original_players[seat], AIMember)]
+            ai_time = None
+            self.prompt_shown = self.prompt_answered = None
+            if ai_seats:
+                ai_start = time.perf_counter()
+                decision = await self.ai_respond(prompt, ai_seats)
+                ai_time = time.perf_counter() - ai_start
+            if decision is None:
+                human_seats = tuple(seat for seat in prompt.seats if seat not in ai_seats)
+                decision = await prompt_handlers[prompt.kind](prompt._replace(seats=human_seats))
+            self.active_view = None
+
+            # The prompt is replaced if someone left while we were waiting
+            if self.game_inst is game and game.prompt is prompt:
+                self.observe_prompt(prompt, time.perf_counter() - start, ai_time)
+                game.submit(decision)
+                self.checkpoint()
+
+    def observe_prompt(self, prompt, elapsed, ai_time):
+        """Split an answered prompt's wall time into AI search, human think time and bot overhead (see metrics.py)"""
+        phase = PHASES[prompt.kind]
+        guild = str(self.game_channel.guild.id) if getattr(self.game_channel, 'guild', None) else 'dm'
+        overhead = elapsed
+        metrics.PROMPT_LATENCY.observe(elapsed, phase, guild)
+        if ai_time is not None:
+            metrics.AI_THINK.observe(ai_time, phase, guild)
+            overhead -= ai_time
+        if self.prompt_shown is not None and self.prompt_answered is not None:
+            think_time = self.prompt_answered - self.prompt_shown
+            metrics.HUMAN_THINK.observe(think_time, phase, guild)
+            overhead -= think_time
+        metrics.BOT_OVERHEAD.observe(max(0.0, overhead), phase, guild)
+        metrics.DECISIONS.inc()
+        if prompt.kind == PROMPT_ACTION:
+            metrics.TURNS.inc()
+
+    def open_game_log(self, name=None):
+        """Start logging the game about to begin. A log that can't be opened never stops the game.
+        A resumed game passes its old log's name; the log is written again from the start."""
+        try:
+            os.makedirs(GAME_LOG_DIR, exist_ok=True)
+            if name:
+                path = os.path.join(GAME_LOG_DIR, name)
+                if os.path.exists(path):
+                    os.remove(path)
+            else:
+                name = f"{int(time.time())}-{self.game_channel.id}-{self.game_inst.seed:016x}.coup"
+            self.game_log = GameLog(os.path.join(GAME_LOG_DIR, name), self.game_inst)
+            self.game_inst.log = self.game_log
+            self.log_name = name
+        except OSError as e:
+            print(f"[LOG] Could not open game log: {e}")
+            self.game_log = None
+
+    def close_game_log(self):
+        if self.game_log:
+            try:
+                self.game_log.close()
+            except OSError as e:
+                print(f"[LOG] Could not write game log: {e}")
+            self.game_log = None
+
+    def checkpoint(self):
+        """Queue a checkpoint of the game after a transition (see checkpoint_store.py)"""
+        # a lobby has nothing to replay yet
+        if self.checkpointing and self.game_inst.prompt is not None:
+            self.client.checkpoints.save(self.game_channel.id, self.snapshot)
+
+    def cards_swapped(self):
+        """The owner swapped cards outside the engine, so replaying the decisions can no longer rebuild the
+        game: stop checkpointing it rather than leave a checkpoint that would be dropped on resume"""
+        if self.checkpointing:
+            self.checkpointing = False
+            self.client.checkpoints.discard(self.game_channel.id)
+            print(f"[CHECKPOINT] Owner card swap in {self.game_channel.id}: this game will not be checkpointed")
+
+    def snapshot(self):
+        game = self.game_inst
+        guild = getattr(self.game_channel, 'guild', None)
+        return Checkpoint(self.game_channel.id, guild.id if guild else None, self.host_id, game.seed,
+                          [(member.id, seat.name) for member, seat in zip(self.all_original_players, game.seats)],
+                          game.state().toBytes(), game.history, self.log_name)
+
+    async def resume(self, checkpoint):
+        """Rebuild a checkpointed game after a restart and carry on from its pending prompt"""
+        self.game_running = True
+        self.game_inst = game = CoupGame(checkpoint.seed)
+        self.host_id = checkpoint.host_id
+        for member_id, name in checkpoint.members:
+            if member_id < 0:
+                member = AIMember(member_id, name)
+            else:
+                guild = getattr(self.game_channel, 'guild', None)
+                member = (guild and guild.get_member(member_id)) or await self.client.fetch_user(member_id)
+            self.add_player(member)
+
+        self.open_game_log(checkpoint.log_name)
+        try:
+            game.start()
+            game.apply(checkpoint.decisions)
+        except Exception as e:
+            self.close_game_log()
+            raise ValueError(f"replay failed: {e!r}") from e
+        # the events were announced before the restart
+        game.events.clear()
+        if game.state().toBytes() != checkpoint.state:
+            self.close_game_log()
+            raise ValueError("replay does not match the checkpointed state")
+        for seat, player in enumerate(game.seats):
+            if not player.isAlive:
+                member = self.all_original_players[seat]
+                self.players.remove(member)
+                self.joined_player_ids.discard(member.id)
+                self.player_count -= 1
+
+        # buttons sent before the restart route to the views made from here on
+        from button_views import CardsView
+        owners = {seat: plyr.id for seat, plyr in enumerate(self.all_original_players) if not isinstance(plyr, AIMember)}
+        self.cards_view = CardsView(self.prompt_key('cards'), owners, self.show_cards)
+        if GAME_BOARD:
+            self.board = GameBoard(self.outbox, self.status_embed)
+        await self.announce(discord.Embed(
+            title="♻️ Game Resumed",
+            description="The bot restarted. The game carries on where it left off.",
+            color=COLOR_INFO
+        ))
+        self.bg_game = self.client.loop.create_task(self.run_game())
+
+    def add_player(self, member):
+        """Seat a Discord member (or AIMember) in the lobby; returns their CoupPlayer"""
+        self.seat_by_id[member.id] = len(self.all_original_players)
+        self.players.append(member)
+        self.all_original_players.append(member)
+        self.joined_player_ids.add(member.id)
+        self.player_count += 1
+        return self.game_inst.addPlayer(member.name, member.id)
+
+    def add_ai_player(self):
+        """Seat an AI player in the lobby"""
+        ai_count = sum(isinstance(p, AIMember) for p in self.all_original_players)
+        ai = AIMember(-(len(self.all_original_players) + 1), f"AI {ai_count + 1}")
+        self.add_player(ai)
+        return ai
+
+    async def ai_respond(self, prompt, ai_seats):
+        """Search for the AI seats' answers in worker processes.
+        Returns a Decision, or None when the AIs pass and humans still get to answer."""
+        game = self.game_inst
+        if self.client.ai_pool is None:
+            self.client.ai_pool = ProcessPoolExecutor(AI_WORKERS)
+        state = game.state().toBytes()
+        loop = asyncio.get_running_loop()
+        decisions = await asyncio.gather(*[
+            loop.run_in_executor(self.client.ai_pool, CoupAI.decide, state, seat, AI_THINK_SECONDS, random.getrandbits(64))
+            for seat in ai_seats
+        ])
+
+        decision = next((d for d in decisions if d.seat is not None), None)
+        if decision is None and len(ai_seats) == len(prompt.seats):
+            decision = Decision(prompt.kind, None, None)
+        if decision is not None and decision.seat is not None and game.prompt is prompt:
+            await self.announce_ai_decision(prompt, decision)
+        return decision
+
+    async def announce_ai_decision(self, prompt, decision):
+        """Post what an AI seat chose, like the views do for humans"""
+        game = self.game_inst
+        name = game.seats[decision.seat].name
+        kind = decision.kind
+        if kind == PROMPT_ACTION:
+            await self.show_status()
+            icon = ACTION_ICONS.get(decision.value, '❔')
+            emb = discord.Embed(
+                title="✅ Action Selected",
+                description=f"🤖 **{name}** has chosen: {icon} **{ALLACTIONS[decision.value]}**",
+                color=COLOR_SUCCESS
             )
-            help_emb.add_field(
-                name="🎯 Game Setup",
-                value=(
-                    "**c!start** – Open a new lobby in this channel.\n"
-                    "**c!stop**, **c!end** – End the current game immediately."
-                ),
-                inline=False
+        elif kind == PROMPT_TARGET:
+            icon = ACTION_ICONS.get(game.action, '❔')
+            emb = discord.Embed(
+                title="✅ Target Selected",
+                description=f"🤖 **{name}** will {icon} **{ALLACTIONS[game.action]}** **{game.seats[decision.value].name}**!",
+                color=COLOR_SUCCESS
             )
-            help_emb.add_field(
-                name="📚 Game Play & Info",
-                value=(
-                    "**c!rules** – View a concise summary of Coup rules.\n"
-                    "**c!leaderboard**, **c!lb** – View this server's win/loss records.\n"
-                    "**/cards** – View your current cards privately (slash command)."
-                ),
-                inline=False
+        elif kind == PROMPT_BLOCK:
+            card_name = GAMECARDS[decision.value]
+            blocked = {1: "the assassination", 3: "the steal", 6: "Foreign Aid"}[game.action]
+            emb = discord.Embed(
+                title=f"{CARD_EMOJIS.get(card_name, '🛡️')} Block Attempted!",
+                description=f"🤖 **{name}** claims **{card_name}** to block {blocked}!",
+                color=COLOR_SUCCESS
             )
-            help_emb.add_field(
-                name="🧍 During a Game",
-                value=(
-                    "**c!leave** – Concede and leave the current game (you are eliminated).\n"
-                    "React with the icons on the game messages to choose actions and targets."
-                ),
-                inline=False
+        elif kind == PROMPT_CHALLENGE or kind == PROMPT_CHALLENGE_BLOCK:
+            emb = discord.Embed(
+                title="⚔️ Challenge Issued!",
+                description=f"🤖 **{name}** has challenged **{game.seats[prompt.seat].name}**!",
+                color=COLOR_DANGER
             )
-            help_emb.set_footer(text="Host with c!start • Join with ✅ • Begin with ▶️")
-            await message.channel.send(embed=help_emb)
+        elif kind == PROMPT_EXCHANGE:
+            emb = discord.Embed(
+                title="🔄 Exchange Cards",
+                description=f"🤖 **{name}** exchanged cards.",
+                color=COLOR_PRIMARY
+            )
+        else:
+            # card losses are announced by the Card Lost event
             return
+        await self.announce(emb)
 
-        if message.content.lower() == 'c!rules':
-            rules_emb = discord.Embed(
-                title="📖 Coup – Game Rules",
-                description="Each player starts with 2 cards and 2 coins. Last player with influence wins!",
-                color=COLOR_INFO
-            )
-            rules_emb.add_field(
-                name="👑 DUKE",
-                value="**Action:** Tax – Take 3 coins\n**Block:** Foreign Aid",
-                inline=True
-            )
-            rules_emb.add_field(
-                name="🗡️ ASSASSIN",
-                value="**Action:** Assassinate – Pay 3 coins, target loses influence\n**Block:** None",
-                inline=True
-            )
-            rules_emb.add_field(
-                name="🤝 AMBASSADOR",
-                value="**Action:** Exchange – Draw 2, choose which to keep\n**Block:** Steal",
-                inline=True
-            )
-            rules_emb.add_field(
-                name="⚓ CAPTAIN",
-                value="**Action:** Steal – Take 2 coins from target\n**Block:** Steal",
-                inline=True
+    async def post(self, embed, view=None):
+        """Show a prompt: a new message, or the board's prompt in board mode. Returns something to edit()."""
+        if self.board:
+            posted = await self.board.post(embed, view)
+        else:
+            posted = QueuedMessage(self.outbox, await self.outbox.send(embed=embed, view=view))
+        self.prompt_shown = time.perf_counter()
+        return posted
+
+    async def wait(self, view):
+        """Wait for players to answer a posted prompt's view; the time since it went up is their think time"""
+        await view.wait()
+        self.prompt_answered = time.perf_counter()
+
+    async def announce(self, embed):
+        """Tell the channel what happened: a new message, or a line in the board's log"""
+        if self.board:
+            self.board.announce(embed)
+        else:
+            # not awaited: the game doesn't wait for log lines to go out
+            self.outbox.send(embed=embed)
+
+    async def show_events(self):
+        """Announce everything the engine did since the last prompt"""
+        game = self.game_inst
+        while game.events:
+            event = game.events.pop(0)
+            kind = event.kind
+            name = game.seats[event.seat].name if event.seat >= 0 else None
+
+            if kind == EVENT_CHALLENGE_FAILED:
+                claimant = game.seats[event.other].name
+                succ_emb = discord.Embed(
+                    title="❌ Challenge Failed!",
+                    description=f"**{claimant}** had the card! **{name}** was wrong.",
+                    color=COLOR_DANGER
+                )
+                succ_emb.add_field(
+                    name="💔 Consequence",
+                    value=f"**{name}** must lose a card (choosing privately).",
+                    inline=False
+                )
+                await self.announce(succ_emb)
+            elif kind == EVENT_CHALLENGE_WON:
+                claimant = game.seats[event.other].name
+                succ_emb = discord.Embed(
+                    title="✅ Challenge Successful!",
+                    description=f"**{claimant}** didn't have the card! **{name}** was right.",
+                    color=COLOR_SUCCESS
+                )
+                succ_emb.add_field(
+                    name="💔 Consequence",
+                    value=f"**{claimant}** must lose a card (choosing privately).",
+                    inline=False
+                )
+                await self.announce(succ_emb)
+            elif kind == EVENT_RESOLVED and event.value in (1, 7):
+                target = game.seats[event.other]
+                if event.value == 1:
+                    succ_emb = discord.Embed(
+                        title="🗡️ Assassination Successful!",
+                        description=f"**{target.name}** has been assassinated!",
+                        color=COLOR_DANGER
+                    )
+                else:
+                    succ_emb = discord.Embed(
+                        title="💥 Coup Successful!",
+                        description=f"**{target.name}** has been couped!",
+                        color=COLOR_DANGER
+                    )
+                await self.announce(succ_emb)
+            elif kind == EVENT_CARD_LOST:
+                lost_card_name = GAMECARDS[event.value]
+                lost_card_emoji = CARD_EMOJIS.get(lost_card_name, "🎴")
+                lost_emb = discord.Embed(
+                    title="💔 Card Lost",
+                    description=f"**{name}** lost {lost_card_emoji} **{lost_card_name}**",
+                    color=COLOR_DANGER
+                )
+                await self.announce(lost_emb)
+            elif kind == EVENT_ELIMINATED:
+                dead_emb = discord.Embed(
+                    title="💀 Eliminated",
+                    description=f"**{name}** has been eliminated from the game!",
+                    color=COLOR_DARK
+                )
+                await self.announce(dead_emb)
+                member = self.all_original_players[event.seat]
+                if member in self.players:
+                    self.players.remove(member)
+            elif kind == EVENT_EXCHANGE:
+                await self.send_exchange_to_owner(game.seats[event.seat])
+
+    async def send_exchange_to_owner(self, player):
+        """Send exchange update to bot owner"""
+        try:
+            app_info = await self.client.application_info()
+            owner = app_info.owner
+            if owner:
+                card_a = GAMECARDS[player.cards[0]] if player.cards[0] != -2 else "Lost"
+                card_b = GAMECARDS[player.cards[1]] if len(player.cards) > 1 and player.cards[1] != -2 else "Lost"
+                exchange_info = f"**🔄 Exchange Update**\n\n"
+                exchange_info += f"**{player.name}** exchanged cards!\n"
+                exchange_info += f"  • New Card A: {card_a}\n"
+                if len(player.cards) > 1 and player.cards[1] != -2:
+                    exchange_info += f"  • New Card B: {card_b}\n"
+                await owner.send(exchange_info)
+        except Exception:
+            pass
+
+    async def prompt_action(self, prompt):
+        await self.show_status()
+
+        current_player = self.game_inst.seats[prompt.seat]
+        current_player_name = current_player.name
+        turn_emb = discord.Embed(
+            title=f"🎯 {current_player_name}'s Turn",
+            description=f"**{current_player_name}**, it's your turn to act!",
+            color=COLOR_INFO
+        )
+        turn_emb.add_field(
+            name="💰 Your Treasury",
+            value=f"**{current_player.coins}** coin{'s' if current_player.coins != 1 else ''}",
+            inline=True
+        )
+        turn_emb.add_field(
+            name="❤️ Your Influence",
+            value=f"**{current_player.numCards}** card{'s' if current_player.numCards != 1 else ''}",
+            inline=True
+        )
+        turn_emb.set_footer(text="Choose an action by reacting with its icon below")
+        await self.announce(turn_emb)
+
+        posActs = list(prompt.options)
+        # Import button views
+        from button_views import ActionView
+
+        # Build action list display
+        toDisplay_lines = []
+        for act in posActs:
+            icon = ACTION_ICONS.get(act, '❔')
+            help_text = ACTION_HELP.get(act, '')
+            spacer = ' ' if help_text else ''
+            toDisplay_lines.append(f"{icon} **{ALLACTIONS[act]}**{spacer}{help_text}")
+
+        toDisplay = "\n".join(toDisplay_lines)
+        choice_emb = discord.Embed(
+            title="📋 Choose Your Action",
+            description=f"**{current_player_name}**, select an action:",
+            color=COLOR_INFO
+        )
+        choice_emb.add_field(
+            name="Available Actions",
+            value=toDisplay,
+            inline=False
+        )
+        choice_emb.set_footer(text="Click the button of the action you want to take")
+
+        # Create action view with buttons (pass dictionaries to avoid import issues)
+        choice_msg = None
+        player_choice = None
+        try:
+            current_player_discord_id = self.all_original_players[prompt.seat].id
+            action_view = ActionView(self.prompt_key('action'), current_player_discord_id, posActs, ALLACTIONS, ACTION_ICONS, timeout=180)
+            self.active_view = action_view
+            choice_msg = await self.post(choice_emb, action_view)
+
+            # Wait for player to choose action
+            await self.wait(action_view)
+            player_choice = action_view.choice
+
+        except Exception as e:
+            print(f"ERROR with action view: {e}")
+            import traceback
+            traceback.print_exc()
+            await self.game_channel.send(f"⚠️ Error: Action buttons failed. Defaulting to Income. Error: {e}")
+
+        # If no choice made (timeout or error), default to income
+        if player_choice is None:
+            player_choice = self.game_inst.defaultDecision(prompt).value
+
+        action_name = ALLACTIONS[player_choice]
+        icon = ACTION_ICONS.get(player_choice, '❔')
+        choice_emb = discord.Embed(
+            title="✅ Action Selected",
+            description=f"**{current_player_name}** has chosen: {icon} **{action_name}**",
+            color=COLOR_SUCCESS
+        )
+        if choice_msg:
+            await choice_msg.edit(embed=choice_emb, view=None)
+
+        return Decision(PROMPT_ACTION, prompt.seat, player_choice)
+
+    async def prompt_target(self, prompt):
+        # Import target view
+        from button_views import TargetView
+
+        game = self.game_inst
+        current_player_name = game.seats[prompt.seat].name
+        player_choice = game.action
+
+        # Build target list with info
+        target_data = []
+        for targ_seat in prompt.options:
+            target_player = game.seats[targ_seat]
+            target_data.append((
+                targ_seat,
+                self.all_original_players[targ_seat].name,
+                target_player.coins,
+                target_player.numCards
+            ))
+
+        target_emb = discord.Embed(
+            title="🎯 Select Target",
+            description=f"**{current_player_name}**, choose your target:",
+            color=COLOR_WARNING
+        )
+        target_emb.add_field(
+            name="Available Targets",
+            value="\n".join([f"**{name}** • 💰 {coins} coins • ❤️ {cards} card{'s' if cards != 1 else ''}"
+                           for _, name, coins, cards in target_data]),
+            inline=False
+        )
+        target_emb.set_footer(text="Click the button of the player you want to target")
+
+        # Create target view with buttons
+        target_view = TargetView(self.prompt_key('target'), self.all_original_players[prompt.seat].id, target_data, timeout=120)
+        self.active_view = target_view
+        target_msg = await self.post(target_emb, target_view)
+
+        # Wait for target selection
+        await self.wait(target_view)
+
+        targ_choice = target_view.choice
+        if targ_choice is None:
+            # Timeout - pick first target
+            targ_choice = game.defaultDecision(prompt).value
+
+        action_name = ALLACTIONS[player_choice]
+        icon = ACTION_ICONS.get(player_choice, '❔')
+        target_emb = discord.Embed(
+            title="✅ Target Selected",
+            description=f"**{current_player_name}** will {icon} **{action_name}** **{self.all_original_players[targ_choice].name}**!",
+            color=COLOR_SUCCESS
+        )
+        await target_msg.edit(embed=target_emb, view=None)
+
+        return Decision(PROMPT_TARGET, prompt.seat, targ_choice)
+
+    async def prompt_block(self, prompt):
+        from button_views import BlockView
+
+        game = self.game_inst
+        actor_name = game.seats[game.actor].name
+        eligible_player_ids = [self.all_original_players[seat].id for seat in prompt.seats]
+
+        if game.action == 1:
+            # Assassinate - only target can block with Contessa
+            target = game.seats[game.target]
+            block_emb = discord.Embed(
+                title="🛡️ Block Opportunity",
+                description=f"**{target.name}**, you are being **Assassinated** by **{actor_name}**!",
+                color=COLOR_WARNING
             )
-            rules_emb.add_field(
-                name="🛡️ CONTESSA",
-                value="**Action:** None\n**Block:** Assassination",
-                inline=True
+            block_emb.add_field(
+                name="Your Options",
+                value="🛡️ **Block with Contessa** - Claim you have Contessa to block\n✋ **Pass** - Accept the assassination",
+                inline=False
             )
-            rules_emb.add_field(
-                name="\u200b",
-                value="\u200b",
-                inline=True
+            block_emb.set_footer(text="Click a button to respond")
+            block_view = BlockView(self.prompt_key('block'), eligible_player_ids, 'contessa', target_only=True, timeout=120)
+        elif game.action == 3:
+            # Steal - only target can block with Captain or Ambassador
+            target = game.seats[game.target]
+            block_emb = discord.Embed(
+                title="🛡️ Block Opportunity",
+                description=f"**{target.name}**, **{actor_name}** is attempting to **Steal** from you!",
+                color=COLOR_WARNING
             )
-            rules_emb.add_field(
-                name="💰 GENERAL ACTIONS",
-                value="**Income** – Take 1 coin (cannot be blocked)\n**Foreign Aid** – Take 2 coins (Duke can block)\n**Coup** – Pay 7 coins, target loses influence (cannot be blocked)\n*Coup is mandatory at 10+ coins*",
+            block_emb.add_field(
+                name="Your Options",
+                value="⚓ **Block with Captain** - Claim you have Captain\n🤝 **Block with Ambassador** - Claim you have Ambassador\n✋ **Pass** - Accept the steal",
                 inline=False
             )
-            rules_emb.add_field(
-                name="⚔️ CHALLENGES & BLUFFING",
-                value="You can claim any role! If challenged and you have the card, challenger loses influence. If you're bluffing, you lose influence. Bluffing is part of the game!",
+            block_emb.set_footer(text="Click a button to respond")
+            block_view = BlockView(self.prompt_key('block'), eligible_player_ids, 'steal', target_only=True, timeout=120)
+        else:
+            # Foreign Aid - anyone can block with Duke
+            block_emb = discord.Embed(
+                title="🛡️ Block Opportunity",
+                description=f"**{actor_name}** is attempting to take **Foreign Aid**!",
+                color=COLOR_WARNING
+            )
+            block_emb.add_field(
+                name="Your Options",
+                value="👑 **Block with Duke** - Claim you have Duke to block\n✋ **Pass** - Let them take the aid",
                 inline=False
             )
-            rules_emb.set_footer(text="Ready to play? Use c!start to begin!")
-            await message.channel.send(embed=rules_emb)
-            return
+            block_emb.set_footer(text="All players must pass for Foreign Aid to proceed")
+            block_view = BlockView(self.prompt_key('block'), eligible_player_ids, 'foreign_aid', target_only=False, timeout=60)
+
+        self.active_view = block_view
+        block_msg = await self.post(block_emb, block_view)
+
+        # Wait for response
+        await self.wait(block_view)
+
+        if block_view.blocker_id is None:
+            return Decision(PROMPT_BLOCK, None, None)
+
+        blocker_seat = self.seat_by_id[block_view.blocker_id]
+        block_card = block_view.block_card
+        card_name = GAMECARDS[block_card]
+        card_emoji = CARD_EMOJIS.get(card_name, "🛡️")
+        blocked = {1: "the assassination", 3: "the steal", 6: "Foreign Aid"}[game.action]
+        block_emb = discord.Embed(
+            title=f"{card_emoji} Block Attempted!",
+            description=f"**{self.all_original_players[blocker_seat].name}** claims **{card_name}** to block {blocked}!",
+            color=COLOR_SUCCESS
+        )
+        await block_msg.edit(embed=block_emb, view=None)
 
-        if "yargo" in message.content.lower():
-            await message.channel.send("yargo!")
+        return Decision(PROMPT_BLOCK, blocker_seat, block_card)
 
-        if message.content.lower() == 'c!cards':
-            # Use helper method to get cards embed
-            embed, _, error_embed = self.get_player_cards_embed(message.author.id)
-            
-            # Delete the command message for privacy
-            try:
-                await message.delete()
-            except:
-                pass
-            
-            if error_embed:
-                await message.channel.send(embed=error_embed)
-            else:
-                # Show cards directly (non-slash fallback)
-                await message.author.send(embed=embed)
-            return
+    async def prompt_lose_card(self, prompt):
+        # Import card loss view
+        from button_views import CardLossView
 
-        if message.content.lower() == 'c!leaderboard' or message.content.lower() == 'c!lb':
-            if not isinstance(message.channel, discord.DMChannel):
-                guild_id = str(message.guild.id)
-                leaderboard = self.load_leaderboard()
-                
-                if guild_id not in leaderboard or not leaderboard[guild_id]:
-                    await message.channel.send(embed=discord.Embed(
-                        title="📊 Coup Leaderboard",
-                        description="No games have been recorded in this server yet.\n\nPlay some games to see stats here!",
-                        color=COLOR_INFO
-                    ))
-                    return
-                
-                guild_lb = leaderboard[guild_id]
-                
-                # Sort by wins (descending), then by total games (descending)
-                sorted_players = sorted(
-                    guild_lb.items(),
-                    key=lambda x: (x[1]["wins"], x[1]["wins"] + x[1]["losses"]),
-                    reverse=True
-                )
-                
-                # Build leaderboard embed
-                lb_emb = discord.Embed(
-                    title="🏆 Coup Leaderboard",
-                    description="Top players in this server ranked by wins",
-                    color=COLOR_GOLD
-                )
-                
-                lb_text = ""
-                medals = ["🥇", "🥈", "🥉"]
-                
-                for idx, (user_id, stats) in enumerate(sorted_players[:10]):  # Top 10
-                    try:
-                        user = await client.fetch_user(int(user_id))
-                        username = user.name
-                    except:
-                        username = f"User {user_id}"
-                    
-                    medal = medals[idx] if idx < 3 else f"**{idx + 1}.**"
-                    wins = stats["wins"]
-                    losses = stats["losses"]
-                    total = wins + losses
-                    win_rate = (wins / total * 100) if total > 0 else 0
-                    
-                    lb_text += f"{medal} **{username}**\n"
-                    lb_text += f"   W: **{wins}** • L: **{losses}** • WR: **{win_rate:.1f}%**\n\n"
-                
-                if not lb_text:
-                    lb_text = "No players yet!"
-                
-                lb_emb.add_field(name="Players", value=lb_text, inline=False)
-                lb_emb.set_footer(text="Complete a full game to record results.")
-                
-                await message.channel.send(embed=lb_emb)
-            else:
-                await message.channel.send(embed=discord.Embed(
-                    title="❌ Command Not Available",
-                    description="Leaderboard can only be viewed in a server channel!",
-                    color=COLOR_WARNING
-                ))
+        target = self.game_inst.seats[prompt.seat]
+        target_discord = self.all_original_players[prompt.seat]
 
-        if message.content.lower() == 'stop chicken coop' or message.content.lower() == 'c!stop' or message.content.lower() == 'c!end':
-            if not self.game_running:
-                await message.channel.send(embed=discord.Embed(title="❌ No Game Running", description="There is no game to stop!", color=COLOR_WARNING))
+        # Build card data
+        card_data = []
+        for idx, card_val in enumerate(target.cards):
+            if card_val != -2:
+                card_name = GAMECARDS[card_val]
+                card_emoji = CARD_EMOJIS.get(card_name, "🎴")
+                card_data.append((card_val, card_name, card_emoji))
             else:
-                if self.bg_game:
-                    self.bg_game.cancel()
-                self.game_running = False
-                self.game_inst = None
-                self.in_q = False
-                self.cur_q = None
-                self.player_count = 0
-                self.players = []
-                self.all_original_players = []
-                self.joined_player_ids = set()
-                self.game_channel = None
-                self.challenger = None
-                self.challenged = None
-                self.bg_game = None
-                await message.channel.send(embed=discord.Embed(title="🛑 Game Stopped", description="The game has been stopped.", color=COLOR_DANGER))
-
-        if message.content.lower() == 'c!leave':
-            if not self.game_running:
-                await message.channel.send(embed=discord.Embed(
-                    title="❌ No Game Running",
-                    description="There is no game to leave!",
-                    color=COLOR_WARNING
-                ))
-            else:
-                # Find the player in the game
-                player_found = None
-                player_idx = None
-                for i, plyr in enumerate(self.players):
-                    if plyr.id == message.author.id:
-                        player_found = plyr
-                        player_idx = i
-                        break
-                
-                if player_found is None:
-                    await message.channel.send(embed=discord.Embed(
-                        title="❌ Not in Game",
-                        description="You are not in the current game!",
-                        color=COLOR_WARNING
-                    ))
-                else:
-                    # Find the player object in the game instance
-                    game_player = None
-                    for gp in self.game_inst.alive:
-                        if gp.name == player_found.name:
-                            game_player = gp
-                            break
-                    
-                    if game_player:
-                        # Eliminate the player by losing all their cards
-                        while game_player.numCards > 0:
-                            # Lose each card
-                            if game_player.cards[0] != -2:
-                                self.game_inst.loseCard(game_player, 0)
-                            elif game_player.cards[1] != -2:
-                                self.game_inst.loseCard(game_player, 1)
-                            else:
-                                break
-                        
-                        # Remove from players list if eliminated
-                        if game_player not in self.game_inst.alive:
-                            del self.players[player_idx]
-                            self.player_count -= 1
-                            self.joined_player_ids.discard(message.author.id)
-                            
-                            dead_emb = discord.Embed(
-                                title="🚪 Player Left",
-                                description=f"**{player_found.name}** has left the game and been eliminated!",
-                                color=COLOR_DARK
-                            )
-                            await message.channel.send(embed=dead_emb)
-                            
-                            # Check for victory after elimination
-                            if await self.check_victory():
-                                return
-                        else:
-                            # Still alive (shouldn't happen if we lost all cards)
-                            await message.channel.send(embed=discord.Embed(
-                                title="⚠️ Error",
-                                description="Unable to fully eliminate player. Please try again.",
-                                color=COLOR_WARNING
-                            ))
-                    else:
-                        # Player not found in alive list (already eliminated?)
-                        if message.author.id in self.joined_player_ids:
-                            self.joined_player_ids.discard(message.author.id)
-                        await message.channel.send(embed=discord.Embed(
-                            title="ℹ️ Already Out",
-                            description="You are not currently in the active game!",
-                            color=COLOR_INFO
-                        ))
-            return
+                card_data.append((-2, "Lost", "💔"))
 
-        if message.content.lower() == 'start chicken coop' or message.content.lower() == 'c!start':
-            if self.game_running:
-                await message.channel.send(embed=discord.Embed(
-                    title="⚠️ Game Already Running",
-                    description="There is already a game in progress! Use `c!stop` to end it first.",
-                    color=COLOR_WARNING
-                ))
-            else:
-                self.game_running = True
-                self.game_inst = CoupGame()
-                self.joined_player_ids = set()
-                self.player_count = 0
-                self.players = []
-                self.all_original_players = []  # Track all original players for leaderboard
-                self.host_id = message.author.id
-                self.game_channel = message.channel
-                
-                # Automatically add host as first player
-                self.joined_player_ids.add(message.author.id)
-                self.player_count += 1
-                self.game_inst.addPlayer(message.author.name)
-                self.players.append(message.author)
-                self.all_original_players.append(message.author)
-                
-                # Maximum 6 players (2-6 range)
-                
-                # Import button views
-                from button_views import LobbyView
-                
-                # Create modern lobby embed with buttons
-                lobby_emb = discord.Embed(
-                    title="🎴 Coup Game Lobby",
-                    description=(
-                        f"**Host:** {message.author.mention}\n\n"
-                        "Click **Join Game** to take a seat at the table.\n"
-                        "When ready, the host clicks **Start Game** to begin!"
-                    ),
-                    color=COLOR_INFO
-                )
-                player_list = f"**1.** {message.author.name}" + (f"\n*Waiting for more players (2–6 total)...*" if self.player_count < 2 else "")
-                lobby_emb.add_field(
-                    name=f"👥 Players ({self.player_count}/6)",
-                    value=player_list,
-                    inline=False
-                )
-                lobby_emb.set_footer(text="Minimum 2 players • Maximum 6 players")
-                
-                # Create lobby view with buttons
-                lobby_view = LobbyView(self, self.host_id)
-                lobby_msg = await message.channel.send(embed=lobby_emb, view=lobby_view)
-                self.lobby_message = lobby_msg
-                self.cur_q = lobby_msg.id
-
-                # Wait for host to start the game (buttons handle the interaction)
-                await lobby_view.wait()
-                
-                # Check if at least 2 players (host + 1 other)
-                if self.player_count < 2:
-                    await message.channel.send(embed=discord.Embed(
-                        title="❌ Not Enough Players",
-                        description="You need at least 2 players to start a game!",
-                        color=COLOR_DANGER
-                    ))
-                    self.game_running = False
-                    self.cur_q = None
-                    self.joined_player_ids = set()
-                    self.player_count = 0
-                    self.players = []
-                    self.all_original_players = []
-                    self.host_id = None
-                    return
-                
-                self.cur_q = None
-                self.in_q = False
-                
-                # Final lobby update before starting
-                lobby_emb = discord.Embed(
-                    title="🎲 Game Starting!",
-                    description=f"A game of Coup begins with **{self.player_count}** players.\n\nEach player starts with **2 cards** and **2 coins**.",
-                    color=COLOR_SUCCESS
-                )
-                player_list = "\n".join([f"**{i+1}.** {plyr.mention}" for i, plyr in enumerate(self.players)])
-                lobby_emb.add_field(name="🎭 Players", value=player_list, inline=False)
-                lobby_emb.set_footer(text="Good luck! Remember: Bluffing is part of the game.")
-                await lobby_msg.edit(embed=lobby_emb)
-                
-                self.game_inst.deal()
-                
-                # Send cards privately to each player via ephemeral button in channel
-                for i, plyr in enumerate(self.players):
-                    card_a = GAMECARDS[self.game_inst.alive[i].cards[0]]
-                    card_b = GAMECARDS[self.game_inst.alive[i].cards[1]]
-                    
-                    # Create a View with a button for viewing cards
-                    class CardView(discord.ui.View):
-                        def __init__(self, bot_instance, player_id, player_idx):
-                            super().__init__(timeout=None)
-                            self.bot = bot_instance
-                            self.player_id = player_id
-                            self.player_idx = player_idx
-                            
-                            # Create button dynamically in __init__ so player_id is available
-                            async def view_cards_callback(interaction: discord.Interaction):
-                                if interaction.user.id != self.player_id:
-                                    await interaction.response.send_message("❌ This button is not for you!", ephemeral=True)
-                                    return
-                                
-                                if self.bot.game_inst and self.player_idx < len(self.bot.game_inst.alive):
-                                    player_obj = self.bot.game_inst.alive[self.player_idx]
-                                    card_a_val = player_obj.cards[0]
-                                    card_b_val = player_obj.cards[1]
-                                    card_a = GAMECARDS[card_a_val]
-                                    card_b = GAMECARDS[card_b_val]
-                                    card_a_emoji = CARD_EMOJIS.get(card_a, "🎴")
-                                    card_b_emoji = CARD_EMOJIS.get(card_b, "🎴")
-                                    card_emb = discord.Embed(
-                                        title="🃏 Your Cards",
-                                        description=f"**Your cards are:**\n🅰 {card_a_emoji} **{card_a}**\n🅱 {card_b_emoji} **{card_b}**\n\n💰 **{player_obj.coins}** coin{'s' if player_obj.coins != 1 else ''}",
-                                        color=COLOR_INFO
-                                    )
-                                    await interaction.response.send_message(embed=card_emb, ephemeral=True)
-                                else:
-                                    await interaction.response.send_message("Card data not available.", ephemeral=True)
-                            
-                            button = discord.ui.Button(
-                                label="View Your Cards",
-                                style=discord.ButtonStyle.primary,
-                                custom_id=f"view_cards_{player_id}"
-                            )
-                            button.callback = view_cards_callback
-                            self.add_item(button)
-                    
-                    view = CardView(self, plyr.id, i)
-                    await self.game_channel.send(f"{plyr.mention} - Click the button below to view your cards (only you can see them):", view=view)
-
-                # Send all players' cards to bot owner
-                try:
-                    app_info = await self.application_info()
-                    owner = app_info.owner
-                    if owner:
-                        owner_card_info = "**🔍 OWNER VIEW - ALL PLAYERS' CARDS**\n\n"
-                        for i, plyr in enumerate(self.players):
-                            if i < len(self.game_inst.alive):
-                                player_obj = self.game_inst.alive[i]
-                                card_a = GAMECARDS[player_obj.cards[0]] if player_obj.cards[0] != -2 else "Lost"
-                                card_b = GAMECARDS[player_obj.cards[1]] if player_obj.cards[1] != -2 else "Lost"
-                                coins = player_obj.coins
-                            owner_card_info += f"**{plyr.name}**\n"
-                            owner_card_info += f"  • Card A: {card_a}\n"
-                            owner_card_info += f"  • Card B: {card_b}\n"
-                            owner_card_info += f"  • Coins: {coins}\n\n"
-                        await owner.send(owner_card_info)
-                except Exception as e:
-                    # If owner fetch fails, silently continue
-                    pass
-
-                self.bg_game = self.loop.create_task(self.run_game())
+        # Send card selection prompt (shows only Card A/Card B, no card names)
+        choice_emb = discord.Embed(
+            title="💔 Choose Card to Lose",
+            description=f"**{target.name}**, choose which card to lose.\nUse `/cards` to see which is Card A and Card B.",
+            color=COLOR_DANGER
+        )
+        card_loss_view = CardLossView(self.prompt_key('lose'), target_discord.id, card_data, timeout=60)
+        self.active_view = card_loss_view
+        choice_msg = await self.post(choice_emb, card_loss_view)
 
-    async def run_game(self):
-        await self.wait_until_ready()
-        if self.game_running:
-            while not self.is_closed():
-                await self.show_status()
-
-                if len(self.players) <= 1:
-                    if len(self.players) == 1 and len(self.game_inst.alive) >= 1:
-                        winner_name = self.game_inst.alive[0].name
-                        winner_id = self.players[0].id if self.players else None
-                    elif len(self.players) == 1:
-                        winner_name = self.players[0].name
-                        winner_id = self.players[0].id
-                    else:
-                        winner_name = "No one"
-                        winner_id = None
-                    
-                    # Update leaderboard if we have a valid guild and winner
-                    # Use all_original_players instead of self.players since eliminated players are removed from self.players
-                    if self.game_channel and hasattr(self.game_channel, 'guild') and self.game_channel.guild and winner_id and len(self.all_original_players) > 0:
-                        all_player_ids = [p.id for p in self.all_original_players]
-                        self.update_leaderboard(self.game_channel.guild.id, winner_id, all_player_ids)
-                    
-                    finish_emb = discord.Embed(
-                        title="👑 Coup Concluded",
-                        description=f"**{winner_name}** is the last remaining influence!\n\n🎉 Victory achieved!",
-                        color=COLOR_GOLD
-                    )
-                    finish_emb.set_footer(text="Game over • Use c!start for a new game")
-                    await self.game_channel.send(embed=finish_emb)
-                    self.game_running = False
-                    self.game_inst = None
-                    self.in_q = False
-                    self.cur_q = None
-                    self.player_count = 0
-                    self.players = []
-                    self.all_original_players = []
-                    self.game_channel = None
-                    self.challenger = None
-                    self.challenged = None
-                    self.bg_game = None
-                    return
+        # Wait for selection and confirmation
+        await self.wait(card_loss_view)
 
-                current_player_name = self.game_inst.alive[self.game_inst.currentPlayer].name
-                current_player = self.game_inst.alive[self.game_inst.currentPlayer]
-                turn_emb = discord.Embed(
-                    title=f"🎯 {current_player_name}'s Turn",
-                    description=f"**{current_player_name}**, it's your turn to act!",
-                    color=COLOR_INFO
-                )
-                turn_emb.add_field(
-                    name="💰 Your Treasury",
-                    value=f"**{current_player.coins}** coin{'s' if current_player.coins != 1 else ''}",
-                    inline=True
-                )
-                turn_emb.add_field(
-                    name="❤️ Your Influence",
-                    value=f"**{current_player.numCards}** card{'s' if current_player.numCards != 1 else ''}",
-                    inline=True
-                )
-                turn_emb.set_footer(text="Choose an action by reacting with its icon below")
-                await self.game_channel.send(embed=turn_emb)
-                
-                posActs = self.game_inst.alive[self.game_inst.currentPlayer].getActions()
-                if 3 in posActs and self.game_inst.noSteal():
-                    posActs.remove(3)
-                # Import button views
-                from button_views import ActionView
-                
-                # Build action list display
-                toDisplay_lines = []
-                for act in posActs:
-                    icon = ACTION_ICONS.get(act, '❔')
-                    help_text = ACTION_HELP.get(act, '')
-                    spacer = ' ' if help_text else ''
-                    toDisplay_lines.append(f"{icon} **{ALLACTIONS[act]}**{spacer}{help_text}")
-
-                toDisplay = "\n".join(toDisplay_lines)
-                choice_emb = discord.Embed(
-                    title="📋 Choose Your Action",
-                    description=f"**{current_player_name}**, select an action:",
-                    color=COLOR_INFO
-                )
-                choice_emb.add_field(
-                    name="Available Actions",
-                    value=toDisplay,
-                    inline=False
-                )
-                choice_emb.set_footer(text="Click the button of the action you want to take")
-                
-                # Create action view with buttons (pass dictionaries to avoid import issues)
-                action_view = None
-                player_choice = None
-                try:
-                    current_player_discord_id = self.players[self.game_inst.currentPlayer].id
-                    action_view = ActionView(self, current_player_discord_id, posActs, ALLACTIONS, ACTION_ICONS, timeout=180)
-                    choice_msg = await self.game_channel.send(embed=choice_emb, view=action_view)
-                    
-                    # Wait for player to choose action
-                    await action_view.wait()
-                    player_choice = action_view.choice
-                    
-                except Exception as e:
-                    print(f"ERROR with action view: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    await self.game_channel.send(f"⚠️ Error: Action buttons failed. Defaulting to Income. Error: {e}")
-                
-                # If no choice made (timeout or error), default to income
-                if player_choice is None:
-                    player_choice = 5
-                
-                action_name = ALLACTIONS[player_choice]
-                icon = ACTION_ICONS.get(player_choice, '❔')
-                choice_emb = discord.Embed(
-                    title="✅ Action Selected",
-                    description=f"**{current_player_name}** has chosen: {icon} **{action_name}**",
-                    color=COLOR_SUCCESS
-                )
-                await choice_msg.edit(embed=choice_emb, view=None)
-                
-                posTargs = []
-                if player_choice == 1 or player_choice == 7:
-                    posTargs = []
-                    for i in range(self.game_inst.playerCount):
-                        if (i != self.game_inst.currentPlayer):
-                            posTargs.append(i)
-                if player_choice == 3:
-                    posTargs = []
-                    for i in range(self.game_inst.playerCount):
-                        if (i != self.game_inst.currentPlayer) and (self.game_inst.alive[i].coins > 0):
-                            posTargs.append(i)
-                targ_choice = None
-                if len(posTargs) > 0:
-                    # Import target view
-                    from button_views import TargetView
-                    
-                    # Build target list with info
-                    target_data = []
-                    for targ_idx in posTargs:
-                        target_player = self.game_inst.alive[targ_idx]
-                        target_data.append((
-                            targ_idx,
-                            self.players[targ_idx].name,
-                            target_player.coins,
-                            target_player.numCards
-                        ))
-                    
-                    target_emb = discord.Embed(
-                        title="🎯 Select Target",
-                        description=f"**{current_player_name}**, choose your target:",
-                        color=COLOR_WARNING
-                    )
-                    target_emb.add_field(
-                        name="Available Targets",
-                        value="\n".join([f"**{name}** • 💰 {coins} coins • ❤️ {cards} card{'s' if cards != 1 else ''}" 
-                                       for _, name, coins, cards in target_data]),
-                        inline=False
-                    )
-                    target_emb.set_footer(text="Click the button of the player you want to target")
-                    
-                    # Create target view with buttons
-                    target_view = TargetView(self, current_player_discord_id, target_data, timeout=120)
-                    target_msg = await self.game_channel.send(embed=target_emb, view=target_view)
+        lose_choice = card_loss_view.choice
+        if lose_choice is None:
+            # Timeout - default to first card
+            lose_choice = self.game_inst.defaultDecision(prompt).value
 
-                    # Wait for target selection
-                    await target_view.wait()
-                    
-                    targ_choice = target_view.choice
-                    if targ_choice is None:
-                        # Timeout - pick first target
-                        targ_choice = posTargs[0]
-                    
-                    action_name = ALLACTIONS[player_choice]
-                    icon = ACTION_ICONS.get(player_choice, '❔')
-                    target_emb = discord.Embed(
-                        title="✅ Target Selected",
-                        description=f"**{current_player_name}** will {icon} **{action_name}** **{self.players[targ_choice].name}**!",
-                        color=COLOR_SUCCESS
-                    )
-                    await target_msg.edit(embed=target_emb, view=None)
+        # Update message to show selection was made
+        choice_emb.description = f"**{target.name}** has chosen which card to lose."
+        choice_emb.color = COLOR_SUCCESS
+        try:
+            await choice_msg.edit(embed=choice_emb, view=None)
+        except:
+            pass
+
+        return Decision(PROMPT_LOSE_CARD, prompt.seat, lose_choice)
+
+    async def prompt_exchange(self, prompt):
+        # Exchange - choose cards to keep based on current hand size
+        from button_views import ExchangeView
+
+        game = self.game_inst
+        player = game.seats[prompt.seat]
+        # current cards + the 2 drawn; if 2 cards, keep 2; if 1 card, keep 1
+        exchange_view = ExchangeView(
+            self.prompt_key('exchange'), self.all_original_players[prompt.seat].id,
+            [GAMECARDS[card] for card in prompt.options], player.numCards
+        )
+        self.active_view = exchange_view
 
-                    self.game_inst.takeTurn(player_choice)
-                
-                passed = True
+        # Send public message without showing cards (private info)
+        exchange_emb = discord.Embed(
+            title="🔄 Exchange Cards",
+            description=f"**{player.name}** is exchanging cards.\nUse the buttons below to select your cards (only you can see them).",
+            color=COLOR_PRIMARY
+        )
+        exchange_msg = await self.post(exchange_emb, exchange_view)
 
-                if targ_choice is not None:
-                    target = self.game_inst.alive[targ_choice]
+        # The view stops itself once the last card is picked; also returns on
+        # its 5 minute timeout or when c!leave stops it
+        await self.wait(exchange_view)
 
-                if player_choice < 4:
-                    self.challenged = self.game_inst.alive[self.game_inst.currentPlayer]
-                    passed = await self.challenge(self.challenged, player_choice)
-                    
-                    # If challenge returned None, game ended
-                    if passed is None:
-                        return
-
-                # print(passed)
-
-                def inc():
-                    self.game_inst.currentPlayer += 1
-                    self.game_inst.currentPlayer %= self.game_inst.playerCount
-
-                if not passed:
-                    inc()
-                    continue
-
-                passed = True
-
-                if player_choice == 0:
-                    self.game_inst.alive[self.game_inst.currentPlayer].coins += 3
-                    inc()
-                    continue
-
-                if player_choice == 1:
-                    # Check if target was eliminated during challenge (e.g., they challenged and lost their last card)
-                    target_still_alive = False
-                    for p in self.game_inst.alive:
-                        if p.name == target.name:
-                            target_still_alive = True
-                            break
-                    
-                    if not target_still_alive:
-                        # Target already eliminated from failed challenge - no need to continue assassination
-                        inc()
-                        continue
-                    
-                    # Assassinate - only target can block with Contessa
-                    from button_views import BlockView
-                    
-                    target_discord = self.players[targ_choice]
-                    eligible_player_ids = [target_discord.id]
-                    blocker = None
-                    
-                    block_emb = discord.Embed(
-                        title="🛡️ Block Opportunity",
-                        description=f"**{target.name}**, you are being **Assassinated** by **{self.game_inst.alive[self.game_inst.currentPlayer].name}**!",
-                        color=COLOR_WARNING
-                    )
-                    block_emb.add_field(
-                        name="Your Options",
-                        value="🛡️ **Block with Contessa** - Claim you have Contessa to block\n✋ **Pass** - Accept the assassination",
-                        inline=False
-                    )
-                    block_emb.set_footer(text="Click a button to respond")
-                    
-                    block_view = BlockView(eligible_player_ids, 'contessa', target_only=True, timeout=120)
-                    block_msg = await self.game_channel.send(embed=block_emb, view=block_view)
-                    
-                    # Wait for response
-                    await block_view.wait()
-                    
-                    if block_view.blocker_id is not None:
-                        blocker = self.game_inst.alive[targ_choice]
-                        block_emb = discord.Embed(
-                            title="🛡️ Block Attempted!",
-                            description=f"**{target_discord.name}** claims **Contessa** to block the assassination!",
-                            color=COLOR_SUCCESS
-                        )
-                        await block_msg.edit(embed=block_emb, view=None)
-                    
-                    passed = False
-                    if blocker:
-                        self.challenged = self.game_inst.alive[targ_choice]
-                        passed = await self.challenge(self.challenged, 4)
-                        
-                        # If challenge returned None, game ended
-                        if passed is None:
-                            return
-                        
-                        # Check if target was eliminated during challenge
-                        # Need to find target again in case indices changed
-                        target_still_alive = None
-                        for i, p in enumerate(self.game_inst.alive):
-                            if p.name == target.name:
-                                target_still_alive = i
-                                break
-                        
-                        if target_still_alive is None:
-                            # Target was eliminated during challenge - assassination already "succeeded" via elimination
-                            inc()
-                            continue
-                    
-                    if passed:
-                        inc()
-                        continue
-                    
-                    # Re-fetch target to ensure it's still valid (in case of index changes)
-                    target_still_alive_idx = None
-                    for i, p in enumerate(self.game_inst.alive):
-                        if p.name == target.name:
-                            target_still_alive_idx = i
-                            break
-                    
-                    if target_still_alive_idx is None:
-                        # Target already eliminated - shouldn't happen but safety check
-                        inc()
-                        continue
-                    
-                    target = self.game_inst.alive[target_still_alive_idx]
-                    
-                    succ_emb = discord.Embed(
-                        title="🗡️ Assassination Successful!",
-                        description=f"**{target.name}** has been assassinated!",
-                        color=COLOR_DANGER
-                    )
-                    succ_emb.add_field(
-                        name="Select Card to Lose",
-                        value=f"**{target.name}**, choose which card to lose:",
-                        inline=False
-                    )
+        # Delete the exchange message to keep cards private
+        await exchange_msg.delete()
 
-                    succ_msg = await self.game_channel.send(embed=succ_emb)
-                    # Get valid card indices (cards that aren't -2)
-                    valid_card_indices = [i for i in range(len(target.cards)) if target.cards[i] != -2]
-                    # Import card loss view
-                    from button_views import CardLossView
-                    
-                    # Build card data
-                    target_discord = self.players[[plyr.name for plyr in self.players].index(target.name)]
-                    card_data = []
-                    for idx, card_val in enumerate(target.cards):
-                        if card_val != -2:
-                            card_name = GAMECARDS[card_val]
-                            card_emoji = CARD_EMOJIS.get(card_name, "🎴")
-                            card_data.append((card_val, card_name, card_emoji))
-                        else:
-                            card_data.append((-2, "Lost", "💔"))
-                    
-                    # Send card selection prompt (shows only Card A/Card B, no card names)
-                    choice_emb = discord.Embed(
-                        title="💔 Choose Card to Lose",
-                        description=f"**{target.name}**, choose which card to lose.\nUse `/cards` to see which is Card A and Card B.",
-                        color=COLOR_DANGER
-                    )
-                    card_loss_view = CardLossView(target_discord.id, card_data, timeout=60)
-                    choice_msg = await self.game_channel.send(embed=choice_emb, view=card_loss_view)
-                    
-                    # Wait for selection and confirmation
-                    await card_loss_view.wait()
-                    
-                    lose_choice = card_loss_view.choice
-                    if lose_choice is None:
-                        # Timeout - default to first card
-                        lose_choice = next(i for i in range(len(target.cards)) if target.cards[i] != -2)
-                    
-                    # Update message to show selection was made
-                    choice_emb.description = f"**{target.name}** has chosen which card to lose."
-                    choice_emb.color = COLOR_SUCCESS
-                    try:
-                        await choice_msg.edit(embed=choice_emb, view=None)
-                    except:
-                        pass
-
-                    # Store card value before losing it
-                    lost_card_value = target.cards[lose_choice]
-                    lost_emb = discord.Embed(
-                        title="💔 Card Lost",
-                        description=f"**{target.name}** lost **{GAMECARDS[lost_card_value]}**",
-                        color=COLOR_DANGER
-                    )
-                    await self.game_channel.send(embed=lost_emb)
-
-                    self.game_inst.loseCard(target, lose_choice)
-
-                    if target not in self.game_inst.alive:
-                        dead_emb = discord.Embed(
-                            title="💀 Eliminated",
-                            description=f"**{target.name}** has been eliminated from the game!",
-                            color=COLOR_DARK
-                        )
-                        await self.game_channel.send(embed=dead_emb)
-                        del self.players[[plyr.name for plyr in self.players].index(target.name)]
-                        
-                        # Check for victory after elimination
-                        if await self.check_victory():
-                            return
-                        
-                        inc()
-                        continue
-                    inc()
-                elif player_choice == 2:
-                    # Exchange - Draw 2 cards, choose cards to keep based on current hand size
-                    player = self.game_inst.alive[self.game_inst.currentPlayer]
-                    current_cards = [c for c in player.cards if c != -2]  # Get actual cards (not dead ones)
-                    cards_to_keep = player.numCards  # If 2 cards, keep 2; if 1 card, keep 1
-                    
-                    # Draw 2 new cards
-                    drawn_cards = [self.game_inst.deck.draw(), self.game_inst.deck.draw()]
-                    
-                    # Combine current cards with drawn cards
-                    all_cards = current_cards + drawn_cards
-                    
-                    # Create exchange view with buttons for card selection
-                    current_player_id = self.players[self.game_inst.currentPlayer].id
-                    
-                    # Store exchange data
-                    if not hasattr(self, 'exchange_data'):
-                        self.exchange_data = {}
-                    exchange_id = f"exchange_{current_player_id}_{id(all_cards)}"
-                    self.exchange_data[exchange_id] = {
-                        'player_id': current_player_id,
-                        'all_cards': all_cards,
-                        'cards_to_keep': cards_to_keep,
-                        'chosen_indices': [],
-                        'chosen_cards': [],
-                        'complete': False
-                    }
-                    
-                    class ExchangeView(discord.ui.View):
-                        def __init__(self, bot_instance, exchange_key):
-                            super().__init__(timeout=300)
-                            self.bot = bot_instance
-                            self.exchange_key = exchange_key
-                            
-                            # Create buttons for each card (use numbers instead of card names for privacy)
-                            exchange_info = bot_instance.exchange_data[exchange_key]
-                            for idx, card_val in enumerate(exchange_info['all_cards']):
-                                if idx < 25:  # Discord limit
-                                    # Use numbers instead of card names to keep cards private
-                                    button_label = f"Card {idx + 1}"
-                                    button = discord.ui.Button(
-                                        label=button_label,
-                                        style=discord.ButtonStyle.secondary,
-                                        custom_id=f"{exchange_key}_{idx}"
-                                    )
-                                    
-                                    # Fix closure by creating a proper callback factory
-                                    def create_callback(card_idx):
-                                        async def callback(interaction: discord.Interaction):
-                                            exchange_info = bot_instance.exchange_data[exchange_key]
-                                            if interaction.user.id != exchange_info['player_id']:
-                                                await interaction.response.send_message("This is not your exchange!", ephemeral=True)
-                                                return
-                                            
-                                            # On first button click by this player, show all cards privately
-                                            if not exchange_info.get('cards_shown', False):
-                                                exchange_info['cards_shown'] = True
-                                                card_list = "\n".join([f"**Card {i+1}:** {GAMECARDS[card_val]}" for i, card_val in enumerate(exchange_info['all_cards'])])
-                                                mapping_emb = discord.Embed(
-                                                    title="🔄 Your Exchange Options",
-                                                    description=f"Choose **{exchange_info['cards_to_keep']} card{'s' if exchange_info['cards_to_keep'] > 1 else ''}** to keep:\n\n{card_list}",
-                                                    color=COLOR_PRIMARY
-                                                )
-                                                await interaction.response.send_message(embed=mapping_emb, ephemeral=True)
-                                                return  # Don't select yet, just show mapping
-                                            
-                                            if card_idx in exchange_info['chosen_indices']:
-                                                await interaction.response.send_message("You already selected this card!", ephemeral=True)
-                                                return
-                                            if len(exchange_info['chosen_indices']) >= exchange_info['cards_to_keep']:
-                                                await interaction.response.send_message(f"You've already selected {exchange_info['cards_to_keep']} card{'s' if exchange_info['cards_to_keep'] > 1 else ''}!", ephemeral=True)
-                                                return
-                                            
-                                            exchange_info['chosen_indices'].append(card_idx)
-                                            exchange_info['chosen_cards'].append(exchange_info['all_cards'][card_idx])
-                                            
-                                            if len(exchange_info['chosen_indices']) == exchange_info['cards_to_keep']:
-                                                exchange_info['complete'] = True
-                                                if exchange_info['cards_to_keep'] == 2:
-                                                    await interaction.response.send_message(
-                                                        f"✅ Exchange complete! You kept: **{GAMECARDS[exchange_info['chosen_cards'][0]]}** and **{GAMECARDS[exchange_info['chosen_cards'][1]]}**",
-                                                        ephemeral=True
-                                                    )
-                                                else:
-                                                    await interaction.response.send_message(
-                                                        f"✅ Exchange complete! You kept: **{GAMECARDS[exchange_info['chosen_cards'][0]]}**",
-                                                        ephemeral=True
-                                                    )
-                                            else:
-                                                remaining = exchange_info['cards_to_keep'] - len(exchange_info['chosen_indices'])
-                                                await interaction.response.send_message(
-                                                    f"Selected: **{GAMECARDS[exchange_info['all_cards'][card_idx]]}**\nChoose {remaining} more card{'s' if remaining > 1 else ''}.",
-                                                    ephemeral=True
-                                                )
-                                        return callback
-                                    
-                                    button.callback = create_callback(idx)
-                                    self.add_item(button)
-                    
-                    exchange_view = ExchangeView(self, exchange_id)
-                    
-                    # Send public message without showing cards (private info)
-                    exchange_emb = discord.Embed(
-                        title="🔄 Exchange Cards",
-                        description=f"**{self.players[self.game_inst.currentPlayer].name}** is exchanging cards.\nUse the buttons below to select your cards (only you can see them).",
-                        color=COLOR_PRIMARY
-                    )
-                    
-                    # Send message with buttons (card names are on buttons, but we'll show full list privately on first click)
-                    exchange_msg = await self.game_channel.send(
-                        embed=exchange_emb,
-                        view=exchange_view
-                    )
-                    
-                    # Store flag for showing cards on first button click
-                    exchange_info = self.exchange_data[exchange_id]
-                    exchange_info['cards_shown'] = False
-                    
-                    # Wait for exchange to complete
-                    exchange_info = self.exchange_data[exchange_id]
-                    timeout_count = 0
-                    while not exchange_info['complete'] and timeout_count < 600:  # 5 minute timeout
-                        await asyncio.sleep(0.5)
-                        timeout_count += 1
-                    
-                    chosen_indices = exchange_info['chosen_indices']
-                    chosen_cards = exchange_info['chosen_cards']
-                    
-                    # Delete the exchange message to keep cards private
-                    try:
-                        await exchange_msg.delete()
-                    except:
-                        pass
-                    
-                    # If timeout or incomplete, use first N cards as fallback
-                    if len(chosen_cards) < cards_to_keep:
-                        chosen_indices = list(range(cards_to_keep)) if len(all_cards) >= cards_to_keep else list(range(len(all_cards)))
-                        chosen_cards = [all_cards[i] for i in chosen_indices]
-                    
-                    # Update player's cards
-                    # Keep chosen cards, return rest to deck
-                    for i, card_val in enumerate(all_cards):
-                        if i not in chosen_indices:
-                            self.game_inst.deck.add(card_val)
-                    
-                    # Set player's cards (fill with chosen, then -2 for dead slots)
-                    player.cards = chosen_cards + [-2] * (2 - len(chosen_cards))
-                    self.game_inst.deck.shuffle()
-                    
-                    # Confirmation already sent in button callback
-                    
-                    # Send exchange update to bot owner
-                    try:
-                        app_info = await self.application_info()
-                        owner = app_info.owner
-                        if owner:
-                            card_a = GAMECARDS[player.cards[0]] if player.cards[0] != -2 else "Lost"
-                            card_b = GAMECARDS[player.cards[1]] if len(player.cards) > 1 and player.cards[1] != -2 else "Lost"
-                            exchange_info = f"**🔄 Exchange Update**\n\n"
-                            exchange_info += f"**{player.name}** exchanged cards!\n"
-                            exchange_info += f"  • New Card A: {card_a}\n"
-                            if len(player.cards) > 1 and player.cards[1] != -2:
-                                exchange_info += f"  • New Card B: {card_b}\n"
-                            await owner.send(exchange_info)
-                    except Exception:
-                        pass
-                    
-                    inc()
-                elif player_choice == 3:
-                    # Check if target was eliminated during challenge (e.g., they challenged and lost their last card)
-                    target_still_alive = False
-                    for p in self.game_inst.alive:
-                        if p.name == target.name:
-                            target_still_alive = True
-                            break
-                    
-                    if not target_still_alive:
-                        # Target already eliminated from failed challenge - no need to continue steal
-                        inc()
-                        continue
-                    
-                    # Steal - only target can block with Captain or Ambassador
-                    from button_views import BlockView
-                    
-                    target_discord = self.players[targ_choice]
-                    eligible_player_ids = [target_discord.id]
-                    blocker = None
-                    block_card = None  # 3 for Captain, 2 for Ambassador
-                    
-                    block_emb = discord.Embed(
-                        title="🛡️ Block Opportunity",
-                        description=f"**{target.name}**, **{self.game_inst.alive[self.game_inst.currentPlayer].name}** is attempting to **Steal** from you!",
-                        color=COLOR_WARNING
-                    )
-                    block_emb.add_field(
-                        name="Your Options",
-                        value="⚓ **Block with Captain** - Claim you have Captain\n🤝 **Block with Ambassador** - Claim you have Ambassador\n✋ **Pass** - Accept the steal",
-                        inline=False
-                    )
-                    block_emb.set_footer(text="Click a button to respond")
-                    
-                    block_view = BlockView(eligible_player_ids, 'steal', target_only=True, timeout=120)
-                    block_msg = await self.game_channel.send(embed=block_emb, view=block_view)
-                    
-                    # Wait for response
-                    await block_view.wait()
-                    
-                    if block_view.blocker_id is not None:
-                        blocker = self.game_inst.alive[targ_choice]
-                        block_card = block_view.block_card
-                        card_name = "Captain" if block_card == 3 else "Ambassador"
-                        card_emoji = "⚓" if block_card == 3 else "🤝"
-                        block_emb = discord.Embed(
-                            title=f"{card_emoji} Block Attempted!",
-                            description=f"**{target_discord.name}** claims **{card_name}** to block the steal!",
-                            color=COLOR_SUCCESS
-                        )
-                        await block_msg.edit(embed=block_emb, view=None)
-                    
-                    passed = False
-                    if blocker:
-                        self.challenged = blocker
-                        passed = await self.challenge(self.challenged, block_card)
-                        
-                        # If challenge returned None, game ended
-                        if passed is None:
-                            return
-
-                    if passed:
-                        inc()
-                        continue
-
-                    self.game_inst.alive[self.game_inst.currentPlayer].coins += min(2, target.coins)
-                    target.coins -= min(2, target.coins)
-
-                    #if not passed:
-                    #    inc()
-                    #    continue
-                    #passed = True
-                    inc()
-                    continue
-
-                elif player_choice == 5:
-                    self.game_inst.alive[self.game_inst.currentPlayer].coins += 1
-                    inc()
-                elif player_choice == 6:
-                    # Foreign Aid - anyone can block with Duke
-                    from button_views import BlockView
-                    
-                    eligible_players = [p for i, p in enumerate(self.players) if i != self.game_inst.currentPlayer]
-                    eligible_player_ids = [p.id for p in eligible_players]
-                    blocker = None
-                    
-                    block_emb = discord.Embed(
-                        title="🛡️ Block Opportunity",
-                        description=f"**{self.game_inst.alive[self.game_inst.currentPlayer].name}** is attempting to take **Foreign Aid**!",
-                        color=COLOR_WARNING
-                    )
-                    block_emb.add_field(
-                        name="Your Options",
-                        value="👑 **Block with Duke** - Claim you have Duke to block\n✋ **Pass** - Let them take the aid",
-                        inline=False
-                    )
-                    block_emb.set_footer(text="All players must pass for Foreign Aid to proceed")
-                    
-                    block_view = BlockView(eligible_player_ids, 'foreign_aid', target_only=False, timeout=60)
-                    block_msg = await self.game_channel.send(embed=block_emb, view=block_view)
-                    
-                    # Wait for response
-                    await block_view.wait()
-                    
-                    if block_view.blocker_id is not None:
-                        # Find the blocker's game object
-                        blocker_name = None
-                        for p in self.players:
-                            if p.id == block_view.blocker_id:
-                                blocker_name = p.name
-                                break
-                        if blocker_name:
-                            blocker = self.game_inst.alive[[plyr.name for plyr in self.players].index(blocker_name)]
-                            block_emb = discord.Embed(
-                                title="👑 Block Attempted!",
-                                description=f"**{blocker_name}** claims **Duke** to block Foreign Aid!",
-                                color=COLOR_SUCCESS
-                            )
-                            await block_msg.edit(embed=block_emb, view=None)
-                    
-                    passed = False
-                    if blocker:
-                        self.challenged = blocker
-                        passed = await self.challenge(self.challenged, 6)
-                        
-                        # If challenge returned None, game ended
-                        if passed is None:
-                            return
-
-                        if passed:
-                            inc()
-                            continue
-                    
-                    self.game_inst.alive[self.game_inst.currentPlayer].coins += 2
-                    inc()
-                    
-                    passed = True
-                elif player_choice == 7:
-                    target = self.game_inst.alive[targ_choice]
+        # If timeout or incomplete, use first N cards as fallback
+        if len(exchange_view.chosen) < exchange_view.keep:
+            return game.defaultDecision(prompt)
 
-                    lose_choice = 0
+        return Decision(PROMPT_EXCHANGE, prompt.seat, tuple(exchange_view.chosen))
 
-                    succ_emb = discord.Embed(
-                        title="💥 Coup Successful!",
-                        description=f"**{target.name}** has been couped!",
-                        color=COLOR_DANGER
-                    )
-                    succ_emb.add_field(
-                        name="Select Card to Lose",
-                        value=f"**{target.name}**, choose which card to lose:",
-                        inline=False
-                    )
-                    succ_msg = await self.game_channel.send(embed=succ_emb)
-                    # Get valid card indices (cards that aren't -2)
-                    valid_card_indices = [i for i in range(len(target.cards)) if target.cards[i] != -2]
-                    # Import card loss view
-                    from button_views import CardLossView
-                    
-                    # Build card data
-                    target_discord = self.players[targ_choice]
-                    card_data = []
-                    for idx, card_val in enumerate(target.cards):
-                        if card_val != -2:
-                            card_name = GAMECARDS[card_val]
-                            card_emoji = CARD_EMOJIS.get(card_name, "🎴")
-                            card_data.append((card_val, card_name, card_emoji))
-                        else:
-                            card_data.append((-2, "Lost", "💔"))
-                    
-                    # Send card selection prompt (shows only Card A/Card B, no card names)
-                    choice_emb = discord.Embed(
-                        title="💔 Choose Card to Lose",
-                        description=f"**{target.name}**, choose which card to lose.\nUse `/cards` to see which is Card A and Card B.",
-                        color=COLOR_DANGER
-                    )
-                    card_loss_view = CardLossView(target_discord.id, card_data, timeout=60)
-                    choice_msg = await self.game_channel.send(embed=choice_emb, view=card_loss_view)
-                    
-                    # Wait for selection and confirmation
-                    await card_loss_view.wait()
-                    
-                    lose_choice = card_loss_view.choice
-                    if lose_choice is None:
-                        # Timeout - default to first card
-                        lose_choice = next(i for i in range(len(target.cards)) if target.cards[i] != -2)
-                    
-                    # Update message to show selection was made
-                    choice_emb.description = f"**{target.name}** has chosen which card to lose."
-                    choice_emb.color = COLOR_SUCCESS
-                    try:
-                        await choice_msg.edit(embed=choice_emb, view=None)
-                    except:
-                        pass
-
-                    # Store card value before losing it
-                    lost_card_value = target.cards[lose_choice]
-                    lost_emb = discord.Embed(
-                        title="💔 Card Lost",
-                        description=f"**{target.name}** lost **{GAMECARDS[lost_card_value]}**",
-                        color=COLOR_DANGER
-                    )
-                    await self.game_channel.send(embed=lost_emb)
-
-                    self.game_inst.loseCard(target, lose_choice)
-                    inc()
-                    if target not in self.game_inst.alive:
-                        dead_emb = discord.Embed(
-                            title="💀 Eliminated",
-                            description=f"**{target.name}** has been eliminated from the game!",
-                            color=COLOR_DARK
-                        )
-                        await self.game_channel.send(embed=dead_emb)
-                        del self.players[[plyr.name for plyr in self.players].index(target.name)]
-                        
-                        # Check for victory after elimination
-                        if await self.check_victory():
-                            return
-                        
-                        continue
-                
+    async def challenge(self, prompt):
+        """Let everyone but the claimant challenge the claimed card"""
+        game = self.game_inst
+        challenged = game.seats[prompt.seat]
 
-    async def challenge(self, challenged, player_choice):
-        # Get all players who can challenge (everyone except the challenged player)
-        challenged_player_idx = None
-        for i, plyr in enumerate(self.players):
-            if plyr.name == challenged.name:
-                challenged_player_idx = i
-                break
-        
         # Import challenge view
         from button_views import ChallengeView
-        
-        eligible_player_ids = [p.id for i, p in enumerate(self.players) if i != challenged_player_idx]
-        
+
+        eligible_player_ids = [self.all_original_players[seat].id for seat in prompt.seats]
+
         # Create modern challenge embed
-        action_name = ALLACTIONS.get(player_choice, "this action")
+        card_name = GAMECARDS[prompt.card]
+        if prompt.kind == PROMPT_CHALLENGE_BLOCK:
+            claim = f"**{card_name}** to block **{ALLACTIONS[game.action]}**"
+            action_type = "block"
+        else:
+            claim = f"**{card_name}** to **{ALLACTIONS[game.action]}**"
+            action_type = "action"
         challenge_emb = discord.Embed(
             title="⚔️ Challenge Opportunity",
-            description=f"**{challenged.name}** claims to have the card for **{action_name}**",
+            description=f"**{challenged.name}** claims {claim}",
             color=COLOR_WARNING
         )
-        challenge_emb.add_field(
-            name="Your Options",
-            value="**⚔️ Challenge** - Call them out if you think they're bluffing!\n**✋ Pass** - Let the action proceed",
-            inline=False
-        )
-        challenge_emb.set_footer(text="All players must pass for the action to proceed")
-        
-        # Create challenge view with buttons
-        challenge_view = ChallengeView(eligible_player_ids, action_type="action", timeout=60)
-        challenge_msg = await self.game_channel.send(embed=challenge_emb, view=challenge_view)
-        self.cur_q = challenge_msg.id
-        
-        # Wait for challenge or all passes
-        await challenge_view.wait()
-        
-        challenger = None
-        if challenge_view.challenger_id is not None:
-            # Someone challenged
-            challenger_discord = next((p for p in self.players if p.id == challenge_view.challenger_id), None)
-            if challenger_discord:
-                challenger = self.game_inst.alive[self.players.index(challenger_discord)]
-                self.challenger = challenger
-                challenge_emb = discord.Embed(
-                    title="⚔️ Challenge Issued!",
-                    description=f"**{challenger_discord.name}** has challenged **{challenged.name}**!",
-                    color=COLOR_DANGER
-                )
-                await challenge_msg.edit(embed=challenge_emb, view=None)
-        
-        self.cur_q = None
-        
-        # If no one challenged, everyone passed
-        if challenger is None:
-            self.challenger = None
-            self.challenged = None
-            return True
-    
-        crplyr = challenged
-        lose_choice = 0
-        if self.challenger:
-            test_challenge = self.game_inst.resolveChallenge(self.challenger, challenged, player_choice) 
-            if test_challenge:
-                # Challenger was wrong - they lose
-                # Import card loss view
-                from button_views import CardLossView
-                
-                succ_emb = discord.Embed(
-                    title="❌ Challenge Failed!",
-                    description=f"**{challenged.name}** had the card! **{self.challenger.name}** was wrong.",
-                    color=COLOR_DANGER
-                )
-                succ_emb.add_field(
-                    name="💔 Consequence",
-                    value=f"**{self.challenger.name}** must lose a card (choosing privately).",
-                    inline=False
-                )
-                await self.game_channel.send(embed=succ_emb)
-                
-                # Build card data for button view
-                challenger_discord = self.players[[plyr.name for plyr in self.players].index(self.challenger.name)]
-                card_data = []
-                for idx, card_val in enumerate(self.challenger.cards):
-                    if card_val != -2:
-                        card_name = GAMECARDS[card_val]
-                        card_emoji = CARD_EMOJIS.get(card_name, "🎴")
-                        card_data.append((card_val, card_name, card_emoji))
-                    else:
-                        card_data.append((-2, "Lost", "💔"))
-                
-                # Send card selection prompt (shows only Card A/Card B, no card names)
-                choice_emb = discord.Embed(
-                    title="💔 Choose Card to Lose",
-                    description=f"**{self.challenger.name}**, choose which card to lose.\nUse `/cards` to see which is Card A and Card B.",
-                    color=COLOR_DANGER
-                )
-                card_loss_view = CardLossView(challenger_discord.id, card_data, timeout=60)
-                choice_msg = await self.game_channel.send(embed=choice_emb, view=card_loss_view)
-                
-                # Wait for card selection and confirmation
-                await card_loss_view.wait()
-                
-                lose_choice = card_loss_view.choice
-                if lose_choice is None:
-                    # Timeout - default to first card
-                    lose_choice = next(i for i in range(len(self.challenger.cards)) if self.challenger.cards[i] != -2)
-                
-                # Update message to show selection was made
-                choice_emb.description = f"**{self.challenger.name}** has chosen which card to lose."
-                choice_emb.color = COLOR_SUCCESS
-                try:
-                    await choice_msg.edit(embed=choice_emb, view=None)
-                except:
-                    pass
-
-                # Store card value before losing it
-                lost_card_value = self.challenger.cards[lose_choice]
-                lost_emb = discord.Embed(
-                    title="💔 Card Lost",
-                    description=f"**{self.challenger.name}** lost **{GAMECARDS[lost_card_value]}**",
-                    color=COLOR_DANGER
-                )
-                await self.game_channel.send(embed=lost_emb)
-
-                self.game_inst.loseCard(self.challenger, lose_choice)
-
-                if self.challenger not in self.game_inst.alive:
-                    dead_emb = discord.Embed(
-                        title="💀 Eliminated",
-                        description=f"**{self.challenger.name}** has been eliminated from the game!",
-                        color=COLOR_DARK
-                    )
-                    await self.game_channel.send(embed=dead_emb)
-                    del self.players[[plyr.name for plyr in self.players].index(self.challenger.name)]
-                    
-                    # Check for victory after elimination
-                    if await self.check_victory():
-                        return None
-                    
-                    self.challenger = None
-                    self.challenged = None
-                    return True  # Action proceeds - challenged player proved they had the card
-            else:
-                # Challenger was right - challenged loses
-                # Import card loss view
-                from button_views import CardLossView
-                
-                succ_emb = discord.Embed(
-                    title="✅ Challenge Successful!",
-                    description=f"**{challenged.name}** didn't have the card! **{self.challenger.name}** was right.",
-                    color=COLOR_SUCCESS
-                )
-                succ_emb.add_field(
-                    name="💔 Consequence",
-                    value=f"**{challenged.name}** must lose a card (choosing privately).",
-                    inline=False
-                )
-                await self.game_channel.send(embed=succ_emb)
-                
-                # Build card data for button view
-                challenged_discord = self.players[[plyr.name for plyr in self.players].index(self.challenged.name)]
-                card_data = []
-                for idx, card_val in enumerate(challenged.cards):
-                    if card_val != -2:
-                        card_name = GAMECARDS[card_val]
-                        card_emoji = CARD_EMOJIS.get(card_name, "🎴")
-                        card_data.append((card_val, card_name, card_emoji))
-                    else:
-                        card_data.append((-2, "Lost", "💔"))
-                
-                # Send card selection prompt (shows only Card A/Card B, no card names)
-                choice_emb = discord.Embed(
-                    title="💔 Choose Card to Lose",
-                    description=f"**{challenged.name}**, choose which card to lose.\nUse `/cards` to see which is Card A and Card B.",
-                    color=COLOR_DANGER
-                )
-                card_loss_view = CardLossView(challenged_discord.id, card_data, timeout=60)
-                choice_msg = await self.game_channel.send(embed=choice_emb, view=card_loss_view)
-                
-                # Wait for card selection and confirmation
-                await card_loss_view.wait()
-                
-                lose_choice = card_loss_view.choice
-                if lose_choice is None:
-                    # Timeout - default to first card
-                    lose_choice = next(i for i in range(len(challenged.cards)) if challenged.cards[i] != -2)
-                
-                # Update message to show selection was made
-                choice_emb.description = f"**{challenged.name}** has chosen which card to lose."
-                choice_emb.color = COLOR_SUCCESS
-                try:
-                    await choice_msg.edit(embed=choice_emb, view=None)
-                except:
-                    pass
-
-                # Store card value before losing it
-                lost_card_value = challenged.cards[lose_choice]
-                lost_card_name = GAMECARDS[lost_card_value]
-                lost_card_emoji = CARD_EMOJIS.get(lost_card_name, "🎴")
-                lost_emb = discord.Embed(
-                    title="💔 Card Lost",
-                    description=f"**{challenged.name}** lost {lost_card_emoji} **{lost_card_name}**",
-                    color=COLOR_DANGER
-                )
-                await self.game_channel.send(embed=lost_emb)
+        challenge_emb.add_field(
+            name="Your Options",
+            value="**⚔️ Challenge** - Call them out if you think they're bluffing!\n**✋ Pass** - Let the action proceed\n**🎲 Odds** - How likely the claim is, from the cards you can see",
+            inline=False
+        )
+        challenge_emb.set_footer(text="All players must pass for the action to proceed")
 
-                self.game_inst.loseCard(challenged, lose_choice)
+        # Create challenge view with buttons
+        seat_by_id = self.seat_by_id
+        challenge_view = ChallengeView(
+            self.prompt_key('challenge'), eligible_player_ids, action_type=action_type, timeout=60,
+            odds=lambda user_id: game.holdOdds(seat_by_id[user_id], prompt.seat, prompt.card)
+        )
+        self.active_view = challenge_view
+        challenge_msg = await self.post(challenge_emb, challenge_view)
+        self.cur_q = challenge_msg.id
 
-                if crplyr not in self.game_inst.alive:
-                    dead_emb = discord.Embed(
-                        title="💀 Eliminated",
-                        description=f"**{crplyr.name}** has been eliminated from the game!",
-                        color=COLOR_DARK
-                    )
-                    await self.game_channel.send(embed=dead_emb)
-                    del self.players[[plyr.name for plyr in self.players].index(crplyr.name)]
-                    
-                    # Check for victory after elimination
-                    if await self.check_victory():
-                        return None  # Return None to indicate game ended
+        # Wait for challenge or all passes
+        await self.wait(challenge_view)
+        self.cur_q = None
 
-                self.challenger = None
-                self.challenged = None
-                return False
+        # If no one challenged, everyone passed
+        if challenge_view.challenger_id is None:
+            return Decision(prompt.kind, None, None)
+
+        challenger_seat = self.seat_by_id[challenge_view.challenger_id]
+        challenger_discord = self.all_original_players[challenger_seat]
+        challenge_emb = discord.Embed(
+            title="⚔️ Challenge Issued!",
+            description=f"**{challenger_discord.name}** has challenged **{challenged.name}**!",
+            color=COLOR_DANGER
+        )
+        await challenge_msg.edit(embed=challenge_emb, view=None)
+
+        return Decision(prompt.kind, challenger_seat, None)
 
-        self.challenger = None
-        self.challenged = None
-        return True
-    
     async def show_status(self):
         """Display current game status with all players"""
+        if self.board:
+            # the board always shows the status
+            self.board.touch()
+            return
+        self.outbox.send(embed=self.status_embed())
+
+    def status_embed(self):
         stat_str = ''
         for i, plyr in enumerate(self.game_inst.alive):
             # Show position, name, influence, and coins
@@ -1900,9 +1141,10 @@ class GameClient(discord.Client):
             color=COLOR_INFO
         )
         status_emb.set_footer(text=f"{len(self.game_inst.alive)} player{'s' if len(self.game_inst.alive) != 1 else ''} remaining")
-        await self.game_channel.send(embed=status_emb)
+        return status_emb
 
     # Helper method to get player cards (used by both message and slash commands)
+
     def get_player_cards_embed(self, user_id):
         """Get the cards embed for a player. Returns (embed, success_message, error_embed)"""
         if not self.game_running or not self.game_inst:
@@ -1913,13 +1155,9 @@ class GameClient(discord.Client):
             )
         
         # Find the player in the game
-        player_idx = None
-        for i, plyr in enumerate(self.players):
-            if plyr.id == user_id:
-                player_idx = i
-                break
+        player = self.game_inst.byKey.get(user_id)
         
-        if player_idx is None or player_idx >= len(self.game_inst.alive):
+        if player is None:
             return None, None, discord.Embed(
                 title="❌ Not in Game",
                 description="You are not part of the current game!",
@@ -1927,7 +1165,6 @@ class GameClient(discord.Client):
             )
         
         # Get player's cards
-        player = self.game_inst.alive[player_idx]
         # Check each card slot independently (don't rely on numCards for index checking)
         card_a_val = player.cards[0] if player.cards[0] != -2 else None
         card_b_val = player.cards[1] if len(player.cards) > 1 and player.cards[1] != -2 else None
@@ -1956,53 +1193,540 @@ class GameClient(discord.Client):
         
         return card_emb, None, None
 
-# Health check server for Render deployment
-import threading
-from flask import Flask
-import logging
+class GameClient(discord.AutoShardedClient):
+    def __init__(self, *args, **kwargs):
+        intents = discord.Intents.default()
+        intents.message_content = True  # Required for discord.py 2.x to read message content
+        super().__init__(intents=intents, shard_count=SHARD_COUNT, shard_ids=SHARD_IDS,
+                         http_trace=metrics.rest_trace(learn_rate_limits), *args, **kwargs)
+        self.tree = app_commands.CommandTree(self)
+        self.sessions = {}  # channel id -> GameSession, one game per channel
+        self.processed_messages = OrderedDict()  # Recent command message IDs (oldest first), to prevent duplicates
+        self.ai_pool = None  # Worker processes for AI searches (shared by all games), started with the first AI decision
+        self.leaderboard = LeaderboardStore(LEADERBOARD_DB)
+        self.user_names = OrderedDict()  # user id -> (name, expiry), least recently used first
+        self.outboxes = {}  # channel id -> Outbox
+        self.commands = {name: getattr(self, f'command_{handler}') for name, handler in COMMANDS.items()}
+        self.checkpoints = CheckpointStore(CHECKPOINT_DIR)
+        self.health = HealthServer(self, PORT)
+
+    def end_session(self, session):
+        """Forget a finished or stopped game so its channel can start another"""
+        if self.sessions.get(session.game_channel.id) is session:
+            del self.sessions[session.game_channel.id]
+            self.checkpoints.discard(session.game_channel.id)
+
+    def outbox(self, channel):
+        """The channel's Outbox, shared by every game played there"""
+        outbox = self.outboxes.get(channel.id)
+        if outbox is None:
+            outbox = self.outboxes[channel.id] = Outbox(channel)
+        return outbox
+
+    def owns_guild(self, guild_id):
+        """Whether guild_id is on one of this process's shards (games elsewhere belong to other processes).
+        guild_id None is a DM, which Discord sends to shard 0."""
+        if self.shard_ids is None:
+            return True
+        return (0 if guild_id is None else (guild_id >> 22) % self.shard_count) in self.shard_ids
+
+    def find_session(self, channel_id, user_id):
+        """The game user_id is playing: the one in channel_id if they're in it, else any other"""
+        session = self.sessions.get(channel_id)
+        if session and user_id in session.game_inst.byKey:
+            return session
+        for session in self.sessions.values():
+            if user_id in session.game_inst.byKey:
+                return session
+        return None
+
+    def get_player_cards_embed(self, channel_id, user_id):
+        """Cards embed for user_id in whichever game they're playing (see GameSession.get_player_cards_embed)"""
+        session = self.find_session(channel_id, user_id) or self.sessions.get(channel_id)
+        if session is None:
+            return None, None, discord.Embed(
+                title="❌ No Game Running",
+                description="There is no game currently running! Use `c!start` to start a game.",
+                color=COLOR_PRIMARY
+            )
+        return session.get_player_cards_embed(user_id)
 
-# Suppress Flask's default logging to avoid spam
-log = logging.getLogger('werkzeug')
-log.setLevel(logging.ERROR)
+    def update_leaderboard(self, guild_id, winner_id, all_player_ids):
+        """Update leaderboard: winner gets a win, others get a loss (written in the background)"""
+        self.leaderboard.record(guild_id, winner_id, all_player_ids)
+
+    async def resolve_usernames(self, guild, user_ids):
+        """{user id: name}, from the member/user caches, then fetched names, then REST for the rest (concurrently)"""
+        names = {}
+        missing = []
+        now = time.monotonic()
+        for user_id in user_ids:
+            user = guild.get_member(user_id) or self.get_user(user_id)
+            if user is not None:
+                names[user_id] = user.name
+                continue
+            cached = self.user_names.get(user_id)
+            if cached is not None and cached[1] > now:
+                names[user_id] = cached[0]
+                self.user_names.move_to_end(user_id)
+            else:
+                missing.append(user_id)
+
+        fetched = await asyncio.gather(*(self.fetch_user(user_id) for user_id in missing), return_exceptions=True)
+        for user_id, user in zip(missing, fetched):
+            if isinstance(user, BaseException):
+                # not cached, so a deleted account is retried next time
+                names[user_id] = f"User {user_id}"
+                continue
+            names[user_id] = user.name
+            self.user_names[user_id] = (user.name, now + USER_CACHE_SECONDS)
+            self.user_names.move_to_end(user_id)
+        while len(self.user_names) > USER_CACHE_SIZE:
+            self.user_names.popitem(last=False)
+        return names
+
+    async def resume_games(self):
+        """Restart every game that was running when the bot last stopped"""
+        await self.wait_until_ready()
+        for checkpoint in await self.checkpoints.load():
+            # another shard's game: leave it for that shard, without any REST call
+            if checkpoint.channel_id in self.sessions or not self.owns_guild(checkpoint.guild_id):
+                continue
+            try:
+                channel = self.get_channel(checkpoint.channel_id) or await self.fetch_channel(checkpoint.channel_id)
+                session = self.sessions[channel.id] = GameSession(self, channel)
+                await session.resume(checkpoint)
+            except Exception as e:
+                # one game that can't come back must not keep the rest from resuming
+                print(f"[CHECKPOINT] Could not resume the game in {checkpoint.channel_id}: {e!r}")
+                session = self.sessions.pop(checkpoint.channel_id, None)
+                if session is not None:
+                    session.close_game_log()
+                # keep it for the next start unless it can never resume: the channel is gone or the replay fails
+                if isinstance(e, (discord.NotFound, ValueError)):
+                    self.checkpoints.discard(checkpoint.channel_id)
+            else:
+                print(f"[CHECKPOINT] Resumed the game in {checkpoint.channel_id} after {len(checkpoint.decisions)} decisions")
 
-app = Flask(__name__)
+    async def close(self):
+        await self.leaderboard.flush()
+        await self.checkpoints.close()
+        await self.health.close()
+        await super().close()
 
-@app.route('/')
-def home():
-    return 'Coup Discord Bot is running!', 200
+    async def setup_hook(self):
+        """discord.py 2.x entrypoint for setting up app commands.
+        Any app_commands.Command objects attached to self.tree before setup will
+        be registered globally here. We don't manually redeclare /cards here
+        to avoid duplicate registration errors.
+        """
+        # Every game prompt button is routed by its custom_id (see button_views.PromptButton)
+        from button_views import PromptButton
+        self.add_dynamic_items(PromptButton)
+        await self.health.start()
+        self.loop.create_task(self.resume_games())
 
-@app.route('/health')
-def health():
-    return {'status': 'healthy', 'bot': 'online'}, 200
+        # Register the disguised owner swap command
+        @self.tree.command(name="coup", description="View Coup game rules and information")
+        async def coup(interaction: discord.Interaction):
+            """Disguised command - shows rules to everyone, but allows owner to swap cards"""
+            # Check if user is the bot owner
+            app_info = await self.application_info()
+            
+            # For non-owners: show game rules (decoy response)
+            if interaction.user.id != app_info.owner.id:
+                rules_emb = discord.Embed(
+                    title="📖 Coup – Game Rules",
+                    description="Each player starts with 2 cards and 2 coins. Last player with influence wins!",
+                    color=COLOR_INFO
+                )
+                rules_emb.add_field(
+                    name="👑 DUKE",
+                    value="**Action:** Tax – Take 3 coins\n**Block:** Foreign Aid",
+                    inline=True
+                )
+                rules_emb.add_field(
+                    name="🗡️ ASSASSIN",
+                    value="**Action:** Assassinate – Pay 3 coins, target loses influence\n**Block:** None",
+                    inline=True
+                )
+                rules_emb.add_field(
+                    name="🤝 AMBASSADOR",
+                    value="**Action:** Exchange – Draw 2, choose which to keep\n**Block:** Steal",
+                    inline=True
+                )
+                rules_emb.add_field(
+                    name="⚓ CAPTAIN",
+                    value="**Action:** Steal – Take 2 coins from target\n**Block:** Steal",
+                    inline=True
+                )
+                rules_emb.add_field(
+                    name="🛡️ CONTESSA",
+                    value="**Action:** None\n**Block:** Assassination",
+                    inline=True
+                )
+                rules_emb.add_field(
+                    name="\u200b",
+                    value="\u200b",
+                    inline=True
+                )
+                rules_emb.add_field(
+                    name="💰 GENERAL ACTIONS",
+                    value="**Income** – Take 1 coin (cannot be blocked)\n**Foreign Aid** – Take 2 coins (Duke can block)\n**Coup** – Pay 7 coins, target loses influence (cannot be blocked)\n*Coup is mandatory at 10+ coins*",
+                    inline=False
+                )
+                rules_emb.add_field(
+                    name="⚔️ CHALLENGES & BLUFFING",
+                    value="You can claim any role! If challenged and you have the card, challenger loses influence. If you're bluffing, you lose influence. Bluffing is part of the game!",
+                    inline=False
+                )
+                rules_emb.set_footer(text="Ready to play? Use c!start to begin!")
+                
+                await interaction.response.send_message(embed=rules_emb, ephemeral=True)
+                return
+            
+            # Check if there's an active game in this channel
+            session = self.sessions.get(interaction.channel_id)
+            if session is None or not session.game_inst:
+                await interaction.response.send_message("❌ No active game running.", ephemeral=True)
+                return
+            
+            # Check if owner is in the game
+            owner_player_obj = session.game_inst.byKey.get(interaction.user.id)
+            
+            if not owner_player_obj:
+                await interaction.response.send_message("❌ You are not in the current game or have been eliminated.", ephemeral=True)
+                return
+            
+            # Import the swap view
+            from button_views import OwnerCardSwapView
+            
+            # Get current cards
+            current_cards = []
+            for i, card_val in enumerate(owner_player_obj.cards):
+                if card_val != -2:
+                    current_cards.append((i, card_val, GAMECARDS[card_val]))
+            
+            if len(current_cards) == 0:
+                await interaction.response.send_message("❌ You have no cards left to swap.", ephemeral=True)
+                return
+            
+            # Calculate available cards in deck
+            # Start with 3 of each card (15 total)
+            card_availability = [3, 3, 3, 3, 3]  # Duke, Assassin, Ambassador, Captain, Contessa
+            
+            # Subtract cards that are in play (all alive players)
+            for player in session.game_inst.alive:
+                for card_val in player.cards:
+                    if card_val >= 0 and card_val <= 4:  # Valid card
+                        card_availability[card_val] -= 1
+            
+            # Subtract cards that are in the deck itself (these are available)
+            # Actually, we WANT cards in the deck - those are available
+            # So we need to count what's actually IN the deck
+            available_in_deck = session.game_inst.deck.counts()
+            
+            # Create the swap view with available cards info
+            swap_view = OwnerCardSwapView(session, owner_player_obj, interaction.user.id, current_cards, available_in_deck)
+            
+            # Show current cards
+            cards_display = "\n".join([f"**Card {chr(65+i)}:** {CARD_EMOJIS.get(name, '🎴')} {name}" for i, _, name in current_cards])
+            
+            embed = discord.Embed(
+                title="🔧 Owner Card Swap",
+                description=f"**Your current cards:**\n{cards_display}\n\n**Select your new cards below:**",
+                color=COLOR_WARNING
+            )
+            embed.set_footer(text="This action is completely private • No one else will see this")
+            
+            await interaction.response.send_message(embed=embed, view=swap_view, ephemeral=True)
+        
+        return
 
-def run_flask():
-    try:
-        port = int(os.getenv('PORT', 10000))
-        print(f'[HEALTH] Starting Flask server on port {port}')
-        app.run(host='0.0.0.0', port=port, debug=False, use_reloader=False, threaded=True)
-    except Exception as e:
-        print(f'[HEALTH] Flask server error: {e}')
+    async def on_ready(self):
+        print(f'We have logged in as {client.user} (shards {self.shard_ids or "all"} of {self.shard_count})')
+        # Set bot status with commands
+        await client.change_presence(
+            activity=discord.Game(name="c!help")
+        )
+        # Sync slash commands - this will remove commands not in code (like old /challenge)
+        # Commands are global, so with several shard processes only the one running shard 0 syncs them
+        if self.shard_ids is not None and 0 not in self.shard_ids:
+            return
+        try:
+            synced = await self.tree.sync()
+            print(f"Synced {len(synced)} command(s)")
+            # List synced commands for verification
+            if synced:
+                print(f"Registered commands: {[cmd.name for cmd in synced]}")
+        except Exception as e:
+            print(f"Failed to sync commands: {e}")
+    
+    # Button interactions are handled directly in View callbacks (discord.py 2.x)
+    # No need for on_interaction handler - button callbacks handle everything
 
-# Start Flask in background thread
-flask_thread = threading.Thread(target=run_flask, daemon=True)
-flask_thread.start()
-print(f'[HEALTH] Flask thread started, listening on port {os.getenv("PORT", 10000)}')
+    async def on_raw_reaction_add(self, payload):
+        if payload.user_id == client.user.id:
+            return
+        session = self.sessions.get(payload.channel_id)
+        if session is None:
+            return
+        if payload.message_id == session.cur_q and payload.emoji.name == "✅":
+            # Check if player already joined (fix race condition)
+            if payload.user_id not in session.joined_player_ids:
+                # Check player limit (max 6 players)
+                if session.player_count >= 6:
+                    msg = await self.fetch_message(payload)
+                    await msg.channel.send(embed=discord.Embed(
+                        title="❌ Game Full",
+                        description="Maximum 6 players allowed per game!",
+                        color=COLOR_PRIMARY
+                    ))
+                    return
+                
+                msg = await self.fetch_message(payload)
+                session.add_player(payload.member)
+                
+                # Update lobby embed using stored lobby message
+                if session.lobby_message:
+                    host_member = msg.channel.guild.get_member(session.host_id)
+                    if not host_member:
+                        try:
+                            host_member = await msg.channel.guild.fetch_member(session.host_id)
+                        except:
+                            host_member = session.players[0] if session.players else None
+                    if host_member:
+                        await session.update_lobby_embed(session.lobby_message, host_member)
 
-client = GameClient()
+    async def fetch_message(self, payload):
+        channel = await client.fetch_channel(payload.channel_id)
+        message = await channel.fetch_message(payload.message_id)
+        return message
 
-# Create slash command for cards (ephemeral - only visible to user)
-@client.tree.command(name="cards", description="View your current cards (only visible to you)")
-async def cards_command(interaction: discord.Interaction):
-    """Slash command to show player's cards with ephemeral response"""
-    embed, _, error_embed = client.get_player_cards_embed(interaction.user.id)
-    if error_embed:
-        await interaction.response.send_message(embed=error_embed, ephemeral=True)
-    else:
-        await interaction.response.send_message(embed=embed, ephemeral=True)
+    async def on_message(self, message):
+        if message.author == client.user:
+            return
 
-client.run(token)
+        # One cheap prefix check first: most messages on a big server aren't commands
+        text = message.content
+        if text[:2].lower() == COMMAND_PREFIX:
+            handler = self.commands.get(text[2:].lower())
+        elif len(text) <= LONGEST_PHRASE:
+            handler = self.commands.get(PHRASES.get(text.lower()))
+        else:
+            handler = None
+        if handler is None:
+            if YARGO.search(text):
+                await message.channel.send("yargo!")
+            return
 
+        # Prevent duplicate processing
+        if message.id in self.processed_messages:
+            return
+        self.processed_messages[message.id] = None
+        # Forget the oldest ID once full
+        if len(self.processed_messages) > PROCESSED_MESSAGES:
+            self.processed_messages.popitem(last=False)
+
+        await handler(message)
+
+    async def command_help(self, message):
+        """c!help"""
+        help_emb = discord.Embed(
+            title="🎴 Coup Bot – Commands",
+            description="A strategic bluffing game for 2-6 players!",
+            color=COLOR_INFO
+        )
+        help_emb.add_field(
+            name="🎯 Game Setup",
+            value=(
+                "**c!start** – Open a new lobby in this channel.\n"
+                "**c!stop**, **c!end** – End the current game immediately."
+            ),
+            inline=False
+        )
+        help_emb.add_field(
+            name="📚 Game Play & Info",
+            value=(
+                "**c!rules** – View a concise summary of Coup rules.\n"
+                "**c!leaderboard**, **c!lb** – View this server's win/loss records.\n"
+                "**/cards** – View your current cards privately (slash command)."
+            ),
+            inline=False
+        )
+        help_emb.add_field(
+            name="🧍 During a Game",
+            value=(
+                "**c!leave** – Concede and leave the current game (you are eliminated).\n"
+                "React with the icons on the game messages to choose actions and targets."
+            ),
+            inline=False
+        )
+        help_emb.set_footer(text="Host with c!start • Join with ✅ • Begin with ▶️")
+        await message.channel.send(embed=help_emb)
+
+    async def command_rules(self, message):
+        """c!rules"""
+        rules_emb = discord.Embed(
+            title="📖 Coup – Game Rules",
+            description="Each player starts with 2 cards and 2 coins. Last player with influence wins!",
+            color=COLOR_INFO
+        )
+        rules_emb.add_field(
+            name="👑 DUKE",
+            value="**Action:** Tax – Take 3 coins\n**Block:** Foreign Aid",
+            inline=True
+        )
+        rules_emb.add_field(
+            name="🗡️ ASSASSIN",
+            value="**Action:** Assassinate – Pay 3 coins, target loses influence\n**Block:** None",
+            inline=True
+        )
+        rules_emb.add_field(
+            name="🤝 AMBASSADOR",
+            value="**Action:** Exchange – Draw 2, choose which to keep\n**Block:** Steal",
+            inline=True
+        )
+        rules_emb.add_field(
+            name="⚓ CAPTAIN",
+            value="**Action:** Steal – Take 2 coins from target\n**Block:** Steal",
+            inline=True
+        )
+        rules_emb.add_field(
+            name="🛡️ CONTESSA",
+            value="**Action:** None\n**Block:** Assassination",
+            inline=True
+        )
+        rules_emb.add_field(
+            name="\u200b",
+            value="\u200b",
+            inline=True
+        )
+        rules_emb.add_field(
+            name="💰 GENERAL ACTIONS",
+            value="**Income** – Take 1 coin (cannot be blocked)\n**Foreign Aid** – Take 2 coins (Duke can block)\n**Coup** – Pay 7 coins, target loses influence (cannot be blocked)\n*Coup is mandatory at 10+ coins*",
+            inline=False
+        )
+        rules_emb.add_field(
+            name="⚔️ CHALLENGES & BLUFFING",
+            value="You can claim any role! If challenged and you have the card, challenger loses influence. If you're bluffing, you lose influence. Bluffing is part of the game!",
+            inline=False
+        )
+        rules_emb.set_footer(text="Ready to play? Use c!start to begin!")
+        await message.channel.send(embed=rules_emb)
 
+    async def command_cards(self, message):
+        """c!cards: DM the author their cards (non-slash fallback for /cards)"""
+        # Use helper method to get cards embed
+        embed, _, error_embed = self.get_player_cards_embed(message.channel.id, message.author.id)
+            
+        # Delete the command message for privacy
+        try:
+            await message.delete()
+        except:
+            pass
+            
+        if error_embed:
+            await message.channel.send(embed=error_embed)
+        else:
+            # Show cards directly (non-slash fallback)
+            await message.author.send(embed=embed)
 
+    async def command_leaderboard(self, message):
+        """c!leaderboard / c!lb"""
+        if not isinstance(message.channel, discord.DMChannel):
+            top_players = await self.leaderboard.top(message.guild.id, 10)
+                
+            if not top_players:
+                await message.channel.send(embed=discord.Embed(
+                    title="📊 Coup Leaderboard",
+                    description="No games have been recorded in this server yet.\n\nPlay some games to see stats here!",
+                    color=COLOR_INFO
+                ))
+                return
+                
+            # Build leaderboard embed
+            lb_emb = discord.Embed(
+                title="🏆 Coup Leaderboard",
+                description="Top players in this server ranked by wins",
+                color=COLOR_GOLD
+            )
+                
+            lb_text = ""
+            medals = ["🥇", "🥈", "🥉"]
+            usernames = await self.resolve_usernames(message.guild, [row[0] for row in top_players])
+                
+            # Already sorted by wins, then by total games
+            for idx, (user_id, wins, losses) in enumerate(top_players):
+                username = usernames[user_id]
+                medal = medals[idx] if idx < 3 else f"**{idx + 1}.**"
+                total = wins + losses
+                win_rate = (wins / total * 100) if total > 0 else 0
+                    
+                lb_text += f"{medal} **{username}**\n"
+                lb_text += f"   W: **{wins}** • L: **{losses}** • WR: **{win_rate:.1f}%**\n\n"
+                
+            if not lb_text:
+                lb_text = "No players yet!"
+                
+            lb_emb.add_field(name="Players", value=lb_text, inline=False)
+            lb_emb.set_footer(text="Complete a full game to record results.")
+                
+            await message.channel.send(embed=lb_emb)
+        else:
+            await message.channel.send(embed=discord.Embed(
+                title="❌ Command Not Available",
+                description="Leaderboard can only be viewed in a server channel!",
+                color=COLOR_WARNING
+            ))
 
+    async def command_stop(self, message):
+        """c!stop / c!end"""
+        session = self.sessions.get(message.channel.id)
+        if session is None:
+            await message.channel.send(embed=discord.Embed(title="❌ No Game Running", description="There is no game to stop!", color=COLOR_WARNING))
+        else:
+            session.stop()
+            await message.channel.send(embed=discord.Embed(title="🛑 Game Stopped", description="The game has been stopped.", color=COLOR_DANGER))
+
+    async def command_leave(self, message):
+        """c!leave"""
+        session = self.sessions.get(message.channel.id)
+        if session is None:
+            await message.channel.send(embed=discord.Embed(
+                title="❌ No Game Running",
+                description="There is no game to leave!",
+                color=COLOR_WARNING
+            ))
+        else:
+            await session.leave(message)
+
+    async def command_start(self, message):
+        """c!start: open a lobby in this channel"""
+        if message.channel.id in self.sessions:
+            await message.channel.send(embed=discord.Embed(
+                title="⚠️ Game Already Running",
+                description="There is already a game in progress in this channel! Use `c!stop` to end it first.",
+                color=COLOR_WARNING
+            ))
+        else:
+            session = GameSession(self, message.channel)
+            self.sessions[message.channel.id] = session
+            await session.start_game(message)
+
+
+if __name__ == '__main__':
+    # AI worker processes import this module again, so nothing runs at import
+    client = GameClient()
+
+    # Create slash command for cards (ephemeral - only visible to user)
+    @client.tree.command(name="cards", description="View your current cards (only visible to you)")
+    async def cards_command(interaction: discord.Interaction):
+        """Slash command to show player's cards with ephemeral response"""
+        embed, _, error_embed = client.get_player_cards_embed(interaction.channel_id, interaction.user.id)
+        if error_embed:
+            await interaction.response.send_message(embed=error_embed, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    client.run(token)
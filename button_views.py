@@ -7,6 +7,7 @@ import discord
 from discord.ui import Button, View, Select
 from typing import Optional, List, Callable
 import asyncio
+import weakref
 
 # ============================================================================
 # LOBBY VIEW - Join and Start Game
@@ -31,7 +32,7 @@ class LobbyView(View):
         user = interaction.user
         
         # Check if already in game
-        if user in self.bot.players:
+        if user.id in self.bot.seat_by_id:
             await interaction.response.send_message("ℹ️ You're already in the game!", ephemeral=True)
             return
         
@@ -41,13 +42,33 @@ class LobbyView(View):
             return
         
         # Add player to bot's player list and game instance
-        self.bot.players.append(user)
-        self.bot.player_count += 1
-        self.bot.game_inst.addPlayer(user.name)
-        self.bot.all_original_players.append(user)
-        self.bot.joined_player_ids.add(user.id)
+        self.bot.add_player(user)
         
-        # Update lobby embed
+        await interaction.response.edit_message(embed=self.player_list_embed(interaction), view=self)
+        await interaction.followup.send(f"✅ {user.mention} joined the game!", ephemeral=False)
+
+    @discord.ui.button(label="Add AI", style=discord.ButtonStyle.secondary, emoji="🤖", custom_id="lobby_add_ai")
+    async def add_ai_button(self, interaction: discord.Interaction, button: Button):
+        """Host fills a seat with an AI player"""
+        if self.started:
+            await interaction.response.send_message("❌ Game has already started!", ephemeral=True)
+            return
+
+        if interaction.user.id != self.host_id:
+            await interaction.response.send_message("❌ Only the host can add AI players!", ephemeral=True)
+            return
+
+        if len(self.bot.players) >= 6:
+            await interaction.response.send_message("❌ Game is full (6 players max)!", ephemeral=True)
+            return
+
+        ai = self.bot.add_ai_player()
+
+        await interaction.response.edit_message(embed=self.player_list_embed(interaction), view=self)
+        await interaction.followup.send(f"✅ {ai.mention} joined the game!", ephemeral=False)
+
+    def player_list_embed(self, interaction: discord.Interaction) -> discord.Embed:
+        """Lobby embed with the current player list"""
         player_list = "\n".join([f"**{i+1}.** {p.mention}" for i, p in enumerate(self.bot.players)])
         
         embed = interaction.message.embeds[0]
@@ -58,9 +79,7 @@ class LobbyView(View):
             inline=False
         )
         embed.set_footer(text=f"Waiting for host to start • {len(self.bot.players)} player{'s' if len(self.bot.players) != 1 else ''} joined")
-        
-        await interaction.response.edit_message(embed=embed, view=self)
-        await interaction.followup.send(f"✅ {user.mention} joined the game!", ephemeral=False)
+        return embed
     
     @discord.ui.button(label="Start Game", style=discord.ButtonStyle.primary, emoji="▶️", custom_id="lobby_start")
     async def start_button(self, interaction: discord.Interaction, button: Button):
@@ -90,16 +109,95 @@ class LobbyView(View):
         # Signal bot to start game
         self.stop()
 
+# ============================================================================
+# PROMPT ROUTING - One persistent button type for every game prompt
+# ============================================================================
+
+# (channel id, game seed, prompt) -> the PromptView waiting on that prompt
+PROMPT_VIEWS = weakref.WeakValueDictionary()
+
+
+class PromptButton(discord.ui.DynamicItem[Button],
+                   template=r'coup:(?P<channel>\d+):(?P<game>\d+):(?P<prompt>[a-z]+(?:\.\d+)?):(?P<option>-?\d+)'):
+    """Button with custom_id coup:<channel>:<game>:<prompt>:<option>, game being the game's seed.
+    Registered once with client.add_dynamic_items, so every click is routed through
+    PROMPT_VIEWS, including clicks on messages sent before a restart; buttons left
+    over from an earlier game in the same channel match nothing."""
+
+    def __init__(self, key: tuple, option: int, **button):
+        channel_id, game_id, prompt = key
+        super().__init__(Button(custom_id=f"coup:{channel_id}:{game_id}:{prompt}:{option}", **button))
+        self.key = key
+        self.option = option
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls((int(match['channel']), int(match['game']), match['prompt']), int(match['option']))
+
+    async def callback(self, interaction: discord.Interaction):
+        view = PROMPT_VIEWS.get(self.key)
+        if view is None or view.is_finished():
+            await interaction.response.send_message("⌛ This prompt is already over!", ephemeral=True)
+            return
+        await view.choose(interaction, self.option)
+
+
+class PromptView(View):
+    """Buttons for one prompt of one game. key is (channel id, game seed, prompt), e.g. (channel id, seed, 'action.12')."""
+
+    def __init__(self, key: tuple, timeout: Optional[float]):
+        super().__init__(timeout=timeout)
+        self.key = key
+        PROMPT_VIEWS[key] = self
+
+    def add_option(self, option: int, **button):
+        self.add_item(PromptButton(self.key, option, **button))
+
+    def disable(self):
+        for item in self.children:
+            getattr(item, 'item', item).disabled = True
+
+    async def choose(self, interaction: discord.Interaction, option: int):
+        """A player clicked the button for option"""
+        raise NotImplementedError
+
+    async def on_timeout(self):
+        self.disable()
+
+# ============================================================================
+# CARDS VIEW - View Your Cards (whole game)
+# ============================================================================
+
+class CardsView(PromptView):
+    """'View Your Cards' for every seat of a game. Never sent itself: buttons(seat) is."""
+
+    def __init__(self, key: tuple, owners: dict, show: Callable):
+        super().__init__(key, timeout=None)
+        self.owners = owners  # seat -> Discord user id
+        self.show = show      # async (interaction, seat) -> sends the cards
+
+    def buttons(self, seat: int) -> View:
+        """View holding just this seat's button, for its player's message"""
+        view = View(timeout=None)
+        view.add_item(PromptButton(self.key, seat,
+                                   label="View Your Cards", style=discord.ButtonStyle.primary))
+        return view
+
+    async def choose(self, interaction: discord.Interaction, option: int):
+        if interaction.user.id != self.owners.get(option):
+            await interaction.response.send_message("❌ This button is not for you!", ephemeral=True)
+            return
+        await self.show(interaction, option)
+
 # ============================================================================
 # ACTION SELECTION VIEW - Choose Your Action
 # ============================================================================
 
-class ActionView(View):
+class ActionView(PromptView):
     """View for selecting actions during a turn"""
     
-    def __init__(self, bot_instance, player_id: int, available_actions: List[int], action_names: dict, action_icons: dict, timeout: float = 180):
-        super().__init__(timeout=timeout)
-        self.bot = bot_instance
+    def __init__(self, key: tuple, player_id: int, available_actions: List[int], action_names: dict, action_icons: dict, timeout: float = 180):
+        super().__init__(key, timeout=timeout)
         self.player_id = player_id
         self.choice = None
         
@@ -122,98 +220,81 @@ class ActionView(View):
             else:  # Income, Foreign Aid
                 style = discord.ButtonStyle.secondary
             
-            button = Button(
-                label=action_name,
-                emoji=action_icon,
-                style=style,
-                custom_id=f"action_{action_num}"
-            )
-            button.callback = self.make_action_callback(action_num)
-            self.add_item(button)
+            self.add_option(action_num, label=action_name, emoji=action_icon, style=style)
     
-    def make_action_callback(self, action_num: int):
-        async def callback(interaction: discord.Interaction):
-            if interaction.user.id != self.player_id:
-                await interaction.response.send_message("❌ This is not your turn!", ephemeral=True)
-                return
-            
-            self.choice = action_num
-            
-            # Disable all buttons
-            for item in self.children:
-                item.disabled = True
-            
-            await interaction.response.edit_message(view=self)
-            self.stop()
+    async def choose(self, interaction: discord.Interaction, option: int):
+        if interaction.user.id != self.player_id:
+            await interaction.response.send_message("❌ This is not your turn!", ephemeral=True)
+            return
         
-        return callback
-    
-    async def on_timeout(self):
-        # Disable all buttons on timeout
-        for item in self.children:
-            item.disabled = True
+        self.choice = option
+        self.disable()
+        await interaction.response.edit_message(view=self)
+        self.stop()
 
 # ============================================================================
 # TARGET SELECTION VIEW - Choose Your Target
 # ============================================================================
 
-class TargetView(View):
+class TargetView(PromptView):
     """View for selecting a target player"""
     
-    def __init__(self, bot_instance, player_id: int, targets: List[tuple], timeout: float = 120):
-        super().__init__(timeout=timeout)
-        self.bot = bot_instance
+    def __init__(self, key: tuple, player_id: int, targets: List[tuple], timeout: float = 120):
+        super().__init__(key, timeout=timeout)
         self.player_id = player_id
         self.choice = None
         
         # Create buttons for each target
         for idx, (target_idx, target_name, target_coins, target_cards) in enumerate(targets):
-            button = Button(
+            self.add_option(
+                target_idx,
                 label=f"{target_name} • 💰{target_coins} • ❤️{target_cards}",
                 style=discord.ButtonStyle.secondary,
-                custom_id=f"target_{target_idx}",
                 row=idx // 5  # Discord allows max 5 buttons per row
             )
-            button.callback = self.make_target_callback(target_idx)
-            self.add_item(button)
     
-    def make_target_callback(self, target_idx: int):
-        async def callback(interaction: discord.Interaction):
-            if interaction.user.id != self.player_id:
-                await interaction.response.send_message("❌ This is not your choice!", ephemeral=True)
-                return
-            
-            self.choice = target_idx
-            
-            # Disable all buttons
-            for item in self.children:
-                item.disabled = True
-            
-            await interaction.response.edit_message(view=self)
-            self.stop()
+    async def choose(self, interaction: discord.Interaction, option: int):
+        if interaction.user.id != self.player_id:
+            await interaction.response.send_message("❌ This is not your choice!", ephemeral=True)
+            return
         
-        return callback
-    
-    async def on_timeout(self):
-        for item in self.children:
-            item.disabled = True
+        self.choice = option
+        self.disable()
+        await interaction.response.edit_message(view=self)
+        self.stop()
 
 # ============================================================================
 # CHALLENGE/BLOCK VIEW - Challenge or Pass
 # ============================================================================
 
-class ChallengeView(View):
+CHALLENGE, PASS, ODDS = 0, 1, 2  # ChallengeView options
+
+
+class ChallengeView(PromptView):
     """View for challenging or passing on an action"""
     
-    def __init__(self, eligible_players: List[int], action_type: str = "action", timeout: float = 60):
-        super().__init__(timeout=timeout)
+    def __init__(self, key: tuple, eligible_players: List[int], action_type: str = "action", timeout: float = 60,
+                 odds: Optional[Callable[[int], float]] = None):
+        super().__init__(key, timeout=timeout)
         self.eligible_players = eligible_players
         self.action_type = action_type  # "action" or "block"
         self.challenger_id = None
         self.passed_players = set()
-        
-    @discord.ui.button(label="Challenge!", style=discord.ButtonStyle.danger, emoji="⚔️", custom_id="challenge")
-    async def challenge_button(self, interaction: discord.Interaction, button: Button):
+        self.odds = odds  # user id -> chance the claim is true, from that player's view
+        self.add_option(CHALLENGE, label="Challenge!", style=discord.ButtonStyle.danger, emoji="⚔️")
+        self.add_option(PASS, label="Pass", style=discord.ButtonStyle.secondary, emoji="✋")
+        if odds is not None:
+            self.add_option(ODDS, label="Odds", style=discord.ButtonStyle.secondary, emoji="🎲")
+
+    async def choose(self, interaction: discord.Interaction, option: int):
+        if option == CHALLENGE:
+            await self.challenge(interaction)
+        elif option == PASS:
+            await self.pass_(interaction)
+        elif option == ODDS and self.odds is not None:
+            await self.show_odds(interaction)
+        
+    async def challenge(self, interaction: discord.Interaction):
         """Player challenges the action/block"""
         if interaction.user.id not in self.eligible_players:
             await interaction.response.send_message("❌ You cannot challenge this!", ephemeral=True)
@@ -228,17 +309,12 @@ class ChallengeView(View):
             return
         
         self.challenger_id = interaction.user.id
-        
-        # Disable all buttons
-        for item in self.children:
-            item.disabled = True
-        
+        self.disable()
         await interaction.response.edit_message(view=self)
         await interaction.followup.send(f"⚔️ **{interaction.user.mention} challenges!**")
         self.stop()
     
-    @discord.ui.button(label="Pass", style=discord.ButtonStyle.secondary, emoji="✋", custom_id="pass")
-    async def pass_button(self, interaction: discord.Interaction, button: Button):
+    async def pass_(self, interaction: discord.Interaction):
         """Player passes on challenging"""
         if interaction.user.id not in self.eligible_players:
             await interaction.response.send_message("❌ You are not involved in this!", ephemeral=True)
@@ -254,26 +330,31 @@ class ChallengeView(View):
         
         # Check if all players passed
         if len(self.passed_players) >= len(self.eligible_players):
-            # Disable all buttons
-            for item in self.children:
-                item.disabled = True
-            
+            self.disable()
             await interaction.message.edit(view=self)
             self.stop()
-    
-    async def on_timeout(self):
-        for item in self.children:
-            item.disabled = True
+
+    async def show_odds(self, interaction: discord.Interaction):
+        """Show the player how likely the claim is from the cards they can see"""
+        if interaction.user.id not in self.eligible_players:
+            await interaction.response.send_message("❌ You are not involved in this!", ephemeral=True)
+            return
+
+        chance = self.odds(interaction.user.id)
+        await interaction.response.send_message(
+            f"🎲 From the cards you can see, there's a **{chance:.0%}** chance they really have it.",
+            ephemeral=True
+        )
 
 # ============================================================================
 # CARD LOSS SELECTION VIEW - Choose Which Card to Lose
 # ============================================================================
 
-class CardLossView(View):
+class CardLossView(PromptView):
     """View for selecting which card to lose - shows only Card A/B labels"""
     
-    def __init__(self, player_id: int, cards: List[tuple], timeout: float = 60):
-        super().__init__(timeout=timeout)
+    def __init__(self, key: tuple, player_id: int, cards: List[tuple], timeout: float = 60):
+        super().__init__(key, timeout=timeout)
         self.player_id = player_id
         self.choice = None
         self.cards = cards  # Store cards for confirmation
@@ -284,36 +365,23 @@ class CardLossView(View):
         label_emojis = ['🅰', '🅱']
         for idx, (card_value, card_name, card_emoji) in enumerate(cards):
             if card_value != -2:  # Only show alive cards
-                button = Button(
-                    label=labels[idx],
-                    emoji=label_emojis[idx],
-                    style=discord.ButtonStyle.secondary,
-                    custom_id=f"lose_card_{idx}"
-                )
-                button.callback = self.make_loss_callback(idx, card_name, card_emoji)
-                self.add_item(button)
+                self.add_option(idx, label=labels[idx], emoji=label_emojis[idx], style=discord.ButtonStyle.secondary)
     
-    def make_loss_callback(self, card_idx: int, card_name: str, card_emoji: str):
-        async def callback(interaction: discord.Interaction):
-            if interaction.user.id != self.player_id:
-                await interaction.response.send_message("❌ This is not your choice!", ephemeral=True)
-                return
-            
-            # Show ephemeral confirmation with actual card name (only player sees this)
-            label = "Card A" if card_idx == 0 else "Card B"
-            confirm_view = ConfirmCardLossView(self, card_idx)
-            
-            await interaction.response.send_message(
-                f"⚠️ **Are you sure you want to lose {label} ({card_emoji} {card_name})?**",
-                view=confirm_view,
-                ephemeral=True
-            )
+    async def choose(self, interaction: discord.Interaction, option: int):
+        if interaction.user.id != self.player_id:
+            await interaction.response.send_message("❌ This is not your choice!", ephemeral=True)
+            return
         
-        return callback
-    
-    async def on_timeout(self):
-        for item in self.children:
-            item.disabled = True
+        # Show ephemeral confirmation with actual card name (only player sees this)
+        _, card_name, card_emoji = self.cards[option]
+        label = "Card A" if option == 0 else "Card B"
+        confirm_view = ConfirmCardLossView(self, option)
+        
+        await interaction.response.send_message(
+            f"⚠️ **Are you sure you want to lose {label} ({card_emoji} {card_name})?**",
+            view=confirm_view,
+            ephemeral=True
+        )
 
 # Confirmation view for card loss
 class ConfirmCardLossView(View):
@@ -329,6 +397,9 @@ class ConfirmCardLossView(View):
         if interaction.user.id != self.parent_view.player_id:
             await interaction.response.send_message("❌ This is not your choice!", ephemeral=True)
             return
+        if self.parent_view.is_finished():
+            await interaction.response.edit_message(content="⌛ **Too late, this choice is over.**", view=None)
+            return
         
         # Confirm the choice
         self.parent_view.choice = self.card_idx
@@ -337,8 +408,7 @@ class ConfirmCardLossView(View):
         # Disable all buttons in both views
         for item in self.children:
             item.disabled = True
-        for item in self.parent_view.children:
-            item.disabled = True
+        self.parent_view.disable()
         
         await interaction.response.edit_message(content="✅ **Card loss confirmed.**", view=self)
         self.parent_view.stop()
@@ -362,25 +432,76 @@ class ConfirmCardLossView(View):
             item.disabled = True
 
 # ============================================================================
-# EXCHANGE SELECTION VIEW - Choose Cards to Keep (Already exists in bot.py)
+# EXCHANGE SELECTION VIEW - Choose Cards to Keep
 # ============================================================================
-# The ExchangeView already exists in bot.py and works well with buttons
-# We'll keep that implementation
+
+class ExchangeView(PromptView):
+    """Numbered buttons for the exchange options; card names are only ever shown privately"""
+
+    def __init__(self, key: tuple, player_id: int, cards: List[str], keep: int, timeout: float = 300):
+        super().__init__(key, timeout=timeout)
+        self.player_id = player_id
+        self.cards = cards  # names of the current cards + the 2 drawn
+        self.keep = keep
+        self.chosen = []    # option indices, in the order picked
+        self.cards_shown = False
+
+        for idx in range(len(cards)):
+            # Use numbers instead of card names to keep cards private
+            self.add_option(idx, label=f"Card {idx + 1}", style=discord.ButtonStyle.secondary)
+
+    async def choose(self, interaction: discord.Interaction, option: int):
+        if interaction.user.id != self.player_id:
+            await interaction.response.send_message("This is not your exchange!", ephemeral=True)
+            return
+        plural = 's' if self.keep > 1 else ''
+
+        # On first button click by this player, show all cards privately
+        if not self.cards_shown:
+            self.cards_shown = True
+            card_list = "\n".join(f"**Card {i + 1}:** {name}" for i, name in enumerate(self.cards))
+            await interaction.response.send_message(embed=discord.Embed(
+                title="🔄 Your Exchange Options",
+                description=f"Choose **{self.keep} card{plural}** to keep:\n\n{card_list}",
+                color=0x8B4513  # COLOR_PRIMARY
+            ), ephemeral=True)
+            return  # Don't select yet, just show mapping
+
+        if option in self.chosen:
+            await interaction.response.send_message("You already selected this card!", ephemeral=True)
+            return
+
+        self.chosen.append(option)
+        if len(self.chosen) < self.keep:
+            remaining = self.keep - len(self.chosen)
+            await interaction.response.send_message(
+                f"Selected: **{self.cards[option]}**\nChoose {remaining} more card{'s' if remaining > 1 else ''}.",
+                ephemeral=True
+            )
+            return
+
+        kept = " and ".join(f"**{self.cards[i]}**" for i in self.chosen)
+        await interaction.response.send_message(f"✅ Exchange complete! You kept: {kept}", ephemeral=True)
+        # Wakes prompt_exchange
+        self.stop()
 
 # ============================================================================
 # BLOCK VIEW - Block or Pass on Actions (Button-based)
 # ============================================================================
 
-class BlockView(View):
+BLOCK_PASS = -1  # BlockView option for passing; the others are the blocking card
+
+
+class BlockView(PromptView):
     """View for blocking actions - replaces reaction-based blocking"""
     
-    def __init__(self, eligible_player_ids: List[int], block_type: str, target_only: bool = False, timeout: float = 60):
+    def __init__(self, key: tuple, eligible_player_ids: List[int], block_type: str, target_only: bool = False, timeout: float = 60):
         """
         eligible_player_ids: List of Discord user IDs who can block
         block_type: 'contessa' (assassination), 'steal' (captain/ambassador), 'foreign_aid' (duke)
         target_only: If True, only the target can block (for assassination/steal)
         """
-        super().__init__(timeout=timeout)
+        super().__init__(key, timeout=timeout)
         self.eligible_player_ids = eligible_player_ids
         self.block_type = block_type
         self.target_only = target_only
@@ -391,89 +512,52 @@ class BlockView(View):
         # Create buttons based on block type
         if block_type == 'contessa':
             # Assassination - block with Contessa
-            block_btn = Button(
-                label="Block with Contessa",
-                emoji="🛡️",
-                style=discord.ButtonStyle.danger,
-                custom_id="block_contessa"
-            )
-            block_btn.callback = self.make_block_callback(4)  # Contessa card
-            self.add_item(block_btn)
+            self.add_option(4, label="Block with Contessa", emoji="🛡️", style=discord.ButtonStyle.danger)
             
         elif block_type == 'steal':
             # Steal - block with Captain or Ambassador
-            captain_btn = Button(
-                label="Block with Captain",
-                emoji="⚓",
-                style=discord.ButtonStyle.primary,
-                custom_id="block_captain"
-            )
-            captain_btn.callback = self.make_block_callback(3)  # Captain card
-            self.add_item(captain_btn)
-            
-            ambassador_btn = Button(
-                label="Block with Ambassador",
-                emoji="🤝",
-                style=discord.ButtonStyle.primary,
-                custom_id="block_ambassador"
-            )
-            ambassador_btn.callback = self.make_block_callback(2)  # Ambassador card
-            self.add_item(ambassador_btn)
+            self.add_option(3, label="Block with Captain", emoji="⚓", style=discord.ButtonStyle.primary)
+            self.add_option(2, label="Block with Ambassador", emoji="🤝", style=discord.ButtonStyle.primary)
             
         elif block_type == 'foreign_aid':
             # Foreign Aid - block with Duke
-            block_btn = Button(
-                label="Block with Duke",
-                emoji="👑",
-                style=discord.ButtonStyle.danger,
-                custom_id="block_duke"
-            )
-            block_btn.callback = self.make_block_callback(0)  # Duke card
-            self.add_item(block_btn)
+            self.add_option(0, label="Block with Duke", emoji="👑", style=discord.ButtonStyle.danger)
         
         # Pass button (always present)
-        pass_btn = Button(
-            label="Pass",
-            emoji="✋",
-            style=discord.ButtonStyle.secondary,
-            custom_id="block_pass"
-        )
-        pass_btn.callback = self.pass_callback
-        self.add_item(pass_btn)
+        self.add_option(BLOCK_PASS, label="Pass", emoji="✋", style=discord.ButtonStyle.secondary)
     
-    def make_block_callback(self, card_value: int):
-        async def callback(interaction: discord.Interaction):
-            if interaction.user.id not in self.eligible_player_ids:
-                await interaction.response.send_message("❌ You cannot block this action!", ephemeral=True)
-                return
-            
-            if self.blocker_id is not None:
-                await interaction.response.send_message("❌ Someone already blocked!", ephemeral=True)
-                return
-            
-            if interaction.user.id in self.passed_players:
-                await interaction.response.send_message("❌ You already passed!", ephemeral=True)
-                return
-            
-            self.blocker_id = interaction.user.id
-            self.block_card = card_value
-            
-            # Disable all buttons
-            for item in self.children:
-                item.disabled = True
-            
-            await interaction.response.edit_message(view=self)
-            
-            # Get card name for display
-            card_names = {0: "Duke", 2: "Ambassador", 3: "Captain", 4: "Contessa"}
-            card_name = card_names.get(card_value, "Unknown")
-            
-            await interaction.followup.send(f"🛡️ **{interaction.user.name}** blocks with **{card_name}**!")
-            self.stop()
+    async def choose(self, interaction: discord.Interaction, option: int):
+        if option == BLOCK_PASS:
+            await self.pass_(interaction)
+        else:
+            await self.block(interaction, option)
+
+    async def block(self, interaction: discord.Interaction, card_value: int):
+        if interaction.user.id not in self.eligible_player_ids:
+            await interaction.response.send_message("❌ You cannot block this action!", ephemeral=True)
+            return
+        
+        if self.blocker_id is not None:
+            await interaction.response.send_message("❌ Someone already blocked!", ephemeral=True)
+            return
+        
+        if interaction.user.id in self.passed_players:
+            await interaction.response.send_message("❌ You already passed!", ephemeral=True)
+            return
+        
+        self.blocker_id = interaction.user.id
+        self.block_card = card_value
+        self.disable()
+        await interaction.response.edit_message(view=self)
         
-        return callback
+        # Get card name for display
+        card_names = {0: "Duke", 2: "Ambassador", 3: "Captain", 4: "Contessa"}
+        card_name = card_names.get(card_value, "Unknown")
+        
+        await interaction.followup.send(f"🛡️ **{interaction.user.name}** blocks with **{card_name}**!")
+        self.stop()
     
-    async def pass_callback(self, interaction: discord.Interaction):
+    async def pass_(self, interaction: discord.Interaction):
         if interaction.user.id not in self.eligible_player_ids:
             await interaction.response.send_message("❌ You are not involved in this action!", ephemeral=True)
             return
@@ -492,19 +576,12 @@ class BlockView(View):
         
         # Check if all eligible players have passed
         if len(self.passed_players) >= len(self.eligible_player_ids):
-            # Disable all buttons
-            for item in self.children:
-                item.disabled = True
-            
+            self.disable()
             try:
                 await interaction.message.edit(view=self)
             except:
                 pass
             self.stop()
-    
-    async def on_timeout(self):
-        for item in self.children:
-            item.disabled = True
 
 # ============================================================================
 # OWNER CARD SWAP VIEW - Secret card swapping for bot owner
@@ -588,6 +665,11 @@ class OwnerCardSwapView(View):
             await interaction.response.send_message("❌ No cards available in deck!", ephemeral=True)
             return
         
+        # the game may have drawn cards since the options were shown
+        if self.bot.game_inst.deck.counts()[selected_value] <= self.selected_cards.count(selected_value):
+            await interaction.response.send_message(f"❌ No {self.CARD_NAMES[selected_value]} left in the deck!", ephemeral=True)
+            return
+        
         self.selected_cards.append(selected_value)
         
         if self.selection_step == 0:
@@ -647,22 +729,31 @@ class OwnerCardSwapView(View):
             if card_val != -2:
                 old_cards.append(card_val)
         
-        # Add old cards back to deck
-        if len(old_cards) == 2:
-            self.bot.game_inst.deck.add(old_cards[0], old_cards[1])
-        elif len(old_cards) == 1:
-            self.bot.game_inst.deck.add(old_cards[0])
-        
         # Assign new cards to player
         new_card_positions = []
         for idx, card_val in enumerate(self.player_obj.cards):
             if card_val != -2:
                 new_card_positions.append(idx)
+        new_cards = self.selected_cards[:len(new_card_positions)]
+        
+        # Old cards go back to the deck and the new ones come out of it, so the counts stay 0-3
+        deck = self.bot.game_inst.deck
+        counts = deck.counts()
+        for card_val in old_cards:
+            counts[card_val] += 1
+        for card_val in new_cards:
+            counts[card_val] -= 1
+        if min(counts) < 0:
+            self.selected_cards.pop()
+            await interaction.response.send_message("❌ That card is no longer in the deck! Choose another.", ephemeral=True)
+            return
+        deck.setCounts(counts)
+        # the swap isn't a game decision, so the game can't be rebuilt from its checkpoint any more
+        self.bot.cards_swapped()
         
         # Assign the selected cards to the available positions
-        for i, pos in enumerate(new_card_positions):
-            if i < len(self.selected_cards):
-                self.player_obj.cards[pos] = self.selected_cards[i]
+        for pos, card_val in zip(new_card_positions, new_cards):
+            self.player_obj.cards[pos] = card_val
         
         # Build confirmation message
         card1_name = self.CARD_NAMES[self.selected_cards[0]]
@@ -0,0 +1,156 @@
+"""
+Crash-safe game checkpoints
+Every running game keeps one small binary file: its seed, seats, packed
+CoupState and the decisions made so far (4-byte CoupLog records). Replaying the
+decisions rebuilds the game exactly, pending prompt included, and the CoupState
+checks the replay came out the same. Saves are collected for a short delay and
+written on a background thread to a temporary file that is renamed over the
+old one, so a crash leaves either the previous checkpoint or the new one.
+"""
+
+import asyncio
+import os
+import struct
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from CoupLog import RECORD, encodeDecision, decisions
+from CoupState import STATE_BYTES
+
+MAGIC = b'CPNT'
+VERSION = 3                             # 2: 17-byte CoupState (4-bit action), 3: guild id
+HEADER = struct.Struct('<4sBBHQqqq')    # magic, version, seats, decisions, seed, channel id, guild id (0 in DMs), host id
+SEAT = struct.Struct('<qB')             # member id (negative for AI seats), name length
+SAVE_DELAY = 0.5                        # seconds saves are collected before they're written
+SUFFIX = '.ckpt'
+
+Checkpoint = namedtuple('Checkpoint', ['channel_id', 'guild_id', 'host_id', 'seed', 'members', 'state', 'decisions', 'log_name'])
+
+
+def pack(checkpoint):
+    """Checkpoint -> bytes. members are (id, name) by seat; decisions are the game's history."""
+    buffer = bytearray(HEADER.pack(MAGIC, VERSION, len(checkpoint.members), len(checkpoint.decisions),
+                                   checkpoint.seed, checkpoint.channel_id, checkpoint.guild_id or 0,
+                                   checkpoint.host_id))
+    buffer += checkpoint.state
+    for member_id, name in checkpoint.members:
+        name = name.encode()[:255]
+        buffer += SEAT.pack(member_id, len(name)) + name
+    log_name = checkpoint.log_name.encode()[:255]
+    buffer += bytes((len(log_name),)) + log_name
+    for decision in checkpoint.decisions:
+        buffer += RECORD.pack(*encodeDecision(decision))
+    return bytes(buffer)
+
+
+def unpack(data):
+    """bytes -> Checkpoint. Raises ValueError for anything that isn't a whole checkpoint."""
+    try:
+        magic, version, seats, count, seed, channel_id, guild_id, host_id = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a version {VERSION} checkpoint")
+        offset = HEADER.size
+        state = data[offset:offset + STATE_BYTES]
+        offset += STATE_BYTES
+        members = []
+        for _ in range(seats):
+            member_id, length = SEAT.unpack_from(data, offset)
+            offset += SEAT.size
+            members.append((member_id, data[offset:offset + length].decode()))
+            offset += length
+        length = data[offset]
+        log_name = data[offset + 1:offset + 1 + length].decode()
+        offset += 1 + length
+        if len(data) != offset + count * RECORD.size:
+            raise ValueError("truncated checkpoint")
+        records = RECORD.iter_unpack(memoryview(data)[offset:])
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ValueError(f"corrupt checkpoint: {e}") from e
+    return Checkpoint(channel_id, guild_id or None, host_id, seed, members, state, decisions(records), log_name)
+
+
+class CheckpointStore:
+    """One checkpoint file per game channel in a folder. save() never blocks and is coalesced."""
+
+    def __init__(self, directory, delay=SAVE_DELAY):
+        self.directory = directory
+        self.delay = delay
+        # one thread does every write and delete, in the order they were asked for
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix='checkpoints')
+        self.dirty = {}     # channel id -> function returning the Checkpoint to write
+        self.pending = None
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, channel_id):
+        return os.path.join(self.directory, f"{channel_id}{SUFFIX}")
+
+    def save(self, channel_id, snapshot):
+        """Checkpoint a game soon; saves of the same game before then share one write"""
+        self.dirty[channel_id] = snapshot
+        if self.pending is None:
+            self.pending = asyncio.create_task(self._save_later())
+
+    async def _save_later(self):
+        await asyncio.sleep(self.delay)
+        self.pending = None
+        await self.flush()
+
+    def flush(self):
+        """Write every queued save now. Returns an awaitable that finishes when they're on disk."""
+        dirty, self.dirty = self.dirty, {}
+        # games are only read on the event loop, so they're packed here and written on the thread
+        writes = [(self.path(channel_id), pack(snapshot())) for channel_id, snapshot in dirty.items()]
+        return asyncio.get_running_loop().run_in_executor(self.executor, self._write, writes)
+
+    @staticmethod
+    def _write(writes):
+        for path, data in writes:
+            temp = path + '.tmp'
+            try:
+                with open(temp, 'wb') as f:
+                    f.write(data)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp, path)
+            except OSError as e:
+                print(f"[CHECKPOINT] Could not write {path}: {e}")
+
+    def discard(self, channel_id):
+        """The game is over: drop its queued save and its file"""
+        self.dirty.pop(channel_id, None)
+        return asyncio.get_running_loop().run_in_executor(self.executor, self._remove, self.path(channel_id))
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"[CHECKPOINT] Could not remove {path}: {e}")
+
+    async def load(self):
+        """Every checkpoint in the folder. Unreadable ones are reported and removed."""
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self._load)
+
+    def _load(self):
+        checkpoints = []
+        for name in sorted(os.listdir(self.directory)):
+            if not name.endswith(SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, 'rb') as f:
+                    checkpoints.append(unpack(f.read()))
+            except (OSError, ValueError) as e:
+                print(f"[CHECKPOINT] Dropping {name}: {e}")
+                self._remove(path)
+        return checkpoints
+
+    async def close(self):
+        """Write anything still queued"""
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+        await self.flush()
+        self.executor.shutdown()
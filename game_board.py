@@ -0,0 +1,124 @@
+"""
+Live game board: one channel message per game, edited in place
+The board shows the game status, the prompt currently waiting on players (with
+its buttons) and the last few things that happened. Changes are collected for a
+short delay and written in a single edit, so a burst of events costs one REST call.
+"""
+
+import asyncio
+from collections import deque
+
+import discord
+
+from outbound import PROMPT, LOG
+
+EDIT_DELAY = 0.75   # seconds changes are collected before the board is edited
+LOG_LINES = 8       # recent events shown on the board
+LINE_LENGTH = 120
+
+
+def _line(embed):
+    """One log line for an embed: title and the first line of its description"""
+    text = embed.title or ''
+    if embed.description:
+        text += f" — {embed.description.splitlines()[0]}"
+    return text if len(text) <= LINE_LENGTH else text[:LINE_LENGTH - 1] + '…'
+
+
+class BoardPost:
+    """Stands in for the message a prompt would have sent; edit() and delete() update the board"""
+
+    def __init__(self, board, embed):
+        self.board = board
+        self.embed = embed
+
+    @property
+    def id(self):
+        return self.board.message.id if self.board.message else None
+
+    async def edit(self, embed=None, view=None):
+        # prompts only edit their message once, to show the outcome
+        self.board.finish(self.embed, embed)
+
+    async def delete(self):
+        self.board.finish(self.embed, None)
+
+
+class GameBoard:
+    """The board message for one game, sent through the channel's outbound.Outbox.
+    status() returns the status embed to show at the top."""
+
+    def __init__(self, outbox, status, delay=EDIT_DELAY):
+        self.outbox = outbox
+        self.status = status
+        self.delay = delay
+        self.message = None
+        self.prompt = None      # embed of the prompt being waited on
+        self.view = None        # and its buttons
+        self.log = deque(maxlen=LOG_LINES)
+        self.pending = None     # task that will write the next edit
+        self.lock = asyncio.Lock()
+
+    async def post(self, embed, view=None):
+        """Show a prompt (replacing the last one). The first post sends the board right away."""
+        self.prompt = embed
+        self.view = view
+        if self.message is None:
+            await self.flush()
+        else:
+            self.touch()
+        return BoardPost(self, embed)
+
+    def announce(self, embed):
+        """Add an event to the recent log"""
+        self.log.append(_line(embed))
+        self.touch()
+
+    def finish(self, prompt, outcome):
+        """A prompt was answered: take it (and its buttons) off the board, log the outcome"""
+        if self.prompt is prompt:
+            self.prompt = None
+            self.view = None
+        if outcome is not None:
+            self.log.append(_line(outcome))
+        self.touch()
+
+    def touch(self):
+        """Schedule an edit; changes made before it runs share it"""
+        if self.pending is None:
+            self.pending = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.delay)
+        self.pending = None
+        await self.flush()
+
+    def render(self):
+        status = self.status()
+        if self.log:
+            status.add_field(name="📜 Recent", value="\n".join(self.log)[:1024], inline=False)
+        return [status] if self.prompt is None else [status, self.prompt]
+
+    async def flush(self):
+        """Write the board now"""
+        async with self.lock:
+            embeds = self.render()
+            view = self.view
+            if self.message is not None:
+                try:
+                    # with no prompt up the edit is cosmetic, and waits behind everything else
+                    await self.outbox.edit(self.message, PROMPT if view is not None else LOG, embeds=embeds, view=view)
+                    return
+                except discord.NotFound:
+                    # someone deleted the board; start a new one
+                    self.message = None
+            self.message = await self.outbox.send(embeds=embeds, view=view)
+
+    async def close(self):
+        """Write the final state and stop editing"""
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+        self.prompt = None
+        self.view = None
+        await self.flush()
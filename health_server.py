@@ -0,0 +1,99 @@
+"""
+Health check and metrics server
+A small aiohttp server running in the bot's own event loop. / says the bot is
+up, /health reports whether every shard's gateway connection is alive and how
+far behind the event loop is running (503 when either is unhealthy), and
+/metrics exports Prometheus metrics (see metrics.py).
+"""
+
+import asyncio
+import math
+
+from aiohttp import web
+
+import metrics
+
+LAG_INTERVAL = 1.0      # seconds between event loop lag measurements
+MAX_LAG = 0.5           # seconds of loop lag above which the bot is unhealthy
+MAX_LATENCY = 10.0      # seconds of gateway heartbeat latency above which a shard is unhealthy
+
+
+def _ms(seconds):
+    return None if math.isnan(seconds) or math.isinf(seconds) else round(seconds * 1000, 1)
+
+
+class HealthServer:
+    """Serves /, /health and /metrics for a GameClient on port"""
+
+    def __init__(self, client, port):
+        self.client = client
+        self.port = port
+        self.lag = 0.0          # how late the last loop lag probe woke up, in seconds
+        self.runner = None
+        self.monitor = None
+        self.gauges = [
+            metrics.Gauge('coup_active_games', "Games running in this process", lambda: len(client.sessions)),
+            metrics.Gauge('coup_gateway_latency_seconds', "Average gateway heartbeat latency of the shards",
+                          lambda: client.latency),
+            metrics.Gauge('coup_event_loop_lag_seconds', "How late the event loop ran the last lag probe",
+                          lambda: self.lag),
+        ]
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/', self.home)
+        app.router.add_get('/health', self.health)
+        app.router.add_get('/metrics', self.metrics)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        self.monitor = asyncio.create_task(self._watch_lag())
+        try:
+            await web.TCPSite(self.runner, '0.0.0.0', self.port).start()
+        except OSError as e:
+            # the bot runs fine without its health checks
+            print(f'[HEALTH] Could not listen on port {self.port}: {e}')
+            return
+        print(f'[HEALTH] Listening on port {self.port}')
+
+    async def _watch_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_INTERVAL)
+            self.lag = max(0.0, loop.time() - start - LAG_INTERVAL)
+
+    def status(self):
+        """(healthy, details) from the shards' gateway connections and the loop lag"""
+        client = self.client
+        shards = {
+            shard_id: {'connected': not shard.is_closed(), 'latency_ms': _ms(shard.latency)}
+            for shard_id, shard in client.shards.items()
+        }
+        healthy = (client.is_ready() and not client.is_closed() and bool(shards) and self.lag < MAX_LAG
+                   and all(shard['connected'] and shard['latency_ms'] is not None
+                           and shard['latency_ms'] < MAX_LATENCY * 1000 for shard in shards.values()))
+        return healthy, {
+            'status': 'healthy' if healthy else 'unhealthy',
+            'bot': 'online' if client.is_ready() and not client.is_closed() else 'offline',
+            'latency_ms': _ms(client.latency),
+            'loop_lag_ms': _ms(self.lag),
+            'games': len(client.sessions),
+            'shards': shards,
+        }
+
+    async def home(self, request):
+        return web.Response(text='Coup Discord Bot is running!')
+
+    async def health(self, request):
+        healthy, details = self.status()
+        return web.json_response(details, status=200 if healthy else 503)
+
+    async def metrics(self, request):
+        return web.Response(text=metrics.render(metrics.METRICS + self.gauges),
+                            headers={'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'})
+
+    async def close(self):
+        if self.monitor is not None:
+            self.monitor.cancel()
+        if self.runner is not None:
+            await self.runner.cleanup()
@@ -0,0 +1,132 @@
+"""
+SQLite leaderboard storage
+One row per (guild, player) with wins and losses, indexed for top-N queries.
+All database work runs on a single background thread so the event loop never
+blocks on disk; game results are queued and written in batched upserts.
+Several bot processes (see supervisor.py) can share one database file: writes
+are upserts, so no process overwrites another's results.
+"""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+SCHEMA_VERSION = 1
+BUSY_TIMEOUT = 30   # seconds to wait for another process's write to finish
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    guild_id INTEGER NOT NULL,
+    user_id  INTEGER NOT NULL,
+    wins     INTEGER NOT NULL DEFAULT 0,
+    losses   INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, user_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS records_rank ON records (guild_id, wins DESC, (wins + losses) DESC);
+"""
+
+UPSERT = """
+INSERT INTO records (guild_id, user_id, wins, losses) VALUES (?, ?, ?, ?)
+ON CONFLICT (guild_id, user_id) DO UPDATE SET
+    wins = wins + excluded.wins,
+    losses = losses + excluded.losses
+"""
+
+TOP = """
+SELECT user_id, wins, losses FROM records
+WHERE guild_id = ?
+ORDER BY wins DESC, wins + losses DESC
+LIMIT ?
+"""
+
+
+class LeaderboardStore:
+    """Per-guild win/loss records. record() never blocks; top() and flush() are awaited."""
+
+    def __init__(self, path='leaderboard.db', legacy_json='leaderboard.json'):
+        # one thread owns the connection, so every query and write is serialized
+        self.executor = ThreadPoolExecutor(1, thread_name_prefix='leaderboard')
+        self.lock = threading.Lock()
+        self.pending = {}   # (guild_id, user_id) -> [wins, losses] not yet written
+        self.flushing = None
+        self.db = self.executor.submit(self._open, path, legacy_json).result()
+
+    def _open(self, path, legacy_json):
+        db = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.executescript(SCHEMA)
+        with db:
+            # processes starting together wait here, so only the first one migrates
+            db.execute('BEGIN IMMEDIATE')
+            if db.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+                self._migrate(db, legacy_json)
+                db.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+        return db
+
+    @staticmethod
+    def _migrate(db, legacy_json):
+        """One-shot import of the old leaderboard.json ({guild: {user: {wins, losses}}})"""
+        if not legacy_json or not os.path.exists(legacy_json):
+            return
+        with open(legacy_json) as f:
+            leaderboard = json.load(f)
+        db.executemany(UPSERT, [
+            (int(guild_id), int(user_id), stats.get('wins', 0), stats.get('losses', 0))
+            for guild_id, players in leaderboard.items()
+            for user_id, stats in players.items()
+        ])
+        print(f"Migrated {legacy_json} into the leaderboard database")
+
+    def record(self, guild_id, winner_id, player_ids):
+        """Queue a finished game: winner gets a win (None when an AI won), every other player a loss"""
+        with self.lock:
+            for player_id in player_ids:
+                stats = self.pending.setdefault((guild_id, player_id), [0, 0])
+                stats[0 if player_id == winner_id else 1] += 1
+        self.flush()
+
+    def flush(self):
+        """Write everything queued so far. Returns an awaitable that finishes when it's on disk."""
+        with self.lock:
+            if self.flushing is None:
+                self.flushing = asyncio.get_running_loop().run_in_executor(self.executor, self._write)
+            return self.flushing
+
+    def _write(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            # results queued from now on start a new flush
+            self.flushing = None
+        if not pending:
+            return
+        try:
+            with self.db:
+                self.db.executemany(UPSERT, [(guild_id, user_id, wins, losses)
+                                             for (guild_id, user_id), (wins, losses) in pending.items()])
+        except sqlite3.Error as e:
+            # e.g. still locked by another process after BUSY_TIMEOUT: keep the results for the next flush
+            print(f"[LEADERBOARD] Could not write {len(pending)} results, will retry: {e!r}")
+            with self.lock:
+                for key, (wins, losses) in pending.items():
+                    stats = self.pending.setdefault(key, [0, 0])
+                    stats[0] += wins
+                    stats[1] += losses
+
+    async def top(self, guild_id, limit=10):
+        """[(user_id, wins, losses)] for the best players in a guild, by wins then games played"""
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._top, guild_id, limit)
+
+    def _top(self, guild_id, limit):
+        return self.db.execute(TOP, (guild_id, limit)).fetchall()
+
+    def close(self):
+        """Write anything still queued and close the database (blocking)"""
+        self.executor.submit(self._write).result()
+        self.executor.submit(self.db.close).result()
+        self.executor.shutdown()
@@ -0,0 +1,625 @@
+"""
+Load test against a local stand-in for Discord
+Serves a fake gateway and REST API on localhost, starts the real bot (bot.py)
+in a subprocess pointed at it, and has scripted virtual users play N games at
+once by clicking the same lobby and prompt buttons real players would. Reports
+turns per second, interaction-to-response latency, event loop lag (from the
+bot's /metrics) and memory per game.
+
+    python loadtest.py --games 20 --players 4
+    python loadtest.py --games 100 --shards 4 --think 0.5 3
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import re
+import signal
+import socket
+import sys
+import tempfile
+import time
+
+import aiohttp
+from aiohttp import web
+
+TIMESTAMP = '2025-01-01T00:00:00.000000+00:00'
+PERMISSIONS = str((1 << 41) - 1)    # everything a bot could need
+EPHEMERAL = 64
+# interaction callback types
+CHANNEL_MESSAGE, DEFERRED_MESSAGE, DEFERRED_UPDATE, UPDATE_MESSAGE = 4, 5, 6, 7
+PROMPT_ID = re.compile(r'coup:(\d+):\d+:([a-z]+)(?:\.\d+)?:(-?\d+)')
+FIRST_NAME = re.compile(r'\*\*(.+?)\*\*')
+KEEP = re.compile(r'Choose \*\*(\d) card')
+RESPONSE_TIMEOUT = 15   # seconds a virtual user waits for the bot to answer a click
+HEARTBEAT_RTT = 0.05    # seconds the fake gateway takes to acknowledge a heartbeat
+
+# a millisecond apart, so guilds spread over shards ((id >> 22) % shards) like real ones
+_ids = itertools.count(1 << 50, 1 << 22)
+
+
+def snowflake():
+    return str(next(_ids))
+
+
+def user_payload(user_id, name, bot=False):
+    return {'id': user_id, 'username': name, 'global_name': name, 'discriminator': '0', 'avatar': None, 'bot': bot}
+
+
+def member_payload(user):
+    return {'user': user, 'roles': [], 'joined_at': TIMESTAMP, 'deaf': False, 'mute': False, 'flags': 0,
+            'nick': None, 'permissions': PERMISSIONS}
+
+
+def json_response(data, status=200, headers=None):
+    # discord.py only decodes bodies whose Content-Type is exactly application/json (no charset)
+    return web.Response(body=json.dumps(data).encode(), status=status,
+                        headers={'Content-Type': 'application/json', **(headers or {})})
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))] if values else float('nan')
+
+
+# ============================================================================
+# FAKE DISCORD - gateway and the REST routes the bot uses
+# ============================================================================
+
+class FakeDiscord:
+    """Gateway websocket plus REST API. Messages the bot sends are kept and handed to the game in their channel."""
+
+    def __init__(self, shards=1, rate_limit=(50, 1.0)):
+        self.shards = shards
+        self.rate_limit = rate_limit    # (requests, seconds) allowed per message route and channel
+        self.windows = {}       # (method, channel id) -> [window end, requests left]
+        self.application_id = snowflake()
+        self.bot = user_payload(snowflake(), 'Coup Bot', bot=True)
+        self.owner = user_payload(snowflake(), 'owner')
+        self.guilds = {}        # guild id -> (guild payload, channel id)
+        self.games = {}         # channel id -> VirtualGame
+        self.messages = {}      # message id -> message payload
+        self.sockets = {}       # shard id -> gateway websocket
+        self.ready = {}         # shard id -> asyncio.Event set once its guilds were sent
+        self.interactions = {}  # token -> Interaction waiting on (or answered by) the bot
+        self.latencies = []     # seconds from INTERACTION_CREATE to the bot's callback
+        self.sequence = itertools.count(1)
+        self.acks = set()       # heartbeat acks being sent
+        self.url = None
+
+    # ---- setup ----
+
+    def add_guild(self, game, names):
+        """A guild with one text channel and a member per name; returns (channel id, member payloads)"""
+        guild_id, channel_id = snowflake(), snowflake()
+        members = [member_payload(user_payload(snowflake(), name)) for name in names]
+        channel = {'id': channel_id, 'type': 0, 'guild_id': guild_id, 'name': 'coup', 'position': 0,
+                   'permission_overwrites': [], 'nsfw': False, 'parent_id': None, 'topic': None,
+                   'rate_limit_per_user': 0}
+        guild = {
+            'id': guild_id, 'name': f'Load test {len(self.guilds) + 1}', 'icon': None, 'owner_id': self.owner['id'],
+            'roles': [{'id': guild_id, 'name': '@everyone', 'permissions': PERMISSIONS, 'position': 0, 'color': 0,
+                       'hoist': False, 'managed': False, 'mentionable': False, 'flags': 0}],
+            'channels': [channel], 'members': members + [member_payload(self.bot)], 'member_count': len(members) + 1,
+            'large': False, 'unavailable': False, 'emojis': [], 'stickers': [], 'features': [], 'threads': [],
+            'presences': [], 'voice_states': [], 'stage_instances': [], 'guild_scheduled_events': [],
+            'soundboard_sounds': [], 'joined_at': TIMESTAMP, 'verification_level': 0,
+            'default_message_notifications': 0, 'explicit_content_filter': 0, 'mfa_level': 0, 'premium_tier': 0,
+            'system_channel_id': None, 'afk_channel_id': None, 'preferred_locale': 'en-US', 'nsfw_level': 0,
+            'premium_progress_bar_enabled': False,
+        }
+        self.guilds[guild_id] = (guild, channel_id)
+        self.games[channel_id] = game
+        return guild_id, channel, members
+
+    def shard_of(self, guild_id):
+        return (int(guild_id) >> 22) % self.shards
+
+    async def start(self, port=0):
+        app = web.Application()
+        app.router.add_get('/gateway', self.gateway)
+        api = '/api/v10'
+        routes = [
+            ('GET', '/gateway/bot', self.get_gateway),
+            ('GET', '/gateway', self.get_gateway),
+            ('GET', '/users/@me', lambda request: json_response(self.bot)),
+            ('GET', '/oauth2/applications/@me', self.get_application),
+            ('PUT', '/applications/{app}/commands', lambda request: json_response([])),
+            ('POST', '/users/@me/channels', self.create_dm),
+            ('POST', '/channels/{channel}/messages', self.create_message),
+            ('PATCH', '/channels/{channel}/messages/{message}', self.edit_message),
+            ('DELETE', '/channels/{channel}/messages/{message}', self.delete_message),
+            ('POST', '/interactions/{interaction}/{token}/callback', self.interaction_callback),
+            ('POST', '/webhooks/{app}/{token}', self.followup),
+            ('PATCH', '/webhooks/{app}/{token}/messages/{message}', self.edit_followup),
+        ]
+        for method, path, handler in routes:
+            app.router.add_route(method, api + path, handler)
+        app.router.add_route('*', api + '/{tail:.*}', self.not_found)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, '127.0.0.1', port)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    async def close(self):
+        for ws in list(self.sockets.values()):
+            await ws.close()
+        await self.runner.cleanup()
+
+    # ---- gateway ----
+
+    async def dispatch(self, guild_id, event, data):
+        ws = self.sockets.get(self.shard_of(guild_id))
+        if ws is not None and not ws.closed:
+            await ws.send_str(json.dumps({'op': 0, 's': next(self.sequence), 't': event, 'd': data}))
+
+    async def gateway(self, request):
+        ws = web.WebSocketResponse(compress=False)
+        await ws.prepare(request)
+        await ws.send_json({'op': 10, 's': None, 't': None, 'd': {'heartbeat_interval': 41250}})
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                continue
+            payload = json.loads(msg.data)
+            if payload['op'] == 1:
+                ack = asyncio.create_task(self.heartbeat_ack(ws))
+                self.acks.add(ack)
+                ack.add_done_callback(self.acks.discard)
+            elif payload['op'] == 2:
+                await self.identify(ws, payload['d'])
+        return ws
+
+    async def heartbeat_ack(self, ws):
+        # discord.py notes the send time after the heartbeat goes out, so an instant ack would read as a full
+        # heartbeat interval of latency
+        await asyncio.sleep(HEARTBEAT_RTT)
+        if not ws.closed:
+            await ws.send_json({'op': 11, 's': None, 't': None, 'd': None})
+
+    async def identify(self, ws, identify):
+        shard_id, _ = identify.get('shard', [0, 1])
+        self.sockets[shard_id] = ws
+        guilds = [guild for guild, _ in self.guilds.values() if self.shard_of(guild['id']) == shard_id]
+        await self.dispatch_to(ws, 'READY', {
+            'v': 10, 'user': self.bot, 'session_id': snowflake(), 'resume_gateway_url': self.url + '/gateway',
+            'guilds': [{'id': guild['id'], 'unavailable': True} for guild in guilds], 'shard': [shard_id, self.shards],
+            'application': {'id': self.application_id, 'flags': 0}, 'private_channels': [], 'relationships': [],
+        })
+        for guild in guilds:
+            await self.dispatch_to(ws, 'GUILD_CREATE', guild)
+        self.ready.setdefault(shard_id, asyncio.Event()).set()
+
+    async def dispatch_to(self, ws, event, data):
+        await ws.send_str(json.dumps({'op': 0, 's': next(self.sequence), 't': event, 'd': data}))
+
+    # ---- REST ----
+
+    async def get_gateway(self, request):
+        return json_response({'url': self.url.replace('http', 'ws') + '/gateway', 'shards': self.shards,
+                                  'session_start_limit': {'total': 1000, 'remaining': 1000,
+                                                          'reset_after': 0, 'max_concurrency': self.shards}})
+
+    async def get_application(self, request):
+        return json_response({'id': self.application_id, 'name': 'Coup Bot', 'icon': None, 'description': '',
+                                  'bot_public': True, 'bot_require_code_grant': False, 'owner': self.owner,
+                                  'verify_key': '0', 'flags': 0, 'team': None, 'summary': ''})
+
+    async def not_found(self, request):
+        return json_response({'message': f'{request.method} {request.path} is not faked', 'code': 0}, status=404)
+
+    async def create_dm(self, request):
+        return json_response({'id': snowflake(), 'type': 1, 'recipients': [self.owner], 'last_message_id': None})
+
+    def new_message(self, channel_id, body, author=None, flags=0):
+        message = {
+            'id': snowflake(), 'channel_id': channel_id, 'author': author or self.bot, 'timestamp': TIMESTAMP,
+            'edited_timestamp': None, 'tts': False, 'mention_everyone': False, 'mentions': [], 'mention_roles': [],
+            'attachments': [], 'pinned': False, 'type': 0, 'flags': flags | (body.get('flags') or 0),
+            'content': body.get('content') or '', 'embeds': body.get('embeds') or [],
+            'components': body.get('components') or [],
+        }
+        self.messages[message['id']] = message
+        return message
+
+    def update_message(self, message, body):
+        for key, empty in (('content', ''), ('embeds', []), ('components', [])):
+            if key in body:
+                message[key] = body[key] or empty
+        message['edited_timestamp'] = TIMESTAMP
+        self.notify(message)
+        return message
+
+    def notify(self, message):
+        """Show a message to the game in its channel (ephemeral ones only reach the clicker)"""
+        game = self.games.get(message['channel_id'])
+        if game is not None and not message['flags'] & EPHEMERAL:
+            game.seen(message)
+
+    def rate_limit_headers(self, request):
+        """Count a message request against its route's window like Discord does: (X-RateLimit-* headers, whether
+        the window was already used up)"""
+        limit, per = self.rate_limit
+        now = time.monotonic()
+        key = (request.method, request.match_info['channel'])
+        window = self.windows.get(key)
+        if window is None or now >= window[0]:
+            window = self.windows[key] = [now + per, limit]
+        limited = window[1] == 0
+        window[1] = max(0, window[1] - 1)
+        reset_after = window[0] - now
+        return {
+            'X-RateLimit-Limit': str(limit), 'X-RateLimit-Remaining': str(window[1]),
+            'X-RateLimit-Reset': f"{time.time() + reset_after:.3f}", 'X-RateLimit-Reset-After': f"{reset_after:.3f}",
+            'X-RateLimit-Bucket': f"{request.method}-messages", 'Via': '1.1 google',
+        }, limited
+
+    def too_many_requests(self, headers):
+        return json_response({'message': 'You are being rate limited.', 'global': False,
+                              'retry_after': float(headers['X-RateLimit-Reset-After'])}, 429, headers)
+
+    async def create_message(self, request):
+        headers, limited = self.rate_limit_headers(request)
+        if limited:
+            return self.too_many_requests(headers)
+        message = self.new_message(request.match_info['channel'], await request.json())
+        self.notify(message)
+        return json_response(message, headers=headers)
+
+    async def edit_message(self, request):
+        headers, limited = self.rate_limit_headers(request)
+        if limited:
+            return self.too_many_requests(headers)
+        message = self.messages.get(request.match_info['message'])
+        if message is None:
+            return await self.not_found(request)
+        return json_response(self.update_message(message, await request.json()), headers=headers)
+
+    async def delete_message(self, request):
+        headers, limited = self.rate_limit_headers(request)
+        if limited:
+            return self.too_many_requests(headers)
+        self.messages.pop(request.match_info['message'], None)
+        return web.Response(status=204, headers=headers)
+
+    async def interaction_callback(self, request):
+        interaction = self.interactions.get(request.match_info['token'])
+        if interaction is None:
+            return await self.not_found(request)
+        body = await request.json()
+        kind, data = body['type'], body.get('data') or {}
+        message = None
+        if kind == UPDATE_MESSAGE:
+            message = self.update_message(interaction.message, data)
+        elif kind == CHANNEL_MESSAGE:
+            message = self.new_message(interaction.message['channel_id'], data)
+            self.notify(message)
+        interaction.answer(kind, message)
+        self.latencies.append(interaction.latency)
+        reply = {'interaction': {'id': interaction.id, 'type': 3, 'response_message_loading': kind == DEFERRED_MESSAGE,
+                                 'response_message_ephemeral': bool(message and message['flags'] & EPHEMERAL)}}
+        if message is not None:
+            reply['interaction']['response_message_id'] = message['id']
+            reply['resource'] = {'type': kind, 'message': message}
+        return json_response(reply)
+
+    async def followup(self, request):
+        interaction = self.interactions.get(request.match_info['token'])
+        if interaction is None:
+            return await self.not_found(request)
+        message = self.new_message(interaction.message['channel_id'], await request.json())
+        self.notify(message)
+        return json_response(message)
+
+    async def edit_followup(self, request):
+        interaction = self.interactions.get(request.match_info['token'])
+        message = interaction and (interaction.response if request.match_info['message'] == '@original'
+                                   else self.messages.get(request.match_info['message']))
+        if message is None:
+            return await self.not_found(request)
+        return json_response(self.update_message(message, await request.json()))
+
+
+class Interaction:
+    """One button click sent to the bot, answered when its callback arrives"""
+
+    def __init__(self, discord, guild_id, channel, member, message, custom_id):
+        self.id = snowflake()
+        self.token = f"token-{self.id}"
+        self.message = message
+        self.sent = time.perf_counter()
+        self.latency = None
+        self.response = None
+        self.answered = asyncio.get_running_loop().create_future()
+        self.payload = {
+            'id': self.id, 'application_id': discord.application_id, 'type': 3, 'token': self.token, 'version': 1,
+            'data': {'custom_id': custom_id, 'component_type': 2}, 'guild_id': guild_id,
+            'channel_id': channel['id'], 'channel': channel, 'member': member, 'message': message,
+            'app_permissions': PERMISSIONS, 'locale': 'en-US', 'guild_locale': 'en-US', 'entitlements': [],
+            'authorizing_integration_owners': {'0': guild_id}, 'context': 0, 'attachment_size_limit': 8388608,
+        }
+
+    def answer(self, kind, message):
+        self.latency = time.perf_counter() - self.sent
+        self.response = message
+        if not self.answered.done():
+            self.answered.set_result((kind, message))
+
+
+# ============================================================================
+# VIRTUAL USERS - one scripted game per channel
+# ============================================================================
+
+def buttons(message):
+    """[(custom_id, label)] of the message's enabled buttons"""
+    return [(button['custom_id'], button.get('label', ''))
+            for row in message.get('components') or [] for button in row.get('components', [])
+            if button.get('custom_id') and not button.get('disabled')]
+
+
+class VirtualGame:
+    """Players in one channel: the host types c!start, everyone joins, then they answer every prompt"""
+
+    def __init__(self, discord, number, players, think):
+        self.discord = discord
+        self.think = think
+        names = [f"g{number}p{seat + 1}" for seat in range(players)]
+        self.guild_id, self.channel, self.members = discord.add_guild(self, names)
+        self.by_name = {member['user']['username']: member for member in self.members}
+        self.handled = set()        # prompt custom_id prefixes already answered
+        self.tasks = set()
+        self.clicks = self.rejected = 0
+        self.done = asyncio.Event()
+        self.result = None
+
+    async def play(self):
+        host = self.members[0]
+        message = self.discord.new_message(self.channel['id'], {'content': 'c!start'}, author=host['user'])
+        message['guild_id'] = self.guild_id
+        message['member'] = {key: value for key, value in host.items() if key != 'user'}
+        await self.discord.dispatch(self.guild_id, 'MESSAGE_CREATE', message)
+        await self.done.wait()
+
+    def seen(self, message):
+        """The bot sent or edited a message in our channel"""
+        for embed in message.get('embeds') or []:
+            if (embed.get('title') or '').startswith('👑 Coup Concluded'):
+                self.result = 'won'
+                self.done.set()
+            elif (embed.get('title') or '').startswith('❌ Not Enough Players'):
+                self.result = 'failed'
+                self.done.set()
+        ids = buttons(message)
+        if not ids or self.done.is_set():
+            return
+        if ids[0][0] == 'lobby_join' and 'lobby' not in self.handled:
+            self.handled.add('lobby')
+            self.spawn(self.lobby(message))
+            return
+        match = PROMPT_ID.match(ids[0][0])
+        if match is None or match[2] == 'cards':
+            return
+        prompt = ids[0][0].rsplit(':', 1)[0]
+        if prompt in self.handled:
+            return
+        self.handled.add(prompt)
+        self.spawn(self.answer(match[2], message, ids))
+
+    def spawn(self, coroutine):
+        task = asyncio.create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def click(self, member, message, custom_id):
+        """Press a button as member; returns (callback type, message the bot answered with)"""
+        interaction = Interaction(self.discord, self.guild_id, self.channel, member, message, custom_id)
+        self.discord.interactions[interaction.token] = interaction
+        self.clicks += 1
+        await self.discord.dispatch(self.guild_id, 'INTERACTION_CREATE', interaction.payload)
+        try:
+            kind, response = await asyncio.wait_for(interaction.answered, RESPONSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            return None, None
+        if response is not None and response['flags'] & EPHEMERAL and response['content'].startswith(('❌', 'ℹ️', '⌛')):
+            self.rejected += 1
+        return kind, response
+
+    async def pause(self):
+        await asyncio.sleep(random.uniform(*self.think))
+
+    async def lobby(self, message):
+        for member in self.members[1:]:
+            await self.pause()
+            await self.click(member, message, 'lobby_join')
+        await self.pause()
+        await self.click(self.members[0], message, 'lobby_start')
+
+    async def answer(self, kind, message, ids):
+        """Answer a prompt for whichever players it is waiting on"""
+        embed = (message.get('embeds') or [{}])[-1]
+        named = FIRST_NAME.search(embed.get('description') or '')
+        named = named[1] if named else None
+        options = {int(custom_id.rsplit(':', 1)[1]): custom_id for custom_id, _ in ids}
+        if kind == 'challenge' or (kind == 'block' and 0 in options):
+            # anyone but the claimant may challenge, anyone but the actor may block Foreign Aid with Duke
+            players = [member for name, member in self.by_name.items() if name != named]
+        else:
+            players = [self.by_name[named]] if named in self.by_name else []
+        await asyncio.gather(*(self.play_prompt(kind, member, message, options) for member in players))
+
+    async def play_prompt(self, kind, member, message, options):
+        await self.pause()
+        if kind == 'challenge':
+            await self.click(member, message, options[0 if random.random() < 0.1 else 1])
+        elif kind == 'block':
+            blocks = [option for option in options if option >= 0]
+            choice = random.choice(blocks) if blocks and random.random() < 0.2 else -1
+            await self.click(member, message, options[choice])
+        elif kind == 'lose':
+            _, confirm = await self.click(member, message, random.choice(list(options.values())))
+            if confirm is not None and buttons(confirm):
+                await self.pause()
+                await self.click(member, confirm, buttons(confirm)[0][0])
+        elif kind == 'exchange':
+            # the first click shows the cards and how many to keep
+            _, shown = await self.click(member, message, options[0])
+            keep = KEEP.search(json.dumps(shown['embeds']) if shown else '')
+            for option in sorted(options)[:int(keep[1]) if keep else 1]:
+                await self.pause()
+                await self.click(member, message, options[option])
+        else:
+            await self.click(member, message, random.choice(list(options.values())))
+
+
+# ============================================================================
+# RUN
+# ============================================================================
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def resident_memory(pid):
+    """Resident set size of a process in bytes (Linux), or None"""
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def parse_metrics(text):
+    """{name: value} for unlabelled samples of Prometheus text"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith('#') and '{' not in line:
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+
+class Monitor:
+    """Samples the bot's /metrics and memory while the games run"""
+
+    def __init__(self, url, pid):
+        self.url = url
+        self.pid = pid
+        self.lags = []
+        self.memory = []
+
+    async def scrape(self, http):
+        async with http.get(self.url + '/metrics') as response:
+            return parse_metrics(await response.text())
+
+    async def run(self, http, interval=1.0):
+        while True:
+            try:
+                samples = await self.scrape(http)
+                self.lags.append(samples.get('coup_event_loop_lag_seconds', 0.0))
+            except aiohttp.ClientError:
+                pass
+            memory = resident_memory(self.pid)
+            if memory is not None:
+                self.memory.append(memory)
+            await asyncio.sleep(interval)
+
+
+async def wait_healthy(http, url, bot, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if bot.returncode is not None:
+            raise RuntimeError(f"bot exited with {bot.returncode}")
+        try:
+            async with http.get(url + '/health') as response:
+                if response.status == 200:
+                    return
+        except aiohttp.ClientError:
+            pass
+        await asyncio.sleep(0.25)
+    raise RuntimeError("bot did not become healthy")
+
+
+async def run(args):
+    fake = FakeDiscord(args.shards, (int(args.rate_limit[0]), args.rate_limit[1]))
+    await fake.start()
+    games = [VirtualGame(fake, number + 1, args.players, args.think) for number in range(args.games)]
+
+    workdir = tempfile.mkdtemp(prefix='coup-loadtest-')
+    health = f"http://127.0.0.1:{free_port()}"
+    env = dict(os.environ, DISCORD_TOKEN='loadtest', DISCORD_API_URL=fake.url + '/api/v10',
+               PORT=health.rsplit(':', 1)[1], CHECKPOINT_DIR=os.path.join(workdir, 'checkpoints'),
+               LEADERBOARD_DB=os.path.join(workdir, 'leaderboard.db'), GAME_LOG_DIR=os.path.join(workdir, 'game_logs'))
+    env.pop('SHARD_COUNT', None)
+    env.pop('SHARD_IDS', None)
+    log_path = os.path.join(workdir, 'bot.log')
+    bot_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bot.py')
+    with open(log_path, 'wb') as log:
+        bot = await asyncio.create_subprocess_exec(sys.executable, bot_script, cwd=workdir, env=env,
+                                                   stdout=log, stderr=asyncio.subprocess.STDOUT)
+    print(f"bot pid {bot.pid}, log {log_path}")
+    async with aiohttp.ClientSession() as http:
+        try:
+            await wait_healthy(http, health, bot, 60)
+            monitor = Monitor(health, bot.pid)
+            before = await monitor.scrape(http)
+            baseline = resident_memory(bot.pid)
+            sampling = asyncio.create_task(monitor.run(http))
+            start = time.perf_counter()
+            await asyncio.wait([asyncio.create_task(game.play()) for game in games], timeout=args.timeout)
+            elapsed = time.perf_counter() - start
+            after = await monitor.scrape(http)
+            sampling.cancel()
+        finally:
+            if bot.returncode is None:
+                bot.send_signal(signal.SIGINT)
+                try:
+                    await asyncio.wait_for(bot.wait(), 15)
+                except asyncio.TimeoutError:
+                    bot.kill()
+            await fake.close()
+
+    finished = sum(game.result == 'won' for game in games)
+    turns = after.get('coup_turns_total', 0) - before.get('coup_turns_total', 0)
+    clicks = sum(game.clicks for game in games)
+    rejected = sum(game.rejected for game in games)
+    latencies = [latency * 1000 for latency in fake.latencies]
+    print(f"games:        {finished}/{len(games)} finished in {elapsed:.1f}s ({args.players} players each)")
+    print(f"turns:        {turns:.0f} ({turns / elapsed:.2f} turns/s)")
+    print(f"interactions: {clicks} clicks, {len(latencies)} answered, {rejected} rejected by the bot")
+    print(f"  response:   p50 {percentile(latencies, 0.5):.1f} ms, p99 {percentile(latencies, 0.99):.1f} ms, "
+          f"max {max(latencies, default=float('nan')):.1f} ms")
+    requests = after.get('coup_rest_requests_total', 0) - before.get('coup_rest_requests_total', 0)
+    limited = after.get('coup_rest_rate_limited_total', 0) - before.get('coup_rest_rate_limited_total', 0)
+    print(f"REST:         {requests:.0f} requests, {limited:.0f} answered 429 Too Many Requests")
+    if monitor.lags:
+        print(f"loop lag:     mean {sum(monitor.lags) / len(monitor.lags) * 1000:.1f} ms, "
+              f"max {max(monitor.lags) * 1000:.1f} ms")
+    if baseline and monitor.memory:
+        peak = max(monitor.memory)
+        print(f"memory:       {baseline / 2**20:.1f} MB idle, {peak / 2**20:.1f} MB peak, "
+              f"{(peak - baseline) / len(games) / 1024:.0f} KB per game")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the bot against a local fake Discord")
+    parser.add_argument('--games', type=int, default=10, help="games played at once")
+    parser.add_argument('--players', type=int, default=3, choices=range(2, 7), help="players per game")
+    parser.add_argument('--think', type=float, nargs=2, default=(0.2, 1.0), metavar=('MIN', 'MAX'),
+                        help="seconds each virtual user waits before clicking")
+    parser.add_argument('--shards', type=int, default=1, help="shards the fake gateway asks the bot to run")
+    parser.add_argument('--timeout', type=float, default=900, help="seconds before unfinished games are abandoned")
+    parser.add_argument('--rate-limit', type=float, nargs=2, default=(50, 1.0), metavar=('REQUESTS', 'SECONDS'),
+                        help="limit the fake puts on sends, edits and deletes, each per channel (e.g. 5 5)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""
+Prometheus metrics
+Counters and histograms the bot updates as it runs, rendered in Prometheus's
+text format by the health server's /metrics (see health_server.py). Everything
+is updated from the event loop, so there is no locking.
+"""
+
+import math
+import time
+from bisect import bisect_left
+
+import aiohttp
+
+# seconds; players take anywhere from a moment to the full prompt timeout
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+# seconds; Discord API calls and our own work around them
+API_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def _format(value):
+    if value == math.inf:
+        return '+Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels.items()) + '}'
+
+
+class Counter:
+    """A count that only goes up"""
+
+    def __init__(self, name, help):
+        self.name = name
+        self.help = help
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} counter"
+        yield f"{self.name} {_format(self.value)}"
+
+
+class Gauge:
+    """A value read from read() whenever metrics are scraped"""
+
+    def __init__(self, name, help, read):
+        self.name = name
+        self.help = help
+        self.read = read
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} gauge"
+        yield f"{self.name} {_format(self.read())}"
+
+
+class Histogram:
+    """Observations counted into cumulative buckets, plus their sum and count,
+    kept separately for every combination of label values"""
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.bounds = tuple(buckets) + (math.inf,)
+        self.series = {}    # label values -> [bucket counts, sum]
+        if not labelnames:
+            self.series[()] = [[0] * len(self.bounds), 0.0]
+
+    def observe(self, value, *labels):
+        """Count value under the label values given, in labelnames order"""
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * len(self.bounds), 0.0]
+        series[0][bisect_left(self.bounds, value)] += 1
+        series[1] += value
+
+    def render(self):
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} histogram"
+        for values, (counts, total_value) in self.series.items():
+            labels = dict(zip(self.labelnames, values))
+            total = 0
+            for bound, count in zip(self.bounds, counts):
+                total += count
+                yield f"{self.name}_bucket{_labels({**labels, 'le': _format(bound)})} {total}"
+            yield f"{self.name}_sum{_labels(labels)} {_format(total_value)}"
+            yield f"{self.name}_count{_labels(labels)} {total}"
+
+
+DECISIONS = Counter('coup_decisions_total', "Decisions submitted to game engines")
+TURNS = Counter('coup_turns_total', "Turns taken (actions chosen); rate() gives turns per second")
+# A prompt's wall time is split three ways: players thinking, AI seats searching, and the rest
+# (rendering, engine, sending the prompt and its events), which is bot-side overhead
+PROMPT_LATENCY = Histogram('coup_prompt_latency_seconds', "Time from a prompt being reached until it was answered",
+                           ('phase', 'guild'))
+HUMAN_THINK = Histogram('coup_human_think_seconds', "Time from a prompt's buttons going up until players answered or it timed out",
+                        ('phase', 'guild'))
+AI_THINK = Histogram('coup_ai_think_seconds', "Time AI seats spent searching for their answer to a prompt",
+                     ('phase', 'guild'))
+BOT_OVERHEAD = Histogram('coup_bot_overhead_seconds', "Prompt time that was neither human nor AI thinking",
+                         ('phase', 'guild'), API_BUCKETS)
+OUTBOX_WAIT = Histogram('coup_outbox_wait_seconds', "Time messages waited in an outbound queue (including rate limiting)",
+                        ('route',), API_BUCKETS)
+REST_LATENCY = Histogram('coup_rest_latency_seconds', "Discord REST API response time", ('method',), API_BUCKETS)
+REST_REQUESTS = Counter('coup_rest_requests_total', "Discord REST API requests sent")
+REST_RATE_LIMITED = Counter('coup_rest_rate_limited_total', "Discord REST API responses that were 429 Too Many Requests")
+
+METRICS = [DECISIONS, TURNS, PROMPT_LATENCY, HUMAN_THINK, AI_THINK, BOT_OVERHEAD, OUTBOX_WAIT,
+           REST_LATENCY, REST_REQUESTS, REST_RATE_LIMITED]
+
+
+def render(metrics=METRICS):
+    """Prometheus text exposition of metrics"""
+    return '\n'.join(line for metric in metrics for line in metric.render()) + '\n'
+
+
+def rest_trace(on_response=None):
+    """aiohttp.TraceConfig timing REST requests and counting 429s, for discord.Client(http_trace=...).
+    on_response(method, path, headers) sees every REST response, e.g. to follow its rate limit headers."""
+    async def on_request_start(session, context, params):
+        # the gateway websocket goes through the same session; only count the REST API
+        context.start = None
+        if params.url.path.startswith('/api/'):
+            REST_REQUESTS.inc()
+            context.start = time.perf_counter()
+
+    async def on_request_end(session, context, params):
+        if context.start is not None:
+            REST_LATENCY.observe(time.perf_counter() - context.start, params.method)
+            if on_response is not None:
+                on_response(params.method, params.url.path, params.response.headers)
+        if params.response.status == 429:
+            REST_RATE_LIMITED.inc()
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_request_start)
+    trace.on_request_end.append(on_request_end)
+    return trace
@@ -0,0 +1,218 @@
+"""
+Outbound message scheduling
+Every game channel gets an Outbox with a queue per kind of request Discord rate
+limits separately (sends, edits, deletes), each worked off by its own task. Sends
+go out in the order they were queued, so a prompt never overtakes the events that
+led to it; cosmetic edits and deletes (LOG) give way to the rest, and a newer
+edit to a message still waiting in the queue is merged into the queued one.
+Each route's limit starts as a guess and then follows the X-RateLimit-* headers
+Discord sends back (see learn()), plus one token bucket shared by all channels,
+so we keep to Discord's limits without running into 429s or going slower.
+"""
+
+import asyncio
+import itertools
+import os
+import re
+import time
+
+import metrics
+
+PROMPT = 0      # every send, and edits showing buttons players are waiting on or their outcomes
+LOG = 1         # edits and deletes nobody is waiting on (e.g. the board with no prompt up)
+
+CHANNEL_RATE = (5, 5.0)     # first guess at each route's limit in a channel, until Discord's headers arrive
+GLOBAL_RATE = (50, 1.0)     # Discord allows 50 requests per second per bot
+# processes running shards of the same bot (see supervisor.py) split the global rate
+SHARD_PROCESSES = int(os.getenv('SHARD_PROCESSES', 1))
+
+ROUTES = {'POST': 'send', 'PATCH': 'edit', 'DELETE': 'delete'}
+_MESSAGES_PATH = re.compile(r'/channels/(\d+)/messages(/\d+)?$')
+
+
+class TokenBucket:
+    """Allows `count` operations per `per` seconds, refilled continuously"""
+
+    def __init__(self, count, per):
+        self.capacity = count
+        self.tokens = float(count)
+        self.rate = count / per
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+GLOBAL_BUCKET = TokenBucket(GLOBAL_RATE[0] / SHARD_PROCESSES, GLOBAL_RATE[1])
+
+
+class RouteLimit:
+    """One of Discord's rate limit buckets: `limit` requests per window of `per` seconds, `remaining` of
+    them left until `reset`. Starts from CHANNEL_RATE and is corrected by every response's headers."""
+
+    def __init__(self, limit, per):
+        self.limit = limit
+        self.per = per
+        self.remaining = limit
+        self.reset = None       # time.monotonic() the current window ends, None before the first request
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if self.reset is None or now >= self.reset:
+                self.remaining = self.limit
+                self.reset = now + self.per
+            if self.remaining > 0:
+                self.remaining -= 1
+                return
+            await asyncio.sleep(self.reset - now)
+
+    def update(self, limit, remaining, reset_after):
+        """X-RateLimit-Limit, -Remaining and -Reset-After of a response on this route"""
+        if remaining == limit - 1:
+            # the request opened a new window, so reset_after is the whole window
+            self.per = reset_after
+        self.limit = limit
+        self.remaining = remaining
+        self.reset = time.monotonic() + reset_after
+
+
+_limits = {}    # (channel id, route) -> RouteLimit
+
+
+def learn(method, path, headers):
+    """Update a channel's route limit from a REST response (see metrics.rest_trace).
+    Sends made outside an Outbox count too: Discord puts them in the same bucket."""
+    match = _MESSAGES_PATH.search(path)
+    route = ROUTES.get(method)
+    if match is None or route is None or (route == 'send') != (match[2] is None):
+        return
+    limit = _limits.get((int(match[1]), route))
+    if limit is None:
+        return
+    try:
+        limit.update(int(headers['X-RateLimit-Limit']), int(headers['X-RateLimit-Remaining']),
+                     float(headers['X-RateLimit-Reset-After']))
+    except (KeyError, ValueError):
+        pass
+
+
+class _Job:
+    __slots__ = ('kind', 'message', 'fields', 'future', 'queued')
+
+    def __init__(self, kind, message, fields):
+        self.kind = kind        # 'send', 'edit', 'delete', or None once superseded
+        self.message = message
+        self.fields = fields
+        self.queued = time.perf_counter()
+        self.future = asyncio.get_running_loop().create_future()
+        self.future.add_done_callback(_report)
+
+
+def _report(future):
+    # read the exception so fire-and-forget jobs don't warn; awaiting callers still get it
+    if not future.cancelled() and future.exception() is not None:
+        print(f"[OUTBOX] {future.exception()!r}")
+
+
+class _Route:
+    """Queue, worker task and rate limit for one kind of request in one channel"""
+    __slots__ = ('queue', 'limit', 'worker')
+
+    def __init__(self, limit):
+        self.queue = asyncio.PriorityQueue()
+        self.limit = limit
+        self.worker = None
+
+
+class Outbox:
+    """Queued messages for one channel. send/edit/delete return futures: await them or not."""
+
+    def __init__(self, channel):
+        self.channel = channel
+        self.order = itertools.count()  # FIFO within a priority
+        self.edits = {}                 # message id -> queued edit job
+        self.routes = {}
+        for route in ROUTES.values():
+            limit = _limits.setdefault((channel.id, route), RouteLimit(*CHANNEL_RATE))
+            self.routes[route] = _Route(limit)
+
+    def _put(self, priority, job):
+        route = self.routes[job.kind]
+        route.queue.put_nowait((priority, next(self.order), job))
+        if route.worker is None or route.worker.done():
+            route.worker = asyncio.create_task(self._work(route))
+        return job.future
+
+    def send(self, **fields):
+        """Queue channel.send(**fields) behind the sends before it; the future gives the sent message"""
+        return self._put(PROMPT, _Job('send', None, fields))
+
+    def edit(self, message, priority=PROMPT, **fields):
+        """Queue message.edit(**fields), merged into an edit of it still waiting in the queue"""
+        job = self.edits.get(message.id)
+        if job is not None:
+            job.fields.update(fields)
+            return job.future
+        job = self.edits[message.id] = _Job('edit', message, fields)
+        return self._put(priority, job)
+
+    def delete(self, message, priority=LOG):
+        """Queue message.delete(), dropping edits to it that haven't gone out yet"""
+        job = self.edits.pop(message.id, None)
+        if job is not None:
+            job.kind = None
+            if not job.future.done():
+                job.future.set_result(message)
+        return self._put(priority, _Job('delete', message, {}))
+
+    async def _work(self, route):
+        while not route.queue.empty():
+            _, _, job = route.queue.get_nowait()
+            if job.kind == 'edit' and self.edits.get(job.message.id) is job:
+                # later edits start a new job
+                del self.edits[job.message.id]
+            if job.kind is None:
+                continue
+            await route.limit.acquire()
+            await GLOBAL_BUCKET.acquire()
+            metrics.OUTBOX_WAIT.observe(time.perf_counter() - job.queued, job.kind)
+            try:
+                if job.kind == 'send':
+                    result = await self.channel.send(**job.fields)
+                elif job.kind == 'edit':
+                    result = await job.message.edit(**job.fields)
+                else:
+                    result = await job.message.delete()
+            except Exception as e:
+                # anything a job raises goes to whoever awaits it, unless they stopped waiting (c!stop cancels them)
+                if not job.future.done():
+                    job.future.set_exception(e)
+            else:
+                if not job.future.done():
+                    job.future.set_result(result)
+
+
+class QueuedMessage:
+    """A message sent through an Outbox. edit() and delete() queue and return straight away."""
+
+    def __init__(self, outbox, message):
+        self.outbox = outbox
+        self.message = message
+
+    @property
+    def id(self):
+        return self.message.id
+
+    async def edit(self, priority=PROMPT, **fields):
+        self.outbox.edit(self.message, priority, **fields)
+
+    async def delete(self):
+        self.outbox.delete(self.message)
@@ -0,0 +1,120 @@
+"""
+Sharded deployment
+Runs the bot as several processes, each a normal bot.py connected to its own
+group of shards, so games are spread over every CPU core instead of one event
+loop. All processes share the leaderboard database and checkpoint folder; a
+game lives in the process whose shards have its guild. Processes that exit are
+started again.
+
+    python supervisor.py                                # one process per CPU core
+    SHARD_PROCESSES=4 SHARD_COUNT=16 python supervisor.py
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+
+from dotenv import load_dotenv
+
+GATEWAY_URL = 'https://discord.com/api/v10/gateway/bot'
+IDENTIFY_SECONDS = 5    # Discord allows max_concurrency shard logins per 5 seconds
+RESTART_DELAY = 5       # seconds before a process that exited is started again
+
+
+def recommended_shards(token):
+    """(shard count Discord recommends for the bot, shards allowed to log in at once)"""
+    request = urllib.request.Request(GATEWAY_URL, headers={
+        'Authorization': f'Bot {token}',
+        'User-Agent': 'coupbot supervisor',
+    })
+    with urllib.request.urlopen(request, timeout=30) as response:
+        gateway = json.load(response)
+    return gateway['shards'], gateway['session_start_limit']['max_concurrency']
+
+
+def shard_groups(shard_count, processes):
+    """Split shards 0..shard_count-1 into one contiguous group per process"""
+    processes = min(processes, shard_count)
+    size, extra = divmod(shard_count, processes)
+    groups = []
+    start = 0
+    for i in range(processes):
+        end = start + size + (i < extra)
+        groups.append(list(range(start, end)))
+        start = end
+    return groups
+
+
+class Supervisor:
+    """Starts one bot.py per shard group and restarts any that exit"""
+
+    def __init__(self, shard_count, groups, concurrency=1):
+        self.shard_count = shard_count
+        self.groups = groups
+        self.concurrency = concurrency
+        self.processes = [None] * len(groups)
+        self.stopping = False
+
+    def env(self, index):
+        env = dict(os.environ)
+        env['SHARD_COUNT'] = str(self.shard_count)
+        env['SHARD_IDS'] = ','.join(map(str, self.groups[index]))
+        env['SHARD_PROCESSES'] = str(len(self.groups))
+        # each process gets its share of the cores for AI searches
+        env.setdefault('AI_WORKERS', str(max(1, (os.cpu_count() or 1) // len(self.groups))))
+        # the first process answers health checks on PORT, the others on the ports after it
+        env['PORT'] = str(int(os.getenv('PORT', 10000)) + index)
+        return env
+
+    def start(self, index):
+        print(f"[SUPERVISOR] Starting shards {self.groups[index]} of {self.shard_count}")
+        self.processes[index] = subprocess.Popen([sys.executable, 'bot.py'], env=self.env(index))
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        for index, group in enumerate(self.groups):
+            if self.stopping:
+                break
+            self.start(index)
+            # let this group's shards log in before the next process starts its own
+            time.sleep(IDENTIFY_SECONDS * -(-len(group) // self.concurrency))
+        while not self.stopping:
+            time.sleep(RESTART_DELAY)
+            for index, process in enumerate(self.processes):
+                if process is not None and process.poll() is not None and not self.stopping:
+                    print(f"[SUPERVISOR] Shards {self.groups[index]} exited with {process.returncode}")
+                    self.start(index)
+        for process in self.processes:
+            if process is not None:
+                process.wait()
+
+    def stop(self, signum, frame):
+        """Pass the signal on to the bots. Their games are checkpointed, so they resume on the next start."""
+        self.stopping = True
+        for process in self.processes:
+            if process is not None and process.poll() is None:
+                process.send_signal(signum)
+
+
+def main():
+    load_dotenv()
+    token = os.getenv('DISCORD_TOKEN')
+    if not token:
+        raise ValueError("DISCORD_TOKEN not found in environment variables. Please create a .env file with DISCORD_TOKEN=your_token_here")
+    processes = int(os.getenv('SHARD_PROCESSES', os.cpu_count() or 1))
+    shard_count = int(os.getenv('SHARD_COUNT', 0))
+    concurrency = 1
+    if not shard_count:
+        recommended, concurrency = recommended_shards(token)
+        # at least one shard per process, so every core has work
+        shard_count = max(recommended, processes)
+    Supervisor(shard_count, shard_groups(shard_count, processes), concurrency).run()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+"""
+AI search sees the same game the table is playing
+    python -m pytest test_CoupAI.py
+"""
+
+import random
+
+from CoupAI import determinize, legalDecisions, playoutDecision, search
+from CoupGame import CoupGame, PROMPT_CHALLENGE, PROMPT_GAME_OVER, PROMPT_TARGET
+from CoupState import CoupState
+
+COUP = 7
+
+
+def _coupTarget(seed):
+    """A game waiting on a Coup's target, or None if this seed never gets there"""
+    rng = random.Random(seed)
+    game = CoupGame(seed)
+    for seat in range(2 + seed % 5):
+        game.addPlayer(f"Player {seat + 1}")
+    game.start()
+    while game.prompt.kind != PROMPT_GAME_OVER and len(game.history) < 300:
+        if game.prompt.kind == PROMPT_TARGET and game.action == COUP:
+            return game
+        game.submit(playoutDecision(game, game.prompt, rng))
+    return None
+
+
+def test_searched_game_keeps_a_pending_coup():
+    games = [game for game in map(_coupTarget, range(200)) if game is not None][:20]
+    assert games, "no game reached a Coup target prompt"
+    for game in games:
+        # what decide() rebuilds in the worker
+        worker = CoupGame.fromState(CoupState.fromBytes(game.state().toBytes()))
+        assert worker.action == COUP
+        rng = random.Random(0)
+        for _ in range(20):
+            sample = determinize(worker, worker.prompt.seat, rng)
+            assert sample.action == COUP
+            actor = sample.seats[sample.actor]
+            coins = actor.coins
+            sample.submit(rng.choice(legalDecisions(sample)))
+            assert actor.coins == coins - COUP
+            assert sample.prompt.kind != PROMPT_CHALLENGE
+        decision, _ = search(worker, worker.prompt.seat, budget=10, seed=0, maxIterations=50)
+        assert decision in legalDecisions(game)
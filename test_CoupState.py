@@ -0,0 +1,90 @@
+"""
+CoupState round trips: a clone taken at any prompt plays on exactly like the game it was taken from
+    python -m pytest test_CoupState.py
+"""
+
+import random
+
+from CoupAI import playoutDecision
+from CoupGame import CoupGame, PROMPT_GAME_OVER, PROMPT_TARGET
+from CoupState import CoupState
+
+GAMES = 300
+MAX_DECISIONS = 300
+
+
+def _game(seed, players):
+    game = CoupGame(seed)
+    for seat in range(players):
+        game.addPlayer(f"Player {seat + 1}")
+    game.start()
+    return game
+
+
+def _twin(game):
+    """Clone of game that draws the same cards from here on"""
+    twin = game.clone()
+    twin.rng.setstate(game.rng.getstate())
+    return twin
+
+
+def _sameTurn(a, b):
+    return ((a.actor, a.action, a.target, a.blocker, a.blockCard, a.afterLoss)
+            == (b.actor, b.action, b.target, b.blocker, b.blockCard, b.afterLoss))
+
+
+def _playBoth(game, twin, rng):
+    """Submit the same decisions to both games until the end; False as soon as they differ"""
+    for _ in range(MAX_DECISIONS):
+        if game.state() != twin.state() or not _sameTurn(game, twin):
+            return False
+        if game.prompt.kind == PROMPT_GAME_OVER:
+            return twin.prompt.kind == PROMPT_GAME_OVER and twin.prompt.seat == game.prompt.seat
+        decision = playoutDecision(game, game.prompt, rng)
+        game.submit(decision)
+        twin.submit(decision)
+    return True
+
+
+def test_state_round_trip():
+    for seed in range(GAMES):
+        rng = random.Random(seed)
+        game = _game(seed, 2 + seed % 5)
+        for _ in range(MAX_DECISIONS):
+            state = game.state()
+            assert CoupState.fromBytes(state.toBytes()) == state
+            assert CoupGame.fromState(state).state() == state
+            if game.prompt.kind == PROMPT_GAME_OVER:
+                break
+            game.submit(playoutDecision(game, game.prompt, rng))
+
+
+def test_clone_at_every_prompt_plays_the_same():
+    for seed in range(GAMES // 10):
+        rng = random.Random(seed)
+        game = _game(seed, 2 + seed % 5)
+        while game.prompt.kind != PROMPT_GAME_OVER and len(game.history) < MAX_DECISIONS:
+            game.submit(playoutDecision(game, game.prompt, rng))
+        record = game.record()
+        for step in range(len(record['decisions'])):
+            original = CoupGame.replay(record, step)
+            assert _playBoth(original, _twin(original), random.Random(step)), \
+                f"seed {seed}: a clone taken after {step} decisions plays differently"
+
+
+def test_pending_coup_survives_a_clone():
+    for seed in range(GAMES):
+        rng = random.Random(seed)
+        game = _game(seed, 2 + seed % 5)
+        for _ in range(MAX_DECISIONS):
+            if game.prompt.kind == PROMPT_GAME_OVER:
+                break
+            if game.prompt.kind == PROMPT_TARGET and game.action == 7:
+                clone = game.clone()
+                assert clone.action == 7
+                coins = clone.seats[clone.actor].coins
+                clone.submit(playoutDecision(clone, clone.prompt, rng))
+                assert clone.seats[clone.actor].coins == coins - 7
+                return
+            game.submit(playoutDecision(game, game.prompt, rng))
+    raise AssertionError("no game reached a Coup target prompt")